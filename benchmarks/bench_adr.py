@@ -0,0 +1,67 @@
+"""Model size and solve time of the affine decision-rule counterpart against the box.
+
+    python benchmarks/bench_adr.py [workbook] [--time-dim 6 12 24 48] [--min-dim 4]
+                                   [--interval 1.0] [--time-limit 300] [--no-solve]
+
+For every ``time_dim`` (the bundled workbook tiled over the horizon) the
+model is built with the sparse builder for ``uncertainty="box"``
+(``Code_v003.py``: the realization is chosen with the bids) and
+``uncertainty="affine"`` (:mod:`robust_bidding.affine`: deployments affine
+in the realization, worst case over the same box).  Rows, columns,
+nonzeros, binaries, build and HiGHS solve time and the objective are
+printed; ``size x`` is the affine model against the box one.
+
+The default ``--interval 1.0`` is used because the bundled workbook is
+infeasible at the ±50% setting of ``Code_v003.py``.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding.sparse import build_sparse_model
+from bench_build import DEFAULT_WORKBOOK, available, scaled_case
+from bench_hourly import solve_highs
+
+ROW = "%5s %-7s %8s %8s %9s %7s %7s %9s %10s %14s %s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--time-dim", type=int, nargs="+", default=[6, 12, 24, 48])
+    parser.add_argument("--min-dim", type=int, default=4)
+    parser.add_argument("--bess-dim", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--no-solve", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.no_solve and not available("highspy"):
+        args.no_solve = True
+        print("highspy not available - solve columns skipped")
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids)
+    print(ROW % ("T", "mode", "rows", "cols", "nnz", "binary", "size x", "build s", "solve s", "objective", "status"))
+    for T in args.time_dim:
+        case, params = scaled_case(data, T, args.min_dim, args.bess_dim, base)
+        reference = None
+        for mode in ("box", "affine"):
+            start = time.perf_counter()
+            sm = build_sparse_model(case, params.replace(uncertainty=mode))
+            build = time.perf_counter() - start
+            nnz = sm.matrix().nnz
+            reference = reference or nnz
+            status, objective, solve = "-", float("nan"), float("nan")
+            if not args.no_solve:
+                status, objective, solve, _ = solve_highs(sm, args.time_limit)
+            print(ROW % (T, mode, sm.shape[0], sm.shape[1], nnz, int(sm.binary.sum()), "%.2f" % (nnz / reference),
+                         "%.3f" % build, "%.2f" % solve, "%.4f" % objective, status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Big-M of 식(33)~(35): LP bound, nodes and solve time per ``big_m`` mode.
+
+    python benchmarks/bench_bigm.py [workbook] [--min-dim 4 12] [--interval 1.0]
+                                    [--time-limit 300] [--cplex-case 3 2]
+
+For every ``min_dim`` the ``constant`` (Code_v003.py, M = 1e10) and ``derived``
+(:func:`robust_bidding.bounds.wpr_big_m`) models are built with the sparse
+builder and solved with HiGHS: LP relaxation bound, MIP objective,
+branch-and-bound nodes and seconds.
+
+``indicator`` needs docplex + CPLEX.  When both are installed all three modes
+are also solved with CPLEX on the ``--cplex-case T J`` tiled case (the
+default is small enough for the Community Edition).
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BIG_M_MODES, BiddingParameters
+from robust_bidding.sparse import build_sparse_model
+from bench_build import DEFAULT_WORKBOOK, available, scaled_case
+from bench_hourly import solve_highs
+
+ROW = "%-6s %4s %4s %-9s %14s %14s %8s %9s %s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, nargs="+", default=[4, 12])
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--cplex-case", type=int, nargs=2, default=[3, 2], metavar=("T", "J"))
+    args = parser.parse_args(argv)
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids)
+    print(ROW % ("solver", "T", "J", "big_m", "LP bound", "objective", "nodes", "solve s", "status"))
+
+    if available("highspy"):
+        for J in args.min_dim:
+            case, params = scaled_case(data, args.time_dim, J, base.BESS_dim, base)
+            for mode in ("constant", "derived"):
+                sm = build_sparse_model(case, params.replace(big_m=mode))
+                bound = solve_highs(sm, args.time_limit, relax=True)[1]
+                status, objective, seconds, nodes = solve_highs(sm, args.time_limit)
+                print(ROW % ("highs", args.time_dim, J, mode, "%.4f" % bound, "%.4f" % objective,
+                             nodes, "%.2f" % seconds, status))
+    else:
+        print("highspy not available - HiGHS rows skipped")
+
+    if available("docplex") and available("cplex"):
+        from robust_bidding.model import build_optimization_model
+
+        T, J = args.cplex_case
+        case, params = scaled_case(data, T, J, base.BESS_dim, base)
+        for mode in BIG_M_MODES:
+            mdl = build_optimization_model(case, params.replace(big_m=mode))
+            mdl.parameters.timelimit = args.time_limit
+            try:
+                bound = None
+                if mode != "indicator":   # indicator 제약은 연속 변수로 완화할 수 없음
+                    relaxed = mdl.clone()
+                    relaxed.change_var_types(list(relaxed.iter_binary_vars()), relaxed.continuous_vartype)
+                    bound = relaxed.solve()
+                s = mdl.solve()
+            except Exception as exc:   # e.g. Community Edition size limit
+                print(ROW % ("cplex", T, J, mode, "-", "-", "-", "-", exc))
+                continue
+            details = mdl.solve_details
+            print(ROW % ("cplex", T, J, mode,
+                         "%.4f" % bound.objective_value if bound else "-",
+                         "%.4f" % s.objective_value if s else "-",
+                         details.nb_nodes_processed, "%.2f" % details.time, details.status))
+    else:
+        print("docplex/cplex not available - CPLEX rows (and big_m='indicator') skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Effect of :func:`robust_bidding.bounds.variable_bounds` on the HiGHS solve.
+
+    python benchmarks/bench_bounds.py [workbook] [--min-dim 4 12] [--interval 1.0]
+                                      [--hourly-bids pairwise] [--time-limit 300]
+
+For every ``min_dim`` the sparse model is built with ``tighten_bounds`` off
+(``lb=0, ub=inf`` as in Code_v003.py) and on; the number of tightened bounds,
+the LP relaxation bound, the MIP objective, nodes and seconds are printed.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.bounds import count_tightened, variable_bounds
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding.sparse import build_sparse_model
+from bench_build import DEFAULT_WORKBOOK, scaled_case
+from bench_hourly import solve_highs
+
+ROW = "%4s %-6s %8s %8s %14s %14s %8s %9s %s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, nargs="+", default=[4, 12])
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="pairwise")
+    parser.add_argument("--time-limit", type=float, default=300)
+    args = parser.parse_args(argv)
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids)
+    print(ROW % ("J", "bounds", "lower", "upper", "LP bound", "objective", "nodes", "solve s", "status"))
+    for J in args.min_dim:
+        case, params = scaled_case(data, args.time_dim, J, base.BESS_dim, base)
+        for tighten in (False, True):
+            p = params.replace(tighten_bounds=tighten)
+            lower, upper, _ = count_tightened(variable_bounds(case, p), p) if tighten else (0, 0, 0)
+            sm = build_sparse_model(case, p)
+            bound = solve_highs(sm, args.time_limit, relax=True)[1]
+            status, objective, seconds, nodes = solve_highs(sm, args.time_limit)
+            print(ROW % (J, "on" if tighten else "off", lower, upper, "%.4f" % bound, "%.4f" % objective,
+                         nodes, "%.2f" % seconds, status))
+
+
+if __name__ == "__main__":
+    main()
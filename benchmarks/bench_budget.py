@@ -0,0 +1,67 @@
+"""Price of robustness: objective and solve time over the budget Γ.
+
+    python benchmarks/bench_budget.py [workbook] [--gamma 0 0.5 1 2 4] [--scope hour day]
+                                      [--deviation 0.2] [--min-dim 4] [--interval 1.0]
+                                      [--hourly-bids hourly] [--time-limit 120]
+
+The sparse model is built with ``uncertainty="box"`` and, for every
+``--scope`` and ``--gamma`` (plus ``gamma=None``, every deviation at its
+bound), with ``uncertainty="budget"`` (:mod:`robust_bidding.uncertainty`).
+``--deviation`` sets ``Deviation_* = deviation * Expected_*`` (default: the
+``interval * |Expected|`` of the model).  Each model is solved with HiGHS;
+``drop %`` is the objective lost against the box.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import MarketData, load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding.sparse import build_sparse_model
+from robust_bidding.uncertainty import UNCERTAIN
+from bench_build import DEFAULT_WORKBOOK, available, scaled_case
+from bench_hourly import solve_highs
+
+ROW = "%-6s %-5s %6s %8s %8s %14s %8s %8s %9s %s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--gamma", type=float, nargs="+", default=[0, 0.5, 1, 2, 4])
+    parser.add_argument("--scope", nargs="+", default=["hour", "day"])
+    parser.add_argument("--deviation", type=float, default=None)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, default=4)
+    parser.add_argument("--bess-dim", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--time-limit", type=float, default=120)
+    args = parser.parse_args(argv)
+    if not available("highspy"):
+        parser.error("highspy is required")
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids)
+    case, params = scaled_case(data, args.time_dim, args.min_dim, args.bess_dim, base)
+    if args.deviation is not None:
+        case = MarketData(case.time_dim, case.min_dim,
+                          dict(case.arrays, **{deviation: args.deviation * abs(getattr(case, expected))
+                                               for expected, deviation in UNCERTAIN.values()}))
+
+    runs = [("box", "-", None)] + [("budget", scope, gamma) for scope in args.scope for gamma in args.gamma + [None]]
+    print(ROW % ("mode", "scope", "gamma", "rows", "cols", "objective", "drop %", "nodes", "solve s", "status"))
+    box = None
+    for mode, scope, gamma in runs:
+        p = params.replace(uncertainty=mode, budget_scope=scope if mode == "budget" else "hour", gamma=gamma)
+        sm = build_sparse_model(case, p)
+        status, objective, seconds, nodes = solve_highs(sm, args.time_limit)
+        box = objective if box is None else box
+        print(ROW % (mode, scope, "max" if gamma is None and mode == "budget" else gamma if gamma is not None else "-",
+                     sm.shape[0], sm.shape[1], "%.4f" % objective, "%.2f" % (100 * (box - objective) / abs(box)),
+                     nodes, "%.2f" % seconds, status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Build-time comparison: docplex expression builder vs. sparse COO builder.
+
+    python benchmarks/bench_build.py [workbook] [--time-dim 24 48] [--min-dim 6 12]
+                                     [--bess-dim 2 8] [--repeat N] [--skip-reference]
+
+For each ``(time_dim, min_dim, BESS_dim)`` the bundled workbook is tiled to
+the requested shape and the BESS ratings are cycled, then the following are
+timed (best of ``--repeat``):
+
+* ``docplex``  - :func:`robust_bidding.model.build_optimization_model`
+* ``coo``      - :func:`robust_bidding.sparse.build_sparse_model` (NumPy only)
+* ``+docplex`` - ``coo`` + :func:`robust_bidding.sparse.to_docplex`
+* ``+cplex``   - ``coo`` + :func:`robust_bidding.sparse.to_cplex`
+
+The last two columns are skipped when docplex / cplex are not installed.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import MarketData, load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding import sparse
+
+DEFAULT_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                                "v002", "robust model_data.xlsx")
+
+
+def scaled_case(data, time_dim, min_dim, BESS_dim, base=None):
+    """Tile ``data`` to ``(time_dim, min_dim)`` and cycle the BESS ratings."""
+    base = base or BiddingParameters()
+    rows = np.arange(time_dim) % data.time_dim
+    cols = np.arange(min_dim) % data.min_dim
+    arrays = {name: (value[rows][:, cols] if value is not None and np.ndim(value) == 2 else value)
+              for name, value in data.arrays.items()}
+    cycle = lambda values: [values[s % len(values)] for s in range(BESS_dim)]
+    params = base.replace(time_dim=time_dim, min_dim=min_dim, BESS_dim=BESS_dim,
+                          E_min_BESS=cycle(base.E_min_BESS), E_max_BESS=cycle(base.E_max_BESS),
+                          P_max_BESS=cycle(base.P_max_BESS), P_min_BESS=cycle(base.P_min_BESS),
+                          Ramp_rate_BESS=cycle(base.Ramp_rate_BESS))
+    return MarketData(time_dim, min_dim, arrays), params
+
+
+def best_of(repeat, func, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def available(module):
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--time-dim", type=int, nargs="+", default=[24, 48])
+    parser.add_argument("--min-dim", type=int, nargs="+", default=[6, 12])
+    parser.add_argument("--bess-dim", type=int, nargs="+", default=[2, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-reference", action="store_true", help="do not time the docplex expression builder")
+    args = parser.parse_args(argv)
+
+    data = load_market_data(args.workbook)
+    has_docplex = available("docplex.mp.advmodel") and available("scipy.sparse")
+    has_cplex = available("cplex") and available("scipy.sparse")
+
+    print("%4s %4s %4s %8s %8s %9s %10s %10s %10s %10s" % (
+        "T", "J", "S", "rows", "cols", "nnz", "docplex", "coo", "+docplex", "+cplex"))
+    for T in args.time_dim:
+        for J in args.min_dim:
+            for S in args.bess_dim:
+                case, params = scaled_case(data, T, J, S)
+                sm = sparse.build_sparse_model(case, params)
+                timings = [float("nan")] * 4
+                if has_docplex and not args.skip_reference:
+                    from robust_bidding.model import build_optimization_model
+                    timings[0] = best_of(args.repeat, build_optimization_model, case, params)
+                timings[1] = best_of(args.repeat, sparse.build_sparse_model, case, params)
+                if has_docplex:
+                    timings[2] = best_of(args.repeat, lambda: sparse.to_docplex(sparse.build_sparse_model(case, params)))
+                if has_cplex:
+                    timings[3] = best_of(args.repeat, lambda: sparse.to_cplex(sparse.build_sparse_model(case, params)))
+                print("%4d %4d %4d %8d %8d %9d %10.3f %10.3f %10.3f %10.3f" % (
+                    (T, J, S) + sm.shape + (len(sm.vals),) + tuple(timings)))
+
+
+if __name__ == "__main__":
+    main()
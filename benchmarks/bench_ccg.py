@@ -0,0 +1,71 @@
+"""Two-stage robust bidding by C&CG: bounds per iteration over consecutive days.
+
+    python benchmarks/bench_ccg.py [workbook] [--days 3] [--time-dim 24] [--min-dim 4]
+                                   [--uncertainty budget] [--gamma 1] [--budget-scope hour]
+                                   [--interval 1.0] [--gap 1e-4] [--time-limit 600]
+                                   [--max-iterations 20] [--shortfall-price P] [--no-cache]
+
+``--days`` perturbed copies of the bundled workbook (``bench_template.perturbed_days``)
+are solved one after the other with one
+:class:`robust_bidding.ccg.ColumnConstraintGeneration` (HiGHS for master and
+subproblem).  Each line is an iteration: lower / upper bound, relative gap,
+scenarios in the master and the master / subproblem time.  With the cache
+(default) a day starts from the worst cases found on the previous days;
+``--no-cache`` starts every day from the nominal scenario only.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.ccg import ColumnConstraintGeneration
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BiddingParameters
+from bench_build import DEFAULT_WORKBOOK, available, scaled_case
+from bench_hourly import highs_solver
+from bench_template import perturbed_days
+
+ROW = "%4s %5s %14s %14s %9s %10s %9s %9s %s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, default=4)
+    parser.add_argument("--bess-dim", type=int, default=2)
+    parser.add_argument("--uncertainty", default="budget")
+    parser.add_argument("--gamma", type=float, default=1)
+    parser.add_argument("--budget-scope", default="hour")
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--gap", type=float, default=1e-4)
+    parser.add_argument("--time-limit", type=float, default=600)
+    parser.add_argument("--max-iterations", type=int, default=20)
+    parser.add_argument("--shortfall-price", type=float, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+    if not available("highspy"):
+        parser.error("highspy is required")
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids, uncertainty=args.uncertainty,
+                             gamma=args.gamma, budget_scope=args.budget_scope)
+    case, params = scaled_case(data, args.time_dim, args.min_dim, args.bess_dim, base)
+    ccg = ColumnConstraintGeneration(params, solver=highs_solver, gap=args.gap, time_limit=args.time_limit,
+                                     max_iterations=args.max_iterations, shortfall_price=args.shortfall_price,
+                                     cache_size=0 if args.no_cache else 50)
+
+    print(ROW % ("day", "iter", "lower", "upper", "gap %", "scenarios", "master s", "sub s", "status"))
+    for d, day in enumerate(perturbed_days(case, args.days)):
+        result = ccg.solve(day)
+        for it in result.iterations:
+            print(ROW % (d, it.iteration, "%.4f" % it.lower, "%.4f" % it.upper, "%.4f" % (100 * it.gap),
+                         it.scenarios, "%.2f" % it.master_seconds, "%.2f" % it.subproblem_seconds,
+                         result.status if it is result.iterations[-1] else ""))
+        print("day %d: %.2f s, %d scenarios cached" % (d, result.seconds, len(ccg.scenarios)))
+
+
+if __name__ == "__main__":
+    main()
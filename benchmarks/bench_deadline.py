@@ -0,0 +1,56 @@
+"""Bids and proven gap of the deadline solver against the time left before gate closure.
+
+    python benchmarks/bench_deadline.py [workbook] [--budget 2 4 8 16 32] [--time-dim 24] [--min-dim 12]
+                                        [--interval 1.0] [--backend highs]
+
+For every ``--budget`` (seconds from now to the deadline)
+:func:`robust_bidding.deadline.solve_by_deadline` solves the tiled workbook
+with :func:`robust_bidding.warmstart.heuristic_start` as its fallback
+schedule.  Printed: objective, best bound, proven gap, the gap accepted when
+the search stopped, the fallback used (if any) and the seconds left at the deadline (negative when
+it overran).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.deadline import solve_by_deadline
+from robust_bidding.params import BiddingParameters
+from robust_bidding.sparse import build_sparse_model
+from robust_bidding.warmstart import heuristic_start
+from bench_build import DEFAULT_WORKBOOK, scaled_case
+
+ROW = "%7s %14s %14s %10s %8s %-9s %7s %s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--budget", type=float, nargs="+", default=[2, 4, 8, 16, 32])
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, default=12)
+    parser.add_argument("--bess-dim", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--backend", default="highs")
+    args = parser.parse_args(argv)
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids)
+    case, params = scaled_case(data, args.time_dim, args.min_dim, args.bess_dim, base)
+    sparse = build_sparse_model(case, params)
+    starts = [heuristic_start(case, params)]
+    fmt = lambda value, spec: "-" if value is None else spec % value
+    print(ROW % ("budget", "objective", "bound", "gap", "accepted", "fallback", "slack s", "status"))
+    for budget in args.budget:
+        deadline = time.time() + budget
+        result = solve_by_deadline(sparse, deadline, args.backend, starts=starts)
+        print(ROW % (budget, fmt(result.objective, "%.4f"), fmt(result.bound, "%.4f"), fmt(result.gap, "%.2e"),
+                     "%g" % result.stages[-1][0], result.fallback or "-", "%.2f" % (deadline - time.time()), result.status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Build time and expression memory of the docplex builder.
+
+    python benchmarks/bench_expressions.py [workbook] [--min-dim 4 12] [--bess-dim 2 8]
+                                           [--repeat 3]
+
+For each ``(min_dim, BESS_dim)`` the bundled workbook is tiled and the
+following are measured:
+
+* ``build s``   - :func:`robust_bidding.model.build_optimization_model`, best
+  of ``--repeat``;
+* ``peak MB`` / ``kept MB`` - ``tracemalloc`` peak during the build and the
+  memory still held by the returned model;
+* ``update s``  - :meth:`robust_bidding.template.BiddingModelTemplate.update_from`
+  (re-evaluates every price-dependent expression), best of ``--repeat``;
+* ``built`` / ``reused`` - cache misses / hits of
+  :class:`robust_bidding.expressions.HourlyExpressions` in one build.
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.model import _build_model, build_optimization_model
+from robust_bidding.params import BiddingParameters
+from robust_bidding.template import BiddingModelTemplate
+from bench_build import DEFAULT_WORKBOOK, best_of, scaled_case
+
+ROW = "%4s %4s %-9s %9s %9s %9s %9s %8s %8s"
+
+
+def traced(func, *args):
+    """``(result, peak MB, retained MB)`` of ``func(*args)`` under tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 2 ** 20, kept / 2 ** 20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, nargs="+", default=[4, 12])
+    parser.add_argument("--bess-dim", type=int, nargs="+", default=[2, 8])
+    parser.add_argument("--hourly-bids", default="pairwise")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=1.0, hourly_bids=args.hourly_bids)
+    print(ROW % ("J", "S", "mode", "build s", "peak MB", "kept MB", "update s", "built", "reused"))
+    for J in args.min_dim:
+        for S in args.bess_dim:
+            case, params = scaled_case(data, args.time_dim, J, S, base)
+            build = best_of(args.repeat, build_optimization_model, case, params)
+            (mdl, parts), peak, kept = traced(_build_model, case, params, "bench")
+            cache = parts["expressions"]
+            template = BiddingModelTemplate(case, params)
+            update = best_of(args.repeat, template.update_from, case)
+            print(ROW % (J, S, args.hourly_bids, "%.3f" % build, "%.1f" % peak, "%.1f" % kept,
+                         "%.3f" % update, cache.built, cache.reused))
+            del mdl, parts, template
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Build time per equation number: docplex expression builder vs. sparse COO builder.
+
+    python benchmarks/bench_families.py [workbook] [--min-dim 12] [--bess-dim 2 8]
+                                        [--hourly-bids pairwise] [--repeat 3] [--top 15]
+
+For each ``(min_dim, BESS_dim)`` the bundled workbook is tiled and both
+builders are profiled per constraint family (:mod:`robust_bidding.profiling`,
+best of ``--repeat`` per family):
+:func:`robust_bidding.model.build_optimization_model` through
+:func:`~robust_bidding.profiling.profile_docplex` and
+:func:`robust_bidding.sparse.build_sparse_model` through
+:func:`~robust_bidding.profiling.profile_sparse`.  Printed per equation
+number, ordered by docplex time: rows and nonzeros of each builder, the
+milliseconds of each and their ratio, i.e. where the docplex build time goes
+and how much of it the sparse path saves.  The docplex column is skipped
+when docplex is not installed.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding.profiling import group, profile_docplex, profile_sparse
+from bench_build import DEFAULT_WORKBOOK, available, scaled_case
+
+ROW = "%-12s %9s %9s %10s %10s %10s %10s %8s"
+
+
+def best_profile(repeat, run):
+    """Grouped profile of ``run()`` with the per-equation minimum time over ``repeat`` runs."""
+    runs = [group(run()) for _ in range(repeat)]
+    best = {family.label: family for family in runs[0]}
+    for profile in runs[1:]:
+        for family in profile:
+            best[family.label].ms = min(best[family.label].ms, family.ms)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, nargs="+", default=[12])
+    parser.add_argument("--bess-dim", type=int, nargs="+", default=[2, 8])
+    parser.add_argument("--hourly-bids", default="pairwise")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="equations shown per case (by docplex time)")
+    args = parser.parse_args(argv)
+
+    from robust_bidding.model import build_optimization_model
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=1.0, hourly_bids=args.hourly_bids)
+    has_docplex = available("docplex.mp.model")
+    fmt = lambda family, name, spec: "-" if family is None else spec % getattr(family, name)
+    for J in args.min_dim:
+        for S in args.bess_dim:
+            case, params = scaled_case(data, args.time_dim, J, S, base)
+            sparse = best_profile(args.repeat, lambda: profile_sparse(case, params)[1])
+            docplex = (best_profile(args.repeat, lambda: profile_docplex(build_optimization_model, case, params)[1])
+                       if has_docplex else {})
+            order = sorted(set(sparse) | set(docplex),
+                           key=lambda k: -(docplex[k].ms if k in docplex else sparse[k].ms))
+            print("T=%d J=%d S=%d %s" % (args.time_dim, J, S, args.hourly_bids))
+            print(ROW % ("equation", "rows", "coo rows", "nnz", "coo nnz", "docplex ms", "coo ms", "ratio"))
+            for key in order[:args.top]:
+                a, b = docplex.get(key), sparse.get(key)
+                ratio = "%.0fx" % (a.ms / b.ms) if a is not None and b is not None and b.ms > 0 else "-"
+                print(ROW % (key[:12], fmt(a, "rows", "%d"), fmt(b, "rows", "%d"), fmt(a, "nnz", "%d"),
+                             fmt(b, "nnz", "%d"), fmt(a, "ms", "%.2f"), fmt(b, "ms", "%.2f"), ratio))
+            total = lambda profile: sum(family.ms for family in profile.values())
+            print(ROW % ("total", sum(f.rows for f in docplex.values()) if docplex else "-",
+                         sum(f.rows for f in sparse.values()), "", "", "%.2f" % total(docplex) if docplex else "-",
+                         "%.2f" % total(sparse), "%.0fx" % (total(docplex) / total(sparse)) if docplex else "-"))
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Model size and solve time of the ``hourly_bids`` formulations.
+
+    python benchmarks/bench_hourly.py [workbook] [--min-dim 4 12] [--interval 1.0]
+                                      [--time-limit 300] [--no-solve]
+
+For every ``min_dim`` the bundled workbook is tiled to that resolution and the
+model is built in the ``pairwise`` (paper / current code), ``chain`` and
+``hourly`` modes with the sparse builder.  Rows, columns, nonzeros and the
+reduction against ``pairwise`` are printed, and each model is solved with
+HiGHS (``highspy``) when available.
+
+The default ``--interval 1.0`` is used because the bundled workbook is
+infeasible at the ±50% setting of ``Code_v003.py``.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.params import HOURLY_BID_MODES, BiddingParameters
+from robust_bidding.solvers import highs_model
+from robust_bidding.sparse import build_sparse_model
+from bench_build import DEFAULT_WORKBOOK, scaled_case
+
+
+def solve_highs(sparse, time_limit, relax=False):
+    """Solve a SparseModel with HiGHS; returns (status, objective, seconds, nodes).
+
+    ``relax=True`` drops integrality (LP relaxation bound).
+    """
+    h = highs_model(sparse, time_limit, relax)
+    start = time.perf_counter()
+    h.run()
+    seconds = time.perf_counter() - start
+    info = h.getInfo()
+    return h.modelStatusToString(h.getModelStatus()), info.objective_function_value, seconds, max(info.mip_node_count, 0)
+
+
+def highs_solver(sparse, time_limit=None):
+    """``solver`` of :class:`robust_bidding.ccg.ColumnConstraintGeneration`: ``(status, objective, x)``."""
+    h = highs_model(sparse, 1e9 if time_limit is None else max(time_limit, 1))
+    h.run()
+    status = h.modelStatusToString(h.getModelStatus())
+    if h.getInfo().primal_solution_status != 2:   # kSolutionStatusFeasible
+        return status, None, None
+    return status, h.getInfo().objective_function_value, np.asarray(h.getSolution().col_value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, nargs="+", default=[4, 12])
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--no-solve", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        import highspy  # noqa: F401
+    except ImportError:
+        args.no_solve = True
+        print("highspy not available - solve columns skipped")
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval)
+    print("%4s %-9s %8s %8s %9s %7s %7s %9s %10s %14s" % (
+        "J", "mode", "rows", "cols", "nnz", "rows%", "cols%", "build s", "solve s", "objective"))
+    for J in args.min_dim:
+        case, params = scaled_case(data, args.time_dim, J, base.BESS_dim, base)
+        reference = None
+        for mode in HOURLY_BID_MODES:
+            p = params.replace(hourly_bids=mode)
+            start = time.perf_counter()
+            sm = build_sparse_model(case, p)
+            build = time.perf_counter() - start
+            A = sm.matrix()
+            if reference is None:
+                reference = sm.shape
+            status, objective, solve = ("-", float("nan"), float("nan"))
+            if not args.no_solve:
+                status, objective, solve, _ = solve_highs(sm, args.time_limit)
+            print("%4d %-9s %8d %8d %9d %6.1f%% %6.1f%% %9.3f %10.2f %14.4f %s" % (
+                J, mode, sm.shape[0], sm.shape[1], A.nnz, 100.0 * sm.shape[0] / reference[0],
+                100.0 * sm.shape[1] / reference[1], build, solve, objective, status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Timing comparison: bulk sheet loading vs. per-cell Excel COM reads.
+
+    python benchmarks/bench_loader.py [workbook] [--repeat N]
+
+The per-cell path replays the coefficient fetches that the original
+``build_optimization_model`` (v002/Code_v003.py) performed through
+``Sheet.Cells(r, c).Value``, with the same multiplicity.  The COM rows are
+skipped when ``pywin32`` / Excel is not available (e.g. on Linux).
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.cache import load_market_data_cached
+from robust_bidding.data import OPTIONAL_SHEETS, SHEETS, load_market_data, read_xlsx_com
+
+DEFAULT_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                                "v002", "robust model_data.xlsx")
+
+
+def legacy_cell_reads(time_dim=24, min_dim=12, WPR_dim=1):
+    """(sheet, row, col) fetched by the per-cell builder, in build order."""
+    reads = []
+    hourly = [(t + 1, 2) for t in range(1, time_dim + 1)]
+    interval = [(t + 1, j + 1) for t in range(1, time_dim + 1) for j in range(1, min_dim + 1)]
+    reads += [(n, r, c) for r, c in hourly for n in ("Price_DA", "Price_RS")]              # objective
+    reads += [(n, r, c) for r, c in interval for n in ("Price_UR", "Price_DR")]            # AV_RO
+    reads += [(n, r, c) for r, c in interval for n in ("Expected_P_UR",) * 2]              # 식(61)
+    reads += [(n, r, c) for r, c in interval for n in ("Expected_P_DR",) * 2]              # 식(62)
+    reads += [(n, r, c) for r, c in interval for n in ("Expected_P_RT_WPR",) * 2 * WPR_dim]  # 식(63)
+    reads += [(n, r, c) for r, c in hourly for n in ("Price_DA", "Price_RS")]              # AV_RO_DA
+    reads += [(n, r, c2) for r, c in interval for n, c2 in
+              (("Price_DA", 2), ("Price_RS", 2), ("Price_UR", c), ("Price_DR", c))]         # B_t
+    reads += [(n, r, c) for r, c in hourly for n in ("Price_DA", "Price_RS")] * 3          # BESS1/BESS2/WPR DA
+    reads += [(n, r, c) for r, c in interval for n in ("Price_UR", "Price_DR")] * 3        # BESS1/BESS2/WPR RT
+    return reads
+
+
+def time_per_cell_com(path, reads):
+    import win32com.client as win32
+
+    excel = win32.Dispatch("Excel.Application")
+    wb = excel.Workbooks.Open(os.path.abspath(path))
+    try:
+        sheets = {name: wb.Sheets(name) for name in SHEETS}
+        start = time.perf_counter()
+        for name, r, c in reads:
+            sheets[name].Cells(r, c).Value
+        return time.perf_counter() - start
+    finally:
+        wb.Close(False)
+        excel.Quit()
+
+
+def best_of(repeat, func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    reads = legacy_cell_reads()
+    rows = [("xlsx reader (pure Python)", best_of(args.repeat, load_market_data, args.workbook))]
+    cache_dir = tempfile.mkdtemp()
+    load_market_data_cached(args.workbook, cache_dir=cache_dir)
+    rows.append(("npz cache hit", best_of(args.repeat, load_market_data_cached, args.workbook,
+                                          cache_dir=cache_dir)))
+    shutil.rmtree(cache_dir)
+    try:
+        import win32com.client  # noqa: F401
+    except ImportError:
+        print("pywin32 not available - COM rows skipped")
+    else:
+        rows.append(("COM bulk Range.Value", best_of(args.repeat, read_xlsx_com, args.workbook,
+                                                     SHEETS, OPTIONAL_SHEETS)))
+        rows.append(("COM per-cell (%d reads)" % len(reads), time_per_cell_com(args.workbook, reads)))
+
+    print("%-32s %12s" % ("loader", "seconds"))
+    for label, seconds in rows:
+        print("%-32s %12.4f" % (label, seconds))
+
+
+if __name__ == "__main__":
+    main()
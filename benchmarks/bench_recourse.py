@@ -0,0 +1,79 @@
+"""Re-optimized recourse vs. pro-rata settlement of the same bids.
+
+    python benchmarks/bench_recourse.py [workbook] [--scenarios 2000] [--workers 1 4]
+                                        [--backend auto] [--time-dim 24] [--min-dim 12]
+                                        [--chunk 256] [--interval 1.0]
+
+The sparse model is solved with HiGHS; its bids are evaluated on
+``--scenarios`` samples of :func:`robust_bidding.settlement.sample_scenarios`
+with :class:`robust_bidding.recourse.RecourseEvaluator` for every
+``--workers`` count (``--backend auto`` takes CPLEX when it is licensed for
+the LP, else HiGHS), and with
+:func:`robust_bidding.settlement.settle`.  Prints time per scenario, mean
+revenue and mean shortfall of each.  The recourse charges shortfall at its
+``shortfall_price`` (twice the highest price), the settlement at the price
+of the missing product, so their revenues differ by more than the dispatch.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding.recourse import RECOURSE_BACKENDS, RecourseEvaluator
+from robust_bidding.settlement import sample_scenarios, settle
+from robust_bidding.sparse import build_sparse_model
+from bench_build import DEFAULT_WORKBOOK, available, scaled_case
+from bench_hourly import highs_solver
+
+ROW = "%-10s %8s %10s %12s %14s %12s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--scenarios", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--backend", default="auto", choices=RECOURSE_BACKENDS)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, default=12)
+    parser.add_argument("--bess-dim", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--chunk", type=int, default=256)
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if not available("highspy"):
+        parser.error("highspy is required")
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids)
+    case, params = scaled_case(data, args.time_dim, args.min_dim, args.bess_dim, base)
+    sparse = build_sparse_model(case, params)
+    status, objective, x = highs_solver(sparse, args.time_limit)
+    if x is None:
+        parser.exit(1, "no solution (%s)\n" % status)
+    bids = {name: x[index] for name, index in sparse.blocks.items()}
+    scenarios = sample_scenarios(case, params, args.scenarios, seed=args.seed)
+    print("model: %s, objective %.4f; %d scenarios" % (status, objective, args.scenarios))
+
+    print(ROW % ("method", "workers", "seconds", "ms/scenario", "mean revenue", "shortfall"))
+    evaluator = RecourseEvaluator(case, params, bids, backend=args.backend)
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = evaluator.evaluate(scenarios, workers=workers, chunk=args.chunk)
+        seconds = time.perf_counter() - start
+        print(ROW % ("recourse", workers, "%.2f" % seconds, "%.3f" % (1000 * seconds / args.scenarios),
+                     "%.4f" % result.revenue.mean(), "%.4f" % result.shortfall.mean()))
+    start = time.perf_counter()
+    result = settle(bids, scenarios, case, params)
+    seconds = time.perf_counter() - start
+    print(ROW % ("pro rata", "-", "%.2f" % seconds, "%.3f" % (1000 * seconds / args.scenarios),
+                 "%.4f" % result.revenue.mean(), "%.4f" % result.imbalance.mean()))
+
+
+if __name__ == "__main__":
+    main()
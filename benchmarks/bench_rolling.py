@@ -0,0 +1,70 @@
+"""Rolling horizon: cost per step of the re-priced template vs. a rebuild.
+
+    python benchmarks/bench_rolling.py [workbook] [--days 7] [--time-dim 24] [--min-dim 12]
+                                       [--step 24] [--lookahead 24] [--interval 1.0]
+                                       [--hourly-bids hourly] [--no-warm-start]
+
+``--days`` perturbed copies of the bundled workbook (tiled to ``--time-dim``
+hours, see ``bench_template.perturbed_days``) are joined into one horizon and
+solved with :class:`robust_bidding.rolling.RollingHorizon` (``terminal_soc=
+"free"``).  Every window is also rebuilt from scratch with the carried-over
+initial energy and solved, to compare time and objective.  The last line
+extrapolates the rolling time to 365 days of 24 hours.
+
+Needs docplex + CPLEX; with the Community Edition only small windows fit
+(e.g. ``--time-dim 8 --min-dim 2 --step 2 --lookahead 1``).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import MarketData, load_market_data
+from robust_bidding.model import build_optimization_model
+from robust_bidding.params import BiddingParameters
+from robust_bidding.rolling import RollingHorizon
+from bench_build import DEFAULT_WORKBOOK, scaled_case
+from bench_template import perturbed_days
+
+ROW = "%5s %6s %14s %14s %9s %9s %s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, default=12)
+    parser.add_argument("--step", type=int, default=24)
+    parser.add_argument("--lookahead", type=int, default=24)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--no-warm-start", action="store_true")
+    args = parser.parse_args(argv)
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids, terminal_soc="free")
+    case, params = scaled_case(data, args.time_dim, args.min_dim, base.BESS_dim, base)
+    horizon = MarketData.concatenate(perturbed_days(case, args.days))
+
+    print(ROW % ("step", "hour", "rolling obj", "rebuild obj", "rolling s", "rebuild s", "status"))
+    rolling = rebuild = 0.0
+    steps = RollingHorizon(horizon, params, args.step, args.lookahead, warm_start=not args.no_warm_start)
+    for st in steps.run():
+        hours = min(args.step + args.lookahead, horizon.time_dim - st.start_hour)
+        start = time.perf_counter()
+        mdl = build_optimization_model(horizon.hours(st.start_hour, st.start_hour + hours),
+                                       params.replace(time_dim=hours, Initial_BESS=st.initial_energy))
+        s = mdl.solve()
+        seconds = time.perf_counter() - start
+        rolling += st.seconds
+        rebuild += seconds
+        print(ROW % (st.step, st.start_hour, "%.4f" % st.objective, "%.4f" % s.objective_value if s else "-",
+                     "%.3f" % st.seconds, "%.3f" % seconds, st.status))
+    print("total: rolling %.2f s, rebuild %.2f s; 365 days x 24 h at this rate: rolling %.1f min"
+          % (rolling, rebuild, rolling / horizon.time_dim * 365 * 24 / 60))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""SAA bidding with fast-forward scenario reduction: size, time and out-of-sample value.
+
+    python benchmarks/bench_saa.py [workbook] [--samples 2000] [--count 5 10 20 40]
+                                   [--time-dim 6] [--min-dim 4] [--interval 0.3]
+                                   [--test 300] [--time-limit 300] [--seed 0]
+
+``--samples`` scenarios are drawn uniformly within the 식(61)~(63) box
+(:func:`robust_bidding.settlement.sample_scenarios`).  For every ``--count``
+they are reduced by fast-forward selection (``ff``) and, for comparison, by
+keeping a random subset with equal probabilities (``random``); the
+extensive form of :func:`robust_bidding.saa.solve_saa` is solved with HiGHS.
+The bids are then evaluated on ``--test`` fresh scenarios by
+:class:`robust_bidding.recourse.RecourseEvaluator` (HiGHS, re-optimized
+real-time stage): ``in-sample`` is the SAA objective, ``out-of-sample`` the
+mean revenue over the test scenarios.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding.recourse import RecourseEvaluator
+from robust_bidding.saa import solve_saa
+from robust_bidding.settlement import sample_scenarios
+from bench_build import DEFAULT_WORKBOOK, available, scaled_case
+from bench_hourly import highs_solver
+
+ROW = "%6s %-7s %8s %8s %9s %9s %14s %14s %s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--count", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--time-dim", type=int, default=6)
+    parser.add_argument("--min-dim", type=int, default=4)
+    parser.add_argument("--bess-dim", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=0.3)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--test", type=int, default=300)
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if not available("highspy"):
+        parser.error("highspy is required")
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids)
+    case, params = scaled_case(data, args.time_dim, args.min_dim, args.bess_dim, base)
+    samples = sample_scenarios(case, params, args.samples, seed=args.seed)
+    test = sample_scenarios(case, params, args.test, seed=args.seed + 1)
+    rng = np.random.default_rng(args.seed)
+
+    print(ROW % ("count", "method", "reduce s", "solve s", "day-ahead", "real-time", "in-sample", "out-of-sample",
+                 "status"))
+    for count in args.count:
+        subset = rng.choice(args.samples, size=min(count, args.samples), replace=False)
+        for method in ("ff", "random"):
+            if method == "ff":
+                result = solve_saa(case, samples, params, count=count, solver=highs_solver, time_limit=args.time_limit)
+            else:
+                result = solve_saa(case, {name: value[subset] for name, value in samples.items()}, params,
+                                   solver=highs_solver, time_limit=args.time_limit)
+            evaluation = RecourseEvaluator(case, params, result.first_stage, backend="highs").evaluate(test, workers=1)
+            print(ROW % (count, method, "%.3f" % result.reduction_seconds, "%.2f" % result.seconds,
+                         "%.2f" % result.day_ahead, "%.2f" % result.real_time, "%.4f" % result.objective,
+                         "%.4f" % np.nanmean(evaluation.revenue), result.status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Out-of-sample settlement: throughput and revenue distribution of solved bids.
+
+    python benchmarks/bench_settlement.py [workbook] [--scenarios 100000] [--time-dim 24]
+                                          [--min-dim 12] [--interval 1.0] [--price-sigma 0.0]
+                                          [--chunk 4096] [--time-limit 300]
+
+The sparse model (tiled to ``--time-dim`` x ``--min-dim``) is solved with
+HiGHS, and its bids are settled with :func:`robust_bidding.settlement.settle`
+against ``--scenarios`` realizations from
+:func:`robust_bidding.settlement.sample_scenarios`.  Prints the sampling and
+settlement time and :meth:`~robust_bidding.settlement.Settlement.summary`
+next to the model objective.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding.settlement import sample_scenarios, settle
+from robust_bidding.sparse import build_sparse_model
+from bench_build import DEFAULT_WORKBOOK, available, scaled_case
+from bench_hourly import highs_solver
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--scenarios", type=int, default=100000)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, default=12)
+    parser.add_argument("--bess-dim", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--price-sigma", type=float, default=0.0)
+    parser.add_argument("--chunk", type=int, default=4096)
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if not available("highspy"):
+        parser.error("highspy is required")
+
+    data = load_market_data(args.workbook)
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids)
+    case, params = scaled_case(data, args.time_dim, args.min_dim, args.bess_dim, base)
+    sparse = build_sparse_model(case, params)
+    status, objective, x = highs_solver(sparse, args.time_limit)
+    if x is None:
+        parser.exit(1, "no solution (%s)\n" % status)
+    bids = {name: x[index] for name, index in sparse.blocks.items()}
+    print("model: %s, objective %.4f (AV-RO-DA %.4f + AV-RO %.4f)"
+          % (status, objective, bids["AV-RO-DA"].sum(), bids["AV-RO"].sum()))
+
+    start = time.perf_counter()
+    scenarios = sample_scenarios(case, params, args.scenarios, seed=args.seed, price_sigma=args.price_sigma)
+    sampled = time.perf_counter() - start
+    start = time.perf_counter()
+    result = settle(bids, scenarios, case, params, chunk=args.chunk)
+    settled = time.perf_counter() - start
+    print("%d scenarios: sampled in %.2f s, settled in %.2f s (%.0f scenarios/s)"
+          % (args.scenarios, sampled, settled, args.scenarios / settled))
+    for name, value in result.summary().items():
+        print("%-15s %s" % (name, "%.4f" % value if isinstance(value, float) else value))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Fleets of identical BESS units: solve time with and without symmetry breaking.
+
+    python benchmarks/bench_symmetry.py [workbook] [--units 2 8 32] [--min-dim 4]
+                                        [--interval 1.0] [--hourly-bids hourly]
+                                        [--time-limit 300]
+
+Every unit gets the ratings of the first BESS of ``Code_v003.py`` (5 MW /
+30 MWh), so the whole fleet is one group of
+:func:`robust_bidding.symmetry.identical_bess_groups`.  The sparse model is
+built with ``symmetry="none"`` and ``"order"`` and solved with HiGHS: rows,
+MIP objective, branch-and-bound nodes and seconds.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BESS_ARRAYS, SYMMETRY_MODES, BiddingParameters
+from robust_bidding.sparse import build_sparse_model
+from robust_bidding.symmetry import ordered_pairs
+from bench_build import DEFAULT_WORKBOOK, available, scaled_case
+from bench_hourly import solve_highs
+
+ROW = "%5s %-8s %8s %8s %6s %14s %8s %9s %s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--units", type=int, nargs="+", default=[2, 8, 32])
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, default=4)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", default="hourly")
+    parser.add_argument("--time-limit", type=float, default=300)
+    args = parser.parse_args(argv)
+    if not available("highspy"):
+        parser.error("highspy is required")
+
+    data = load_market_data(args.workbook)
+    unit = BiddingParameters()
+    base = BiddingParameters(interval=args.interval, hourly_bids=args.hourly_bids, BESS_dim=1,
+                             **{name: getattr(unit, name)[:1] for name in BESS_ARRAYS})
+    print(ROW % ("units", "symmetry", "rows", "cols", "pairs", "objective", "nodes", "solve s", "status"))
+    for S in args.units:
+        case, params = scaled_case(data, args.time_dim, args.min_dim, S, base)
+        for mode in SYMMETRY_MODES:
+            p = params.replace(symmetry=mode)
+            sm = build_sparse_model(case, p)
+            status, objective, seconds, nodes = solve_highs(sm, args.time_limit)
+            print(ROW % (S, mode, sm.shape[0], sm.shape[1], len(ordered_pairs(p)), "%.4f" % objective,
+                         nodes, "%.2f" % seconds, status))
+
+
+if __name__ == "__main__":
+    main()
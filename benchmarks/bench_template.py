@@ -0,0 +1,65 @@
+"""Rebuild vs. re-price: cost per trading day of the docplex model.
+
+    python benchmarks/bench_template.py [workbook] [--days 5] [--min-dim 12]
+
+Every "day" is the bundled workbook tiled to ``--min-dim`` with prices and
+expected deployments scaled by a random factor.  For each day the model is
+either rebuilt with :func:`robust_bidding.model.build_optimization_model` or
+re-priced with :meth:`robust_bidding.template.BiddingModelTemplate.update_from`
+(solve time is not included).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.data import MarketData, load_market_data
+from robust_bidding.model import build_optimization_model
+from robust_bidding.params import BiddingParameters
+from robust_bidding.template import BiddingModelTemplate
+from bench_build import DEFAULT_WORKBOOK, scaled_case
+
+
+def perturbed_days(case, days, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(days):
+        arrays = {name: (value * rng.uniform(0.8, 1.2, value.shape) if value is not None and np.ndim(value) == 2 else value)
+                  for name, value in case.arrays.items()}
+        yield MarketData(case.time_dim, case.min_dim, arrays)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--time-dim", type=int, default=24)
+    parser.add_argument("--min-dim", type=int, default=12)
+    args = parser.parse_args(argv)
+
+    data = load_market_data(args.workbook)
+    case, params = scaled_case(data, args.time_dim, args.min_dim, BiddingParameters().BESS_dim)
+    days = list(perturbed_days(case, args.days))
+
+    start = time.perf_counter()
+    for day in days:
+        build_optimization_model(day, params)
+    rebuild = (time.perf_counter() - start) / len(days)
+
+    start = time.perf_counter()
+    template = BiddingModelTemplate(case, params)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for day in days:
+        template.update_from(day)
+    update = (time.perf_counter() - start) / len(days)
+
+    print("rebuild per day  %8.3f s" % rebuild)
+    print("template build   %8.3f s (once)" % first)
+    print("update per day   %8.3f s  (%.1fx)" % (update, rebuild / update))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Robust bidding model for aggregated energy storages and wind resources.
+
+Submodules are imported on first attribute access, so ``import robust_bidding``
+does no I/O and does not pull in numpy, docplex, pandas or win32com.
+"""
+import importlib
+
+_EXPORTS = {
+    "SHEETS": "data",
+    "MarketData": "data",
+    "load_market_data": "data",
+    "read_xlsx": "data",
+    "load_market_data_cached": "cache",
+    "BiddingParameters": "params",
+    "build_optimization_model": "model",
+    "BiddingModelTemplate": "template",
+    "RollingHorizon": "rolling",
+    "build_affine_model": "affine",
+    "ColumnConstraintGeneration": "ccg",
+    "make_solver": "solvers",
+    "solve_by_deadline": "deadline",
+    "run_sweep": "sweep",
+    "run_batch": "batch",
+    "add_mip_start": "warmstart",
+    "heuristic_start": "warmstart",
+    "solve_saa": "saa",
+    "settle": "settlement",
+    "Telemetry": "telemetry",
+    "profile_sparse": "profiling",
+    "profile_docplex": "profiling",
+    "RecourseEvaluator": "recourse",
+    "SparseModel": "sparse",
+    "build_sparse_model": "sparse",
+    "build_optimization_model_sparse": "sparse",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module("." + _EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
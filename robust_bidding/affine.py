@@ -0,0 +1,193 @@
+"""Affine decision rules for the real-time stage (``uncertainty="affine"``).
+
+``Code_v003.py`` chooses the deployments together with the realization of
+식(61)~(63), and :class:`~robust_bidding.ccg.ColumnConstraintGeneration`
+re-optimizes them per worst-case scenario.  Here the real-time stage is the
+LP of :class:`~robust_bidding.ccg.Recourse` (deployments, ``E_BESS_RT`` and
+penalized shortfalls) with every recourse variable an affine function of
+the deviation ``ξ = u - nominal`` of its own interval ``k = (t, j)``::
+
+    P_UR_DCH[k, s] = P-UR-DCH[k, s] + ADR-UR-DCH[k, s] * ξ_UR[k]    (P_UR_WPR, S_UR likewise)
+    P_DR_CH[k, s]  = P-DR-CH[k, s]  + ADR-DR-CH[k, s]  * ξ_DR[k]    (P_DR_WPR, S_DR likewise)
+    S_WPR[k, w]    = S-WPR[k, w]    + ADR-S-WPR[k, w]  * ξ_WPR[k]
+
+with ``ξ`` in the box ``[-down, up]`` of :func:`~robust_bidding.ccg.uncertainty_range`.
+The robust counterpart is one deterministic MILP over the first stage of
+:func:`~robust_bidding.ccg.first_stage`, the intercepts and the slopes:
+
+* 식(10)/(11) hold for every ``ξ``: the intercepts add up to the nominal
+  call and the slopes to 1;
+* rows with one or two ``ξ`` terms (식(27), (28), (37), (38), the wind rows
+  of 식(33)~(35) and ``y >= 0``) are written at every vertex of their ``ξ``;
+* ``E_BESS_RT`` depends on every ``ξ`` up to ``k``: its largest excursion
+  above / below the nominal trajectory accumulates in ``ADR-G-UP`` /
+  ``ADR-G-DN`` (one recursion row per vertex of the interval's
+  ``(ξ_UR, ξ_DR)``), which 식(32) RT adds to the nominal ``E-BESS-RT``;
+* 식(65): ``AV-RO[t]`` is at most the nominal real-time value plus, per
+  interval, the worst slope term ``ADR-Z-UR`` / ``ADR-Z-DR`` / ``ADR-Z-WPR``;
+* 식(19) RT holds on the nominal trajectory only - an affine ``E_BESS_RT``
+  meets a fixed end-of-day value for every ``ξ`` only if the BESS never
+  follows a call.
+
+Shortfalls cost ``params.shortfall_price`` (:func:`~robust_bidding.ccg.shortfall_penalty`).
+The model grows linearly with ``time_dim`` and needs no scenarios.
+"""
+from itertools import product
+from math import inf
+
+import numpy as np
+
+from .ccg import SECOND_STAGE, first_stage, shortfall_penalty, uncertainty_range
+from .params import BiddingParameters
+from .sparse import ColumnLayout, RowBuilder, SparseModel, _flat, build_sparse_model
+
+### 아핀 규칙을 따르는 실시간 변수 - 절편 변수: (기울기 변수, 불확실 성분)
+RULES = {
+    "P-UR-DCH": ("ADR-UR-DCH", "UR"),
+    "P-UR-WPR": ("ADR-UR-WPR", "UR"),
+    "S-UR": ("ADR-S-UR", "UR"),
+    "P-DR-CH": ("ADR-DR-CH", "DR"),
+    "P-DR-WPR": ("ADR-DR-WPR", "DR"),
+    "S-DR": ("ADR-S-DR", "DR"),
+    "S-WPR": ("ADR-S-WPR", "WPR"),
+}
+
+
+def _vertex_rows(r, label, terms, deviations, hi):
+    """``terms + Σ_i ξ_i * (slope_terms_i + const_i) <= hi`` at every vertex of ``ξ_i ∈ [-down_i, up_i]``.
+
+    ``deviations`` lists ``(slope_terms, const, up, down)`` with ``up`` /
+    ``down`` shaped like the rows.
+    """
+    for vertex in product(*[(up, -down) for _, _, up, down in deviations]):
+        row_terms, rhs = list(terms), hi
+        for (slope_terms, const, _, _), xi in zip(deviations, vertex):
+            for coef, cols in slope_terms:
+                row_terms.append((coef * xi.reshape(xi.shape + (1,) * (np.ndim(cols) - xi.ndim)), cols))
+            rhs = rhs - const * xi
+        r.add(label, row_terms, hi=rhs, shape=np.shape(vertex[0]))
+
+
+### 최적화 파트
+def build_affine_model(data, params=None):
+    """Assemble the affine decision-rule counterpart as a :class:`~robust_bidding.sparse.SparseModel`."""
+    from scipy.sparse import coo_matrix, csr_matrix, hstack, vstack
+
+    p = params if params is not None else BiddingParameters()
+    T, J, S, W = p.time_dim, p.min_dim, p.BESS_dim, p.WPR_dim
+    tjs, tjw = (T, J, S), (T, J, W)
+    del_S = p.del_S
+    E_min = np.asarray(p.E_min_BESS, dtype=float)
+    E_max = np.asarray(p.E_max_BESS, dtype=float)
+
+    ### 1단계 - ccg 마스터 문제와 같은 열과 행
+    base = build_sparse_model(data, p.replace(uncertainty="box", tighten_bounds=False))
+    cols, rows = first_stage(base)
+    nx = len(cols)
+    position = np.full(base.shape[1], -1)
+    position[cols] = np.arange(nx)
+    blocks = {name: position[index] for name, index in base.blocks.items() if name not in SECOND_STAGE}
+
+    def first(name, shape):
+        x = blocks[name]
+        return x if x.ndim == len(shape) else np.broadcast_to(x[:, None, :], shape)   # hourly_bids="hourly"
+
+    CH, DCH, DA_WPR = first("P-DA-CH", tjs), first("P-DA-DCH", tjs), first("P-DA-WPR", tjw)
+    RS_CH, RS_DCH, RS_WPR = first("P-RS-CH", tjs), first("P-RS-DCH", tjs), first("P-RS-WPR", tjw)
+    E_BESS_DA, D_Char, D_Dchar = blocks["E-BESS-DA"], first("D-Char", tjs), first("D-DChar", tjs)
+
+    ### 실시간 변수 - 절편 (>= 0 은 아래 꼭짓점 행이 보장), 기울기 (자유)
+    v = ColumnLayout()
+    for name, (slope, _) in RULES.items():
+        shape = (T, J) if name in ("S-UR", "S-DR") else (tjw if name.endswith("WPR") else tjs)
+        v.add(name, shape)
+        v.add(slope, shape, lb=-inf)
+    v.add("E-BESS-RT", tjs)
+    v.add("ADR-G-UP", tjs)
+    v.add("ADR-G-DN", tjs)
+    for comp in ("UR", "DR", "WPR"):
+        v.add("ADR-Z-" + comp, (T, J), lb=-inf)
+    v.add("AV-RO", (T,), lb=-inf)
+    y = {name: index + nx for name, index in v.blocks.items()}
+    a = lambda name: y[name]
+    b = lambda name: y[RULES[name][0]]
+
+    nominal, up, down = (value.reshape(3, T, J) for value in uncertainty_range(data, p))
+    nominal, up, down = (dict(zip(("UR", "DR", "WPR"), value)) for value in (nominal, up, down))
+
+    def band(comp, shape):   # ξ 의 (up, down) 을 행 모양으로
+        expand = lambda x: np.broadcast_to(x.reshape((T, J) + (1,) * (len(shape) - 2)), shape)
+        return expand(up[comp]), expand(down[comp])
+
+    Price_UR = np.asarray(data.Price_UR, dtype=float)[:T, :J]
+    Price_DR = np.asarray(data.Price_DR, dtype=float)[:T, :J]
+    ur = (Price_UR * del_S)[:, :, None]
+    dr = (Price_DR * del_S)[:, :, None]
+    penalty = shortfall_penalty(data, p) * del_S
+    value = {"P-UR-DCH": ur - p.Marginal_cost_DCH * del_S, "P-UR-WPR": ur - p.Marginal_cost_WPR * del_S,
+             "P-DR-CH": dr - p.Marginal_cost_CH * del_S, "P-DR-WPR": dr,
+             "S-UR": -penalty, "S-DR": -penalty, "S-WPR": -penalty}
+
+    r = RowBuilder()
+    ### 식(10)~(11) - 모든 ξ 에서 호출 = 배치 + 미이행
+    for label, comp, names in (("(10)", "UR", ("P-UR-DCH", "P-UR-WPR", "S-UR")),
+                               ("(11)", "DR", ("P-DR-CH", "P-DR-WPR", "S-DR"))):
+        r.add(label, [(1, a(name)) for name in names], lo=nominal[comp], hi=nominal[comp], shape=(T, J))
+        r.add(label + " ADR", [(1, b(name)) for name in names], lo=1, hi=1, shape=(T, J))
+    ### 식(27)~(28), (37)~(38) - 배치 <= 예비력 입찰
+    for label, name, reserve in (("(27)", "P-DR-CH", RS_CH), ("(28)", "P-UR-DCH", RS_DCH),
+                                 ("(37)", "P-UR-WPR", RS_WPR), ("(38)", "P-DR-WPR", RS_WPR)):
+        _vertex_rows(r, label, [(1, a(name)), (-1, reserve)], [([(1, b(name))], 0, *band(RULES[name][1], reserve.shape))], 0)
+    ### 배치, 미이행 >= 0
+    for name, (_, comp) in RULES.items():
+        _vertex_rows(r, "ADR >= 0", [(-1, a(name))], [([(-1, b(name))], 0, *band(comp, a(name).shape))], 0)
+    ### 식(33)~(35) RT - 전일 스케줄 + 상향 배치 <= 실현 풍력 + 미이행
+    _vertex_rows(r, "(33)-(35) RT", [(1, a("P-UR-WPR")), (1, DA_WPR), (-1, a("S-WPR"))],
+                 [([(1, b("P-UR-WPR"))], 0, *band("UR", tjw)), ([(-1, b("S-WPR"))], -1, *band("WPR", tjw))],
+                 np.broadcast_to(nominal["WPR"][:, :, None], tjw))
+
+    ### 식(17)~(19) RT - 명목 궤적 (ξ = 0), k = 인터벌 순번
+    E_DA, E_RT = _flat(E_BESS_DA), _flat(a("E-BESS-RT"))
+    CH_k, DCH_k, DR_CH, UR_DCH = _flat(CH), _flat(DCH), _flat(a("P-DR-CH")), _flat(a("P-UR-DCH"))
+    r.add("(17)-(18) RT", [(1, E_RT[1:]), (-1, E_RT[:-1]), (-del_S, CH_k[1:]), (del_S, DCH_k[1:]),
+                           (-del_S, DR_CH[1:]), (del_S, UR_DCH[1:])], lo=0, hi=0)
+    r.add("(19) RT", [(1, E_RT[-1]), (-1, E_DA[-1])], lo=0, hi=0)
+    r.add("(17)+(19) RT", [(1, E_RT[0]), (-1, E_DA[0]), (-del_S, DR_CH[0]), (del_S, UR_DCH[0])], lo=0, hi=0)
+    ### 명목 궤적 대비 최대 누적 편차 - ξ_UR 은 -del_S * ADR-UR-DCH, ξ_DR 은 del_S * ADR-DR-CH 만큼 E_BESS_RT 를 이동
+    B_UR, B_DR = _flat(b("P-UR-DCH")), _flat(b("P-DR-CH"))
+    UR_band, DR_band = (tuple(_flat(x) for x in band(comp, tjs)) for comp in ("UR", "DR"))
+    for name, sign in (("ADR-G-UP", 1), ("ADR-G-DN", -1)):
+        G = _flat(a(name))
+        for k, prev in ((slice(0, 1), []), (slice(1, None), [(1, G[:-1])])):
+            _vertex_rows(r, name, [(-1, G[k])] + prev,
+                         [([(-sign * del_S, B_UR[k])], 0, UR_band[0][k], UR_band[1][k]),
+                          ([(sign * del_S, B_DR[k])], 0, DR_band[0][k], DR_band[1][k])], 0)
+    ### 식(32) RT - 최악 편차를 더한 궤적이 에너지 범위 이내
+    r.add("(32) RT", [(E_min, D_Char), (E_min, D_Dchar), (-1, a("E-BESS-RT")), (1, a("ADR-G-DN"))], hi=0)
+    r.add("(32) RT", [(1, a("E-BESS-RT")), (1, a("ADR-G-UP")), (-E_max, D_Char), (-E_max, D_Dchar)], hi=0)
+
+    ### 식(65) - 시간당 실시간 수익 = 명목 수익 + 인터벌별 최악 기울기 항
+    for comp in ("UR", "DR", "WPR"):
+        names = [name for name, (_, c) in RULES.items() if c == comp]
+        _vertex_rows(r, "(65) ADR", [(1, a("ADR-Z-" + comp))],
+                     [([(-value[name], b(name)) for name in names], 0, *band(comp, (T, J)))], 0)
+    r.add("(65)", [(1, a("AV-RO"))] + [(-value[name], a(name)) for name in RULES]
+          + [(-1, a("ADR-Z-" + comp)) for comp in ("UR", "DR", "WPR")], hi=0, shape=(T,))
+
+    ### 1단계 행 + 실시간 행
+    rr, cc, vv, lo, hi = r.triplets()
+    A = vstack([hstack([base.matrix()[rows][:, cols], csr_matrix((len(rows), v.size))]),
+                coo_matrix((vv, (rr, cc)), shape=(r.size, nx + v.size))], format="csr")
+    c = np.concatenate((base.c[cols], np.zeros(v.size)))
+    c[a("AV-RO")] = 1
+    kept = np.zeros(base.shape[0], dtype=bool)
+    kept[rows] = True
+    kept = np.concatenate(([0], np.cumsum(kept)))
+    families = [(label, int(kept[i]), int(kept[j])) for label, i, j in base.families if kept[j] > kept[i]]
+    families += [(label, i + len(rows), j + len(rows)) for label, i, j in r.families]
+    return SparseModel.from_arrays(
+        p, [base.names[k] for k in cols] + v.names, c,
+        np.concatenate((base.col_lo[cols], v.lb)), np.concatenate((base.col_hi[cols], v.ub)),
+        np.concatenate((base.binary[cols], v.binary)), A,
+        np.concatenate((base.row_lo[rows], lo)), np.concatenate((base.row_hi[rows], hi)),
+        blocks=dict(blocks, **y), families=families)
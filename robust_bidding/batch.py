@@ -0,0 +1,281 @@
+"""Batch solving of many instances (days × portfolios × uncertainty settings).
+
+A manifest is a JSON-lines file, one instance per line::
+
+    {"id": "0501/p1/box", "workbook": "days/0501.xlsx", "params": {"interval": 0.3, "P_max_BESS": [5, 3]}}
+
+``params`` are :class:`~robust_bidding.params.BiddingParameters` fields;
+``backend``, ``time_limit`` and ``mipgap`` may override the batch defaults
+per instance.  Relative workbook paths are taken from the manifest's
+directory.  :func:`instance_grid` builds the product of workbooks,
+portfolios and uncertainty settings for :func:`write_manifest`.
+
+:func:`run_batch` solves the instances in a process pool of ``workers``
+processes with ``threads`` solver threads each; ``threads`` is reduced so
+that ``workers * threads`` stays within the cores (at least one per worker).  Every attempt is appended to the results file
+(JSON lines, flushed and fsync'd) as soon as it ends; a rerun over the same
+results file skips the instances already finished, so a crashed batch
+resumes where it stopped.  An instance that raises - or whose worker dies -
+is tried again up to ``retries`` times.  Infeasible instances are results,
+not failures.
+"""
+import json
+import os
+import time
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+
+_DATA = {}   # 작업 프로세스별 (workbook, time_dim, min_dim) -> MarketData
+
+
+@dataclass
+class BatchRecord:
+    """One attempt of one instance, a line of the results file."""
+
+    id: str
+    attempt: int                 # 1-based
+    status: str                  # solvers.STATUSES, or "error"
+    objective: float = None
+    bound: float = None
+    gap: float = None
+    backend: str = None
+    seconds: float = None        # load + build + solve in the worker
+    threads: int = None
+    error: str = None            # exception text of a failed attempt
+
+    @property
+    def failed(self):
+        return self.status == "error"
+
+
+def read_manifest(path):
+    """Instances of a JSON-lines manifest; workbook paths made absolute, ids checked unique."""
+    root = os.path.dirname(os.path.abspath(path))
+    instances, seen = [], set()
+    with open(path) as fp:
+        for number, line in enumerate(fp, 1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            instance = json.loads(line)
+            if "id" not in instance or "workbook" not in instance:
+                raise ValueError("%s:%d: an instance needs an 'id' and a 'workbook'" % (path, number))
+            if instance["id"] in seen:
+                raise ValueError("%s:%d: duplicate instance id %r" % (path, number, instance["id"]))
+            seen.add(instance["id"])
+            instance["workbook"] = os.path.join(root, instance["workbook"])
+            instances.append(instance)
+    return instances
+
+
+def instance_grid(workbooks, portfolios=None, settings=None):
+    """Manifest entries for every workbook × portfolio × setting.
+
+    ``portfolios`` and ``settings`` map a label to ``BiddingParameters``
+    overrides (e.g. ``{"p1": {"P_max_BESS": [5, 3]}}`` and
+    ``{"box30": {"interval": 0.3}}``); the id is ``<workbook stem>/<portfolio>/<setting>``.
+    """
+    portfolios = portfolios or {"base": {}}
+    settings = settings or {"box": {}}
+    out = []
+    for workbook in workbooks:
+        stem = os.path.splitext(os.path.basename(workbook))[0].replace(" ", "_")
+        for portfolio, assets in portfolios.items():
+            for setting, uncertainty in settings.items():
+                out.append({"id": "%s/%s/%s" % (stem, portfolio, setting), "workbook": workbook,
+                            "params": dict(assets, **uncertainty)})
+    return out
+
+
+def write_manifest(instances, path):
+    with open(path, "w") as fp:
+        fp.writelines(json.dumps(instance) + "\n" for instance in instances)
+
+
+def read_results(path):
+    """:class:`BatchRecord` of every complete line of a results file (a torn last line is skipped)."""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path) as fp:
+        for line in fp:
+            try:
+                records.append(BatchRecord(**json.loads(line)))
+            except (ValueError, TypeError):
+                pass   # 중단된 쓰기
+    return records
+
+
+def _split_cores(workers, threads):
+    """``(workers, threads)`` with ``workers * threads`` within the cores (``threads`` is cut, never below 1)."""
+    cores = os.cpu_count() or 1
+    if workers is None:
+        workers = max(1, cores // (threads or 1))
+    return workers, max(1, min(threads or cores, cores // workers))
+
+
+def _init_worker():
+    _DATA.clear()
+
+
+def _solve_instance(instance, attempt, backend, time_limit, mipgap, threads, solution_dir, telemetry=None):
+    """Load, build and solve one instance in a worker; returns its :class:`BatchRecord`."""
+    from .cache import load_market_data_cached
+    from .params import BiddingParameters
+    from .results import export_result_json
+    from .solvers import solve
+    from .sparse import build_sparse_model
+    from .telemetry import Telemetry
+
+    begin = time.perf_counter()
+    backend = instance.get("backend", backend)
+    meta = dict(instance.get("params", {}), id=instance["id"], attempt=attempt, workbook=instance["workbook"],
+                backend=backend, threads=threads)
+    with (Telemetry(telemetry, run="%s#%d" % (instance["id"], attempt), meta=meta)
+          if telemetry is not None else nullcontext()) as log:   # 잘못된 params 도 status="error" 로 기록
+        params = BiddingParameters(**instance.get("params", {}))
+        phase = log.phase if log is not None else (lambda name: nullcontext())
+        key = (instance["workbook"], params.time_dim, params.min_dim)
+        with phase("load"):
+            if key not in _DATA:
+                _DATA[key] = load_market_data_cached(*key)
+        with phase("build"):
+            sparse = build_sparse_model(_DATA[key], params)
+        with phase("solve"):
+            result = solve(sparse, backend, instance.get("time_limit", time_limit),
+                           mipgap=instance.get("mipgap", mipgap), threads=threads, telemetry=log)
+        with phase("extract"):
+            if solution_dir is not None and result.solved:   # 임시 파일에 쓴 뒤 교체
+                path = os.path.join(solution_dir, instance["id"].replace("/", "__") + ".json")
+                export_result_json(result, sparse, path + ".tmp")
+                os.replace(path + ".tmp", path)
+        if log is not None:
+            log.finish(result.status, result.objective)
+    return BatchRecord(id=instance["id"], attempt=attempt, status=result.status, objective=result.objective,
+                       bound=result.bound, gap=result.gap, backend=result.backend,
+                       seconds=time.perf_counter() - begin, threads=threads)
+
+
+class _ResultLog(object):
+    """Append-only JSON-lines results file, synced after every record."""
+
+    def __init__(self, path):
+        self.path = path
+        torn = os.path.exists(path) and os.path.getsize(path) > 0
+        if torn:
+            with open(path, "rb") as fp:
+                fp.seek(-1, os.SEEK_END)
+                torn = fp.read(1) != b"\n"
+        self._fp = open(path, "a")
+        if torn:   # 중단된 마지막 줄을 닫아 다음 기록과 섞이지 않게
+            self._fp.write("\n")
+
+    def write(self, record):
+        self._fp.write(json.dumps(asdict(record)) + "\n")
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+
+    def close(self):
+        self._fp.close()
+
+
+def run_batch(instances, results_path, workers=None, threads=None, retries=1, backend="auto", time_limit=None,
+              mipgap=None, solution_dir=None, progress=None, telemetry=None):
+    """Solve ``instances`` (manifest entries or a manifest path); returns the last record per instance.
+
+    ``workers=None`` fills the cores with ``threads`` threads per worker
+    (1 by default); ``threads=None`` divides the cores among ``workers`` and
+    a larger ``threads`` is cut to that share.
+    Instances with a successful record - or ``retries + 1`` failed ones -
+    in ``results_path`` are not solved again.  ``solution_dir`` receives
+    ``<id>.json`` (:func:`~robust_bidding.results.export_result_json`) per
+    solved instance.  ``progress(record)`` is called after each attempt.
+    ``telemetry`` is a JSON-lines file shared by the workers
+    (:class:`~robust_bidding.telemetry.Telemetry`, run ``<id>#<attempt>``).
+    ``workers=1`` solves in the calling process.
+    """
+    if isinstance(instances, (str, os.PathLike)):
+        instances = read_manifest(instances)
+    workers, threads = _split_cores(workers, threads)
+    if solution_dir is not None:
+        os.makedirs(solution_dir, exist_ok=True)
+
+    by_id = {instance["id"]: instance for instance in instances}
+    last, attempts = {}, {}
+    for record in read_results(results_path):   # 이전 실행 - 재개
+        last[record.id] = record
+        attempts[record.id] = max(attempts.get(record.id, 0), record.attempt)
+    done = lambda k: k in last and (not last[k].failed or attempts[k] > retries)
+    queue = [instance for instance in instances if not done(instance["id"])]
+
+    log = _ResultLog(results_path)
+
+    def finish(record):
+        last[record.id], attempts[record.id] = record, record.attempt
+        log.write(record)
+        if progress is not None:
+            progress(record)
+        if record.failed and record.attempt <= retries:
+            queue.append(by_id[record.id])
+
+    def failure(instance, attempt, error):
+        return BatchRecord(id=instance["id"], attempt=attempt, status="error", threads=threads,
+                           error="%s: %s" % (type(error).__name__, error))
+
+    def task(instance):
+        attempt = attempts.get(instance["id"], 0) + 1
+        return instance, attempt, backend, time_limit, mipgap, threads, solution_dir, telemetry
+
+    try:
+        if workers == 1:
+            while queue:
+                args = task(queue.pop(0))
+                try:
+                    record = _solve_instance(*args)
+                except Exception as error:
+                    record = failure(args[0], args[1], error)
+                finish(record)
+        while queue:   # 작업 프로세스가 죽으면 풀을 새로 만듦
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                pending, broken = {}, None
+                while (queue or pending) and broken is None:
+                    while queue and len(pending) < workers:
+                        args = task(queue[0])
+                        try:
+                            pending[pool.submit(_solve_instance, *args)] = args
+                        except BrokenProcessPool as error:   # 앞서 죽은 작업 - 제출 못 한 인스턴스는 시도로 세지 않음
+                            broken = error
+                            break
+                        queue.pop(0)
+                    if broken is not None:
+                        break
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        args = pending.pop(future)
+                        try:
+                            record = future.result()
+                        except BrokenProcessPool as error:
+                            broken, record = error, failure(args[0], args[1], error)
+                        except Exception as error:
+                            record = failure(args[0], args[1], error)
+                        finish(record)
+                for args in pending.values():   # 어느 작업이 죽었는지 모르므로 실행 중이던 모두가 한 번 실패
+                    finish(failure(args[0], args[1], broken))
+    finally:
+        log.close()
+    return [last[instance["id"]] for instance in instances if instance["id"] in last]
+
+
+def batch_table(records):
+    """Status counts, failures and solve time of :func:`run_batch` records as text."""
+    lines, counts = [], {}
+    for record in records:
+        counts[record.status] = counts.get(record.status, 0) + 1
+    lines.append("instances: %d  (%s)" % (len(records), ", ".join("%s %d" % item for item in sorted(counts.items()))))
+    seconds = [record.seconds for record in records if record.seconds is not None]
+    if seconds:
+        lines.append("seconds: total %.1f, mean %.2f, max %.2f" % (sum(seconds), sum(seconds) / len(seconds), max(seconds)))
+    lines += ["failed %s (attempt %d): %s" % (record.id, record.attempt, record.error)
+              for record in records if record.failed]
+    return "\n".join(lines)
@@ -0,0 +1,127 @@
+"""Bounds derived from the asset ratings and the uncertainty set.
+
+Only NumPy is needed; both builders take their constants from here.
+"""
+import numpy as np
+
+from .params import BIG_M_MODES, BiddingParameters
+from .uncertainty import UNCERTAIN, deviation_arrays, realization_band
+
+BIG_M = 10000000000   # 식(33)~식(35) of Code_v003.py
+
+
+def wpr_big_m(expected_wind, params=None):
+    """Big-M of 식(33)~(35) per ``(t, j, w)``, shape ``(time_dim, min_dim, WPR_dim)``.
+
+    ``expected_wind`` is ``Expected_P_RT_WPR``, ``(time_dim, min_dim)``.
+    With ``big_m="constant"`` this is :data:`BIG_M` everywhere.  Otherwise it
+    is the upper bound of ``P_RT_WPR`` from 식(63),
+    ``(1 + interval) * Expected_P_RT_WPR[t, j]``, which is the smallest value
+    that keeps every row valid:
+
+    * ``D_WPR = 1``: ``P_DA_WPR``, ``P_RS_WPR`` and their sum are at most
+      ``P_RT_WPR`` by the first row of each equation, so ``<= M * D_WPR``
+      never cuts;
+    * ``D_WPR = 0``: the second rows force ``P_DA_WPR = P_RS_WPR = 0`` and the
+      first rows reduce to ``0 <= P_RT_WPR + M``.
+    """
+    p = params if params is not None else BiddingParameters()
+    if p.big_m not in BIG_M_MODES:
+        raise ValueError("big_m must be one of %s, got %r" % (", ".join(BIG_M_MODES), p.big_m))
+    shape = (p.time_dim, p.min_dim, p.WPR_dim)
+    if p.big_m == "constant":
+        return np.full(shape, float(BIG_M))
+    expected = np.asarray(expected_wind, dtype=float)[:p.time_dim, :p.min_dim]
+    return np.broadcast_to(np.maximum((1 + p.interval) * expected, 0)[:, :, None], shape).copy()
+
+
+### 시간 내 일정한 입찰 변수 - hourly 모드에서는 (t, s) / (t, w)
+BID_FAMILIES = ("P-DA-CH", "P-DA-DCH", "P-DA-WPR", "P-RS-CH", "P-RS-DCH", "P-RS-WPR")
+
+
+def _upper(coef, lb, ub):
+    """Largest value of ``coef * x`` over ``lb <= x <= ub``."""
+    return np.where(np.asarray(coef) >= 0, coef * ub, coef * lb)
+
+
+def variable_bounds(data, params=None):
+    """Finite ``(lb, ub)`` per continuous variable family.
+
+    ``data`` needs ``Expected_P_UR``, ``Expected_P_DR`` and
+    ``Expected_P_RT_WPR``.  The arrays are shaped like the family's domain,
+    ``(t, j, s|w)``, ``(t, j)`` or ``(t,)``; the hourly-constant bids
+    (:data:`BID_FAMILIES`) are equal within each hour.  Every bound is implied
+    by the model rows, so the feasible set is unchanged:
+
+    * ``P-DA-CH/DCH <= P_max`` 식(20)/(24); ``P_min <= P-RS-CH/DCH <=
+      min(P_max, Ramp * del_S)`` 식(21)/(25), (45)/(46); ``P-DR-CH`` /
+      ``P-UR-DCH`` below those 식(27)/(28); ``E-BESS-* <= E_max`` 식(32);
+    * ``P-UR``, ``P-DR``, ``P-RT-WPR`` within ``Expected * (1 ± interval)``
+      식(61)~(63) (``uncertainty="budget"``: at their nominal values,
+      :func:`~robust_bidding.uncertainty.realization_band`); ``P-DA-WPR`` / ``P-RS-WPR`` below the smallest wind upper
+      bound of the hour 식(33)/(34) with (6)/(14), ``P-RS-WPR`` also below
+      ``Ramp_rate_WPR * del_S`` 식(50); ``P-UR/DR-WPR`` below ``P-RS-WPR``
+      식(37)/(38);
+    * the hourly aggregates ``P-DA-S``, ``P-DA-B``, ``P-RS`` 식(7)~(9) and
+      ``C-t`` 식(3) from the bounds of their terms, ``P-RS`` also above
+      ``P-UR`` / ``P-DR`` 식(15)/(16);
+    * ``P-SP-WPR`` and ``AV-WPR`` appear in no row and are fixed to 0.
+
+    ``AV-RO``, ``AV-RO-DA`` and ``B-t`` depend on the prices and keep
+    ``ub=inf``; binaries and the dual variables ``RO-*`` are not listed.
+    """
+    p = params if params is not None else BiddingParameters()
+    T, J, S, W = p.time_dim, p.min_dim, p.BESS_dim, p.WPR_dim
+    del_S, tjs, tjw = p.del_S, (T, J, p.BESS_dim), (T, J, p.WPR_dim)
+    full = lambda value, shape: np.broadcast_to(np.asarray(value, dtype=float), shape).copy()
+    hour_min = lambda x: np.broadcast_to(x.min(axis=1, keepdims=True), x.shape).copy()
+
+    expected = {name: getattr(data, arrays[0]) for name, arrays in UNCERTAIN.items()}
+    realization = realization_band(expected, deviation_arrays(data, p) if p.uncertainty == "budget" else None, p)
+    band = lambda name: tuple(np.maximum(x, 0) for x in realization[name])   # 식(61)~(63)
+
+    ur_lo, ur_hi = band("P-UR")
+    dr_lo, dr_hi = band("P-DR")
+    wind_lo, wind_hi = band("P-RT-WPR")
+    P_max, P_min = np.asarray(p.P_max_BESS, dtype=float), np.asarray(p.P_min_BESS, dtype=float)
+    ramped = T * J > 1   # 식(45)/(46)/(50) 은 구간이 2개 이상일 때만 존재
+    rs_bess = np.minimum(P_max, np.asarray(p.Ramp_rate_BESS, dtype=float) * del_S) if ramped else P_max
+    wind = hour_min(full(wind_hi[:, :, None], tjw))
+    rs_wpr = np.minimum(wind, p.Ramp_rate_WPR * del_S) if ramped else wind
+
+    b = {}
+    b["P-DA-CH"] = b["P-DA-DCH"] = (full(0, tjs), full(P_max, tjs))
+    b["P-RS-CH"] = b["P-RS-DCH"] = (full(P_min, tjs), full(rs_bess, tjs))
+    b["P-UR-DCH"] = b["P-DR-CH"] = (full(0, tjs), full(rs_bess, tjs))
+    b["E-BESS-DA"] = b["E-BESS-RT"] = (full(0, tjs), full(p.E_max_BESS, tjs))
+    b["P-RT-WPR"] = (full(wind_lo[:, :, None], tjw), full(wind_hi[:, :, None], tjw))
+    b["P-DA-WPR"] = (full(0, tjw), wind)
+    b["P-RS-WPR"] = b["P-UR-WPR"] = b["P-DR-WPR"] = (full(0, tjw), rs_wpr)
+    b["P-SP-WPR"] = b["AV-WPR"] = (full(0, tjw), full(0, tjw))
+    b["P-UR"] = (ur_lo, np.minimum(ur_hi, b["P-UR-DCH"][1].sum(axis=2) + b["P-UR-WPR"][1].sum(axis=2)))   # 식(10)
+    b["P-DR"] = (dr_lo, np.minimum(dr_hi, b["P-DR-CH"][1].sum(axis=2) + b["P-DR-WPR"][1].sum(axis=2)))   # 식(11)
+
+    per_hour = lambda *names: del_S * sum(b[n][1].sum(axis=(1, 2)) for n in names)
+    b["P-DA-S"] = (full(0, T), per_hour("P-DA-DCH", "P-DA-WPR"))
+    b["P-DA-B"] = (full(0, T), per_hour("P-DA-CH"))
+    b["P-RS"] = (np.maximum.reduce([del_S * b["P-RS-CH"][0].sum(axis=(1, 2)) * 2, b["P-UR"][0].max(axis=1), b["P-DR"][0].max(axis=1)]),
+                 per_hour("P-RS-CH", "P-RS-DCH", "P-RS-WPR"))
+    cost = [(p.Marginal_cost_DCH, "P-DA-DCH"), (p.Marginal_cost_CH, "P-DA-CH"), (p.Marginal_cost_WPR, "P-DA-WPR"),
+            (p.Marginal_cost_DCH, "P-UR-DCH"), (p.Marginal_cost_CH, "P-DR-CH"), (p.Marginal_cost_WPR, "P-UR-WPR")]
+    b["C-t"] = (full(0, T), del_S * sum(_upper(mc, *b[n]).sum(axis=(1, 2)) for mc, n in cost))
+
+    ### 모순된 한계 (이미 infeasible 한 데이터) 는 상한을 하한까지 올려 solver 가 판정하게 함
+    return {name: (lb, np.maximum(ub, lb)) for name, (lb, ub) in b.items()}
+
+
+def count_tightened(bounds, params=None):
+    """``(lower, upper, variables)``: bounds raised above 0 / below ``inf`` and the variables covered."""
+    p = params if params is not None else BiddingParameters()
+    lower = upper = size = 0
+    for name, (lb, ub) in bounds.items():
+        if p.hourly_bids == "hourly" and name in BID_FAMILIES:
+            lb, ub = lb[:, 0], ub[:, 0]
+        lower += int((lb > 0).sum())
+        upper += int(np.isfinite(ub).sum())
+        size += lb.size
+    return lower, upper, size
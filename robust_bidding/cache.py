@@ -0,0 +1,73 @@
+"""Content-hashed ``.npz`` cache of parsed input workbooks.
+
+The cache key is a SHA-256 over the workbook bytes, the sheet list and the
+``(time_dim, min_dim)`` slice, so an edited workbook (or a different slice)
+misses automatically.  Entries live next to the workbook in ``.robust_cache/``
+unless ``cache_dir`` is given, named after the escaped workbook file name and
+the slice (``<name>-<time_dim>x<min_dim>-<key>.npz``); a rebuilt entry
+evicts only older entries of the same workbook and slice.
+"""
+import glob
+import hashlib
+import os
+import tempfile
+from urllib.parse import quote
+
+import numpy as np
+
+from .data import OPTIONAL_SHEETS, SHEETS, MarketData, load_market_data
+
+CACHE_VERSION = 1          # bump when the array layout in data.py changes
+DEFAULT_CACHE_DIR = ".robust_cache"
+
+
+def workbook_key(path, time_dim=24, min_dim=12, sheets=SHEETS + OPTIONAL_SHEETS):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(chunk)
+    digest.update(("|".join(sheets) + "|%d|%d|%d" % (time_dim, min_dim, CACHE_VERSION)).encode())
+    return digest.hexdigest()
+
+
+def _cache_path(path, key, time_dim, min_dim, cache_dir):
+    """``(cache_dir, stem, entry)``; ``stem`` (escaped file name and slice) is shared by the stale entries."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), DEFAULT_CACHE_DIR)
+    stem = "%s-%dx%d" % (quote(os.path.basename(path), safe=""), time_dim, min_dim)
+    return cache_dir, stem, os.path.join(cache_dir, "%s-%s.npz" % (stem, key[:16]))
+
+
+def load_market_data_cached(path, time_dim=24, min_dim=12, reader="xlsx", cache_dir=None):
+    """:func:`load_market_data` with a content-hashed ``.npz`` cache in front."""
+    key = workbook_key(path, time_dim, min_dim)
+    cache_dir, stem, entry = _cache_path(path, key, time_dim, min_dim, cache_dir)
+
+    if os.path.exists(entry):
+        try:
+            with np.load(entry, allow_pickle=False) as npz:
+                if str(npz["__key__"]) == key:
+                    arrays = {name: npz[name] for name in npz.files if name != "__key__"}
+                    return MarketData(time_dim, min_dim, arrays)
+        except (OSError, ValueError, KeyError):
+            pass   # corrupt / partial entry - rebuild below
+
+    data = load_market_data(path, time_dim, min_dim, reader=reader)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(glob.escape(cache_dir), glob.escape(stem) + "-*.npz")):   # 같은 통합문서, 같은 구간만
+        if stale != entry:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    arrays = {name: value for name, value in data.arrays.items() if value is not None}
+    fd, tmp = tempfile.mkstemp(suffix=".npz", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            np.savez_compressed(fp, __key__=np.array(key), **arrays)
+        os.replace(tmp, entry)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return data
@@ -0,0 +1,430 @@
+"""Two-stage robust bidding by column-and-constraint generation (C&CG).
+
+``Code_v003.py`` (and ``uncertainty="budget"``) solve a single-stage model:
+the deployments ``P_UR`` / ``P_DR`` and the wind ``P_RT_WPR`` are chosen
+together with the bids.  Here they are a second stage decided after the
+realization ``u`` of 식(61)~(63) is known::
+
+    max_x  c'x + min_(u ∈ U) Q(x, u)
+
+* first stage ``x`` - every column of :func:`~robust_bidding.sparse.build_sparse_model`
+  outside :data:`SECOND_STAGE` and every row that uses only those (bids,
+  reserve, ``E_BESS_DA``, binaries, ramps, ``AV-RO-DA``);
+* recourse ``Q(x, u)`` - the real-time LP of :class:`Recourse`: deployments
+  per BESS / WPR within the reserve (식(27), (28), (37), (38)), ``E_BESS_RT``
+  of 식(17)~(19) and (32), and penalized shortfalls ``S-UR`` / ``S-DR`` /
+  ``S-WPR`` at ``shortfall_price`` (€/MWh).  A call the fleet cannot follow
+  (식(10)/(11), the soft form of 식(15)/(16)) or wind below the day-ahead
+  schedule plus up-regulation (식(33)~(35)) is a shortfall, so every ``u``
+  has a recourse;
+* ``U`` - ``u = Expected + Δ * ζ``, ``ζ ∈ {-1, 0, 1}`` per ``P_UR`` / ``P_DR`` /
+  ``P_RT_WPR`` interval (``u >= 0``), with ``Δ = interval * |Expected|`` for
+  ``uncertainty="box"`` and :func:`~robust_bidding.uncertainty.deviation_arrays`
+  plus ``Σ |ζ| <= ⌊Γ⌋`` per :data:`~robust_bidding.params.BUDGET_SCOPES` group
+  for ``"budget"`` (``gamma=None``: no budget row).  ``Q`` is concave in
+  ``u``, so the worst case lies on these vertices.
+
+:class:`ColumnConstraintGeneration` alternates
+
+1. the master problem: the first stage plus one recourse copy per known
+   scenario and ``η <= Q_k`` - its optimum is an upper bound;
+2. the adversarial subproblem for the master's ``x``: the LP dual of the
+   recourse with binary ``ζ`` (products linearized with the dual bounds,
+   :meth:`Recourse.dual_bounds`) - ``c'x + min_u Q(x, u)`` is a lower bound;
+
+and adds the worst ``ζ`` as a new scenario until the gap closes, the time
+limit or ``max_iterations`` is reached.  The scenarios are cached on the
+instance and seed the master of the next day solved with it.  Models are
+:class:`~robust_bidding.sparse.SparseModel` and go through ``solver``
+(by default :func:`~robust_bidding.solvers.make_solver`: CPLEX when licensed
+for the model's size, else HiGHS or CBC).
+"""
+import time
+from dataclasses import dataclass, field
+from math import inf
+
+import numpy as np
+
+from .params import BiddingParameters
+from .solvers import make_solver
+from .sparse import ColumnLayout, RowBuilder, SparseModel, _flat, build_sparse_model, to_docplex
+from .uncertainty import UNCERTAIN, check_uncertainty, deviation_arrays
+
+### 실시간 (2단계) 변수 - 마스터 문제에서는 Recourse 로 대체
+SECOND_STAGE = ("P-UR", "P-DR", "P-UR-DCH", "P-UR-WPR", "P-DR-CH", "P-DR-WPR", "P-SP-WPR", "E-BESS-RT",
+                "P-RT-WPR", "AV-WPR", "AV-RO", "B-t", "C-t", "RO-Z", "RO-Q-UR", "RO-Q-DR")
+
+
+@dataclass
+class CCGIteration:
+    """One master / subproblem round of :meth:`ColumnConstraintGeneration.solve`."""
+
+    iteration: int             # 1-based
+    lower: float               # best c'x + min_u Q(x, u) so far
+    upper: float               # master objective
+    gap: float                 # (upper - lower) / |upper|
+    scenarios: int             # scenarios in the master
+    master_seconds: float
+    subproblem_seconds: float
+
+
+@dataclass
+class CCGResult:
+    """Outcome of :meth:`ColumnConstraintGeneration.solve`."""
+
+    status: str                # "optimal" (gap closed), "time limit", "iteration limit" or "stalled"
+    lower: float
+    upper: float
+    gap: float
+    seconds: float
+    iterations: list = field(default_factory=list)           # CCGIteration per round
+    first_stage: dict = field(default_factory=dict, repr=False)   # family -> values of the best x
+    worst_case: dict = field(default_factory=dict, repr=False)    # "P-UR" / "P-DR" / "P-RT-WPR" -> (T, J) realization
+
+
+def solve_docplex(sparse, time_limit=None):
+    """``solver`` through docplex: ``(status, objective, x)`` of a :class:`SparseModel`.
+
+    ``x`` (column order) is ``None`` without a solution.
+    """
+    mdl = to_docplex(sparse)
+    if time_limit is not None:
+        mdl.parameters.timelimit = max(time_limit, 1)
+    s = mdl.solve()
+    if not s:
+        return mdl.solve_details.status, None, None
+    order = np.concatenate((np.flatnonzero(~sparse.binary), np.flatnonzero(sparse.binary)))   # to_docplex 생성 순서
+    x = np.empty(sparse.shape[1])
+    x[order] = s.get_values(list(mdl.iter_variables()))
+    return mdl.solve_details.status, s.objective_value, x
+
+
+def shortfall_penalty(data, params=None, price=None):
+    """Penalty of a shortfall (€/MWh): ``price``, else ``params.shortfall_price``, else twice the day's highest price."""
+    if price is None and params is not None:
+        price = params.shortfall_price
+    if price is None:
+        price = 2 * max(np.abs(np.asarray(getattr(data, name), dtype=float)).max()
+                        for name in ("Price_DA", "Price_RS", "Price_UR", "Price_DR"))
+    return price
+
+
+def uncertainty_range(data, params=None):
+    """``(nominal, up, down)`` of ``u`` (U-UR / U-DR / U-WPR order), ``u = nominal + up | - down >= 0``."""
+    p = params if params is not None else BiddingParameters()
+    T, J = p.time_dim, p.min_dim
+    expected = {name: np.asarray(getattr(data, arrays[0]), dtype=float)[:T, :J] for name, arrays in UNCERTAIN.items()}
+    if p.uncertainty == "budget":
+        deviation = deviation_arrays(data, p)
+    else:
+        deviation = {name: p.interval * np.abs(value) for name, value in expected.items()}
+    nominal = np.concatenate([np.maximum(expected[name], 0).ravel() for name in UNCERTAIN])
+    up = np.concatenate([deviation[name].ravel() for name in UNCERTAIN])
+    return nominal, up, np.minimum(up, nominal)
+
+
+def first_stage(sparse):
+    """``(cols, rows)``: first-stage columns of ``sparse`` and the rows that use only them."""
+    second = np.zeros(sparse.shape[1], dtype=bool)
+    for name in SECOND_STAGE:
+        if name in sparse.blocks:
+            second[sparse.blocks[name]] = True
+    touched = np.zeros(sparse.shape[0], dtype=bool)
+    touched[sparse.rows[second[sparse.cols] & (sparse.vals != 0)]] = True
+    return np.flatnonzero(~second), np.flatnonzero(~touched)
+
+
+class Recourse(object):
+    """Real-time LP ``lo - U u <= X x + Y y <= hi - U u``, ``max c'y``, ``y >= 0``.
+
+    ``blocks`` maps the first-stage families to their columns in ``x``
+    (``size`` columns); ``u`` is laid out as ``U-UR``, ``U-DR``, ``U-WPR``
+    ``(T, J)`` blocks.
+    """
+
+    def __init__(self, data, params, blocks, size, shortfall_price):
+        p = params
+        T, J, S, W = p.time_dim, p.min_dim, p.BESS_dim, p.WPR_dim
+        tjs, tjw = (T, J, S), (T, J, W)
+        del_S = p.del_S
+        E_min = np.asarray(p.E_min_BESS, dtype=float)
+        E_max = np.asarray(p.E_max_BESS, dtype=float)
+        nx = size
+
+        def first(name, shape):
+            x = blocks[name]
+            return x if x.ndim == len(shape) else np.broadcast_to(x[:, None, :], shape)   # hourly_bids="hourly"
+
+        CH, DCH, DA_WPR = first("P-DA-CH", tjs), first("P-DA-DCH", tjs), first("P-DA-WPR", tjw)
+        RS_CH, RS_DCH, RS_WPR = first("P-RS-CH", tjs), first("P-RS-DCH", tjs), first("P-RS-WPR", tjw)
+        E_BESS_DA, D_Char, D_Dchar = blocks["E-BESS-DA"], first("D-Char", tjs), first("D-DChar", tjs)
+
+        y = ColumnLayout()
+        P_UR_DCH, P_UR_WPR = y.add("P-UR-DCH", tjs), y.add("P-UR-WPR", tjw)
+        P_DR_CH, P_DR_WPR = y.add("P-DR-CH", tjs), y.add("P-DR-WPR", tjw)
+        E_BESS_RT = y.add("E-BESS-RT", tjs)
+        S_UR, S_DR, S_WPR = y.add("S-UR", (T, J)), y.add("S-DR", (T, J)), y.add("S-WPR", tjw)
+        u = ColumnLayout()
+        U_UR, U_DR, U_WPR = u.add("U-UR", (T, J)), u.add("U-DR", (T, J)), u.add("U-WPR", (T, J))
+        shift = lambda index, offset: index + offset
+        P_UR_DCH, P_UR_WPR, P_DR_CH, P_DR_WPR, E_BESS_RT, S_UR, S_DR, S_WPR = (
+            shift(index, nx) for index in (P_UR_DCH, P_UR_WPR, P_DR_CH, P_DR_WPR, E_BESS_RT, S_UR, S_DR, S_WPR))
+        U_UR, U_DR, U_WPR = (shift(index, nx + y.size) for index in (U_UR, U_DR, U_WPR))
+
+        Price_UR = np.asarray(data.Price_UR, dtype=float)[:T, :J]
+        Price_DR = np.asarray(data.Price_DR, dtype=float)[:T, :J]
+        ur = (Price_UR * del_S)[:, :, None]
+        dr = (Price_DR * del_S)[:, :, None]
+        penalty = shortfall_price * del_S
+        c = np.zeros(nx + y.size + u.size)
+        for coef, cols in ((ur - p.Marginal_cost_DCH * del_S, P_UR_DCH), (ur - p.Marginal_cost_WPR * del_S, P_UR_WPR),
+                           (dr - p.Marginal_cost_CH * del_S, P_DR_CH), (dr, P_DR_WPR),
+                           (-penalty, S_UR), (-penalty, S_DR), (-penalty, S_WPR)):
+            c[cols.ravel()] += np.broadcast_to(coef, cols.shape).ravel()
+
+        r = RowBuilder()
+        ### 식(10)~(11) - 호출 = 배치 + 미이행
+        r.add("(10)", [(-1, U_UR), (1, P_UR_DCH), (1, P_UR_WPR), (1, S_UR)], lo=0, hi=0)
+        r.add("(11)", [(-1, U_DR), (1, P_DR_CH), (1, P_DR_WPR), (1, S_DR)], lo=0, hi=0)
+        ### 식(27)~(28), (37)~(38) - 배치 <= 예비력 입찰
+        r.add("(27)", [(1, P_DR_CH), (-1, RS_CH)], hi=0)
+        r.add("(28)", [(1, P_UR_DCH), (-1, RS_DCH)], hi=0)
+        r.add("(37)", [(1, P_UR_WPR), (-1, RS_WPR)], hi=0)
+        r.add("(38)", [(1, P_DR_WPR), (-1, RS_WPR)], hi=0)
+        ### 식(17)~(19) RT, k = 인터벌 순번
+        E_DA, E_RT = _flat(E_BESS_DA), _flat(E_BESS_RT)
+        CH_k, DCH_k, DR_CH, UR_DCH = _flat(CH), _flat(DCH), _flat(P_DR_CH), _flat(P_UR_DCH)
+        r.add("(17)-(18) RT", [(1, E_RT[1:]), (-1, E_RT[:-1]), (-del_S, CH_k[1:]), (del_S, DCH_k[1:]),
+                               (-del_S, DR_CH[1:]), (del_S, UR_DCH[1:])], lo=0, hi=0)
+        r.add("(19) RT", [(1, E_RT[-1]), (-1, E_DA[-1])], lo=0, hi=0)
+        r.add("(17)+(19) RT", [(1, E_RT[0]), (-1, E_DA[0]), (-del_S, DR_CH[0]), (del_S, UR_DCH[0])], lo=0, hi=0)
+        ### 식(32) RT
+        r.add("(32) RT", [(E_min, D_Char), (E_min, D_Dchar), (-1, E_BESS_RT)], hi=0)
+        r.add("(32) RT", [(1, E_BESS_RT), (-E_max, D_Char), (-E_max, D_Dchar)], hi=0)
+        ### 식(33)~(35) RT - 전일 스케줄 + 상향 배치 <= 실현 풍력 + 미이행
+        r.add("(33)-(35) RT", [(1, P_UR_WPR), (1, DA_WPR), (-1, S_WPR), (-1, np.broadcast_to(U_WPR[:, :, None], tjw))], hi=0)
+
+        rows, cols, vals, self.lo, self.hi = r.triplets()
+        from scipy.sparse import coo_matrix
+
+        A = coo_matrix((vals, (rows, cols)), shape=(r.size, nx + y.size + u.size)).tocsc()
+        self.X, self.Y, self.U = A[:, :nx].tocsr(), A[:, nx:nx + y.size].tocsr(), A[:, nx + y.size:].tocsr()
+        self.c = c[nx:nx + y.size]
+        self.names, self.families = y.names, r.families
+        self.blocks = {name: index for name, index in y.blocks.items()}
+        self.shape = (r.size, y.size)
+        self.penalty, self.del_S = penalty, del_S
+        self.price = del_S * max(np.abs(Price_UR).max(), np.abs(Price_DR).max(),
+                                 p.Marginal_cost_CH, p.Marginal_cost_DCH, p.Marginal_cost_WPR)
+
+    def rhs(self, x, u):
+        """``(lo, hi)`` of ``Y y`` for first-stage values ``x`` and realization ``u``."""
+        shift = self.X @ x + self.U @ u
+        return self.lo - shift, self.hi - shift
+
+    def dual_bounds(self):
+        """``(lo, hi)`` of the row duals used to linearize ``ζ * dual``.
+
+        Without binding bounds the dual of a row is free (``=``), ``>= 0``
+        (``<=``) or ``<= 0`` (``>=``).  The call rows 식(10)/(11) lie within
+        ``±(shortfall + 2 * price) * del_S``: one more MW is at worst a
+        shortfall and at best its revenue plus the shortfall it frees later;
+        the wind rows within ``[0, shortfall * del_S]`` (dual row of ``S-WPR``).
+        """
+        eq = self.lo == self.hi
+        lo = np.where(eq | np.isinf(self.hi), -inf, 0.0)
+        hi = np.where(eq | np.isinf(self.lo), inf, 0.0)
+        touched = np.diff(self.U.indptr) > 0
+        bound = self.penalty + 2 * self.price
+        lo[touched & eq], hi[touched & eq] = -bound, bound
+        hi[touched & ~eq] = self.penalty
+        return lo, hi
+
+
+class ColumnConstraintGeneration(object):
+    """Two-stage robust bidding for one day at a time; see the module docstring.
+
+    ::
+
+        ccg = ColumnConstraintGeneration(params.replace(uncertainty="budget", gamma=4), gap=1e-3)
+        for day in days:
+            result = ccg.solve(day)
+            print(result.status, result.lower, result.upper, len(ccg.scenarios))
+
+    ``solver(sparse, time_limit)`` returns ``(status, objective, x)`` and
+    maximizes; ``shortfall_price=None`` is that of :func:`shortfall_penalty`.
+    ``cache_size`` scenarios (the latest) are kept for the next day.
+    """
+
+    def __init__(self, params=None, solver=None, gap=1e-4, time_limit=None, max_iterations=20,
+                 shortfall_price=None, cache_size=50):
+        self.params = params if params is not None else BiddingParameters()
+        check_uncertainty(self.params)
+        self.solver = solver if solver is not None else make_solver()
+        self.gap = gap
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.shortfall_price = shortfall_price
+        self.cache_size = cache_size
+        self.scenarios = []   # ζ (int8, U-UR / U-DR / U-WPR 순) - 다음 날 마스터의 초기 시나리오
+
+    def solve(self, data):
+        """Solve one day; returns a :class:`CCGResult`.
+
+        Raises ``RuntimeError`` when the master has no solution.
+        """
+        p = self.params
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit is not None else None
+        ### 마감을 넘긴 반복도 해를 얻도록 최소 1 초
+        remaining = lambda: max(deadline - time.perf_counter(), 1) if deadline is not None else None
+
+        sparse = build_sparse_model(data, p.replace(uncertainty="box", tighten_bounds=False))   # 한계는 식(61)~(63) 대역 기준
+        cols, rows = first_stage(sparse)
+        position = np.full(sparse.shape[1], -1)
+        position[cols] = np.arange(len(cols))
+        blocks = {name: position[index] for name, index in sparse.blocks.items() if name not in SECOND_STAGE}
+        recourse = Recourse(data, p, blocks, len(cols), shortfall_penalty(data, p, self.shortfall_price))
+        nominal, up, down = uncertainty_range(data, p)
+        base = (sparse, cols, rows, blocks)
+
+        scenarios, seen = [], set()
+        for zeta in [np.zeros(len(nominal), dtype=np.int8)] + self.scenarios:
+            if len(zeta) == len(nominal) and zeta.tobytes() not in seen:
+                seen.add(zeta.tobytes())
+                scenarios.append(zeta)
+
+        lower, upper, best, worst = -inf, inf, None, None
+        log, status = [], "iteration limit"
+        for iteration in range(1, self.max_iterations + 1):
+            begin = time.perf_counter()
+            master = self._master(base, recourse, [nominal + up * (z > 0) - down * (z < 0) for z in scenarios])
+            _, objective, solution = self.solver(master, remaining())
+            if solution is None:
+                raise RuntimeError("C&CG iteration %d: the master problem has no solution" % iteration)
+            master_seconds = time.perf_counter() - begin
+            x = solution[:len(cols)]
+            upper = min(upper, objective)
+
+            begin = time.perf_counter()
+            value, zeta = self._adversary(recourse, x, nominal, up, down, remaining())
+            subproblem_seconds = time.perf_counter() - begin
+            bound = float(sparse.c[cols] @ x) + value
+            if bound > lower:
+                lower, best, worst = bound, x, zeta
+            gap = (upper - lower) / max(abs(upper), 1e-9)
+            log.append(CCGIteration(iteration, lower, upper, gap, len(scenarios), master_seconds, subproblem_seconds))
+            if gap <= self.gap:
+                status = "optimal"
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                status = "time limit"
+                break
+            if zeta.tobytes() in seen:   # 새 시나리오 없음 - 솔버 허용오차 내 수렴
+                status = "stalled"
+                break
+            seen.add(zeta.tobytes())
+            scenarios.append(zeta)
+
+        self.scenarios = scenarios[1:][-self.cache_size:] if self.cache_size else []
+        T, J = p.time_dim, p.min_dim
+        realization = (nominal + up * (worst > 0) - down * (worst < 0)).reshape(3, T, J)
+        return CCGResult(status=status, lower=lower, upper=upper, gap=log[-1].gap,
+                         seconds=time.perf_counter() - start, iterations=log,
+                         first_stage={name: best[index] for name, index in blocks.items()},
+                         worst_case=dict(zip(UNCERTAIN, realization)))
+
+    def _budget(self):
+        """``(groups, limits)``: group of every ``u`` entry and ``⌊Γ⌋`` per group; ``None`` without a budget."""
+        p = self.params
+        if p.uncertainty != "budget" or p.gamma is None:
+            return None
+        hours = np.tile(np.repeat(np.arange(p.time_dim), p.min_dim), 3)
+        if p.budget_scope == "hour":
+            return hours, np.floor(np.broadcast_to(np.asarray(p.gamma, dtype=float), (p.time_dim,)))
+        return np.zeros_like(hours), np.floor(np.asarray([p.gamma], dtype=float))
+
+    def _master(self, base, recourse, realizations):
+        """First stage + ``η`` + one recourse copy per realization (``η <= Q_k``)."""
+        from scipy.sparse import bmat, csr_matrix
+
+        sparse, cols, rows, blocks = base
+        A = sparse.matrix()[rows][:, cols]
+        nx, (m, ny) = len(cols), recourse.shape
+        K = len(realizations)
+        eta = csr_matrix(np.ones((1, 1)))
+        grid = [[A, None] + [None] * K]
+        lo, hi = [sparse.row_lo[rows]], [sparse.row_hi[rows]]
+        for k, u in enumerate(realizations):
+            grid.append([recourse.X, None] + [recourse.Y if i == k else None for i in range(K)])
+            grid.append([None, eta] + [csr_matrix(-recourse.c[None, :]) if i == k else None for i in range(K)])
+            rlo, rhi = recourse.rhs(np.zeros(nx), u)
+            lo += [rlo, [-inf]]
+            hi += [rhi, [0.0]]
+        grid[0][1] = csr_matrix((A.shape[0], 1))
+        for i in range(K):
+            grid[0][2 + i] = csr_matrix((A.shape[0], ny))
+        names = [sparse.names[k] for k in cols] + ["ETA"]
+        for k in range(K):
+            names += ["K%d-%s" % (k + 1, name) for name in recourse.names]
+        return SparseModel.from_arrays(
+            sparse.params, names, np.concatenate((sparse.c[cols], [1.0], np.zeros(K * ny))),
+            np.concatenate((sparse.col_lo[cols], [-inf], np.zeros(K * ny))),
+            np.concatenate((sparse.col_hi[cols], [inf], np.full(K * ny, inf))),
+            np.concatenate((sparse.binary[cols], np.zeros(1 + K * ny, dtype=bool))),
+            bmat(grid, format="csr"), np.concatenate(lo), np.concatenate(hi), blocks=blocks)
+
+    def _adversary(self, recourse, x, nominal, up, down, time_limit):
+        """``(min_u Q(x, u), ζ)`` - dual of the recourse with binary ``ζ`` (McCormick products)."""
+        from scipy.sparse import bmat, csr_matrix, diags, identity
+
+        m, ny = recourse.shape
+        n = len(nominal)
+        shift = recourse.X @ x
+        eq = recourse.lo == recourse.hi
+        b = np.where(np.isinf(recourse.hi), recourse.lo, recourse.hi) - shift   # 행별 우변 (u 제외)
+        pi_lo, pi_hi = recourse.dual_bounds()
+        G = recourse.U.T.tocsr()                                                # g = U' π, (n, m)
+        g_lo = np.asarray(G.maximum(0) @ np.where(np.isinf(pi_lo), 0, pi_lo) + G.minimum(0) @ np.where(np.isinf(pi_hi), 0, pi_hi)).ravel()
+        g_hi = np.asarray(G.maximum(0) @ np.where(np.isinf(pi_hi), 0, pi_hi) + G.minimum(0) @ np.where(np.isinf(pi_lo), 0, pi_lo)).ravel()
+        I, Z = identity(n, format="csr"), None
+
+        # min (b - U nominal)'π - up'w⁺ + down'w⁻  ==  max 의 부호 반전; 열 = [π, z⁺, z⁻, w⁺, w⁻]
+        c = -np.concatenate((b - recourse.U @ nominal, np.zeros(2 * n), -up, down))
+        grid = [[recourse.Y.T, Z, Z, Z, Z]]                                     # Y'π >= c_y
+        lo, hi = [recourse.c], [np.full(ny, inf)]
+        for zcol, wcol in ((1, 3), (2, 4)):
+            for coef_z, coef_g, row_lo, row_hi in ((-g_lo, None, 0, inf), (-g_hi, None, -inf, 0),
+                                                   (-g_hi, -1, -g_hi, inf), (-g_lo, -1, -inf, -g_lo)):
+                row = [G * coef_g if coef_g else Z, Z, Z, Z, Z]
+                row[zcol], row[wcol] = diags(coef_z), I
+                grid.append(row)
+                lo.append(np.broadcast_to(row_lo, n))
+                hi.append(np.broadcast_to(row_hi, n))
+        grid.append([Z, I, I, Z, Z])                                            # z⁺ + z⁻ <= 1
+        lo.append(np.full(n, -inf))
+        hi.append(np.ones(n))
+        budget = self._budget()
+        if budget is not None:
+            groups, limits = budget
+            member = csr_matrix((np.ones(n), (groups, np.arange(n))), shape=(len(limits), n))
+            grid.append([Z, member, member, Z, Z])
+            lo.append(np.full(len(limits), -inf))
+            hi.append(limits)
+        grid[0][1:] = [csr_matrix((ny, n))] * 4
+
+        names = (["PI_%d" % (i + 1) for i in range(m)] + ["Z-UP_%d" % (i + 1) for i in range(n)]
+                 + ["Z-DN_%d" % (i + 1) for i in range(n)] + ["W-UP_%d" % (i + 1) for i in range(n)]
+                 + ["W-DN_%d" % (i + 1) for i in range(n)])
+        w_lo, w_hi = np.minimum(g_lo, 0), np.maximum(g_hi, 0)
+        sub = SparseModel.from_arrays(
+            self.params, names, c,
+            np.concatenate((pi_lo, np.zeros(2 * n), w_lo, w_lo)),
+            np.concatenate((pi_hi, np.ones(2 * n), w_hi, w_hi)),
+            np.concatenate((np.zeros(m, dtype=bool), np.ones(2 * n, dtype=bool), np.zeros(2 * n, dtype=bool))),
+            bmat(grid, format="csr"), np.concatenate(lo), np.concatenate(hi))
+        _, objective, solution = self.solver(sub, time_limit)
+        if solution is None:
+            raise RuntimeError("C&CG: the adversarial subproblem has no solution")
+        zeta = (np.round(solution[m:m + n]) - np.round(solution[m + n:m + 2 * n])).astype(np.int8)
+        return -objective, zeta
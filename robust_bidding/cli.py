@@ -0,0 +1,222 @@
+"""Command line entry point: ``python -m robust_bidding <workbook>``.
+
+Loads the workbook, builds and solves the model, then writes
+``variable_result.xlsx``, ``asset_revenue.xlsx``, ``solution.json`` and (when Excel COM is
+available) the "Optimization Result" sheet of ``robust model_result.xlsx``.  With
+``--sweep-interval`` / ``--sweep-gamma`` it solves the grid instead
+(:func:`robust_bidding.sweep.run_sweep`) and writes ``frontier.csv``.  With
+``--backend`` the sparse model is solved by :func:`robust_bidding.solvers.solve`
+(CPLEX, HiGHS or CBC) instead of docplex; the result workbook is not written.
+``--deadline`` solves the sparse model with
+:func:`robust_bidding.deadline.solve_by_deadline` and keeps ``solution.json``
+updated with the best bids found so far.  ``--warm-start`` starts either path from the binaries of a previous
+``solution.json`` or of :func:`robust_bidding.warmstart.heuristic_start`.
+With ``--batch`` the positional argument is a JSON-lines manifest of
+instances solved by :func:`robust_bidding.batch.run_batch`; the records go to
+``batch_results.jsonl`` and the solutions to ``solutions/``.
+``--telemetry`` appends the load / build / solve / extract times and the
+solver progress of the run to a JSON-lines file
+(:mod:`robust_bidding.telemetry`, compared with
+``python -m robust_bidding.telemetry``).
+"""
+import argparse
+import csv
+import os
+from contextlib import nullcontext
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="robust_bidding", description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", help="input workbook (robust model_data.xlsx)")
+    parser.add_argument("--out-dir", default=None, help="output directory (default: next to the workbook)")
+    parser.add_argument("--interval", type=float, default=None, help="uncertainty interval, e.g. 0.5 for ±50%%")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the .npz workbook cache")
+    parser.add_argument("--no-excel", action="store_true", help="skip writing robust model_result.xlsx")
+    parser.add_argument("--sparse", action="store_true", help="build through the vectorized sparse-matrix path")
+    parser.add_argument("--hourly-bids", choices=("pairwise", "chain", "hourly"), default=None,
+                        help="formulation of the hourly-constant bids, 식(4)~(6), (12)~(14), (39)~(41)")
+    parser.add_argument("--no-bounds", action="store_true", help="keep lb=0, ub=inf on every continuous variable")
+    parser.add_argument("--big-m", choices=("constant", "derived", "indicator"), default=None,
+                        help="big-M of the WPR commitment rows 식(33)~(35) (indicator: docplex builder only)")
+    parser.add_argument("--symmetry", choices=("none", "order"), default=None,
+                        help="ordering rows between BESS units with identical ratings")
+    parser.add_argument("--uncertainty", choices=("box", "budget", "affine"), default=None,
+                        help="uncertainty set of 식(61)~(63): the v003 box, a dualized budget Γ or affine "
+                             "real-time decision rules over the box")
+    parser.add_argument("--gamma", type=float, default=None, help="budget Γ (default: every deviation at its bound)")
+    parser.add_argument("--budget-scope", choices=("hour", "day"), default=None, help="Γ per hour or for the whole day")
+    parser.add_argument("--sweep-interval", type=float, nargs="+", default=None,
+                        help="solve every interval (and --sweep-gamma) in parallel; writes frontier.csv")
+    parser.add_argument("--sweep-gamma", type=float, nargs="+", default=None, help="budget Γ values of the sweep")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="sweep / batch processes (default: cores / --threads)")
+    parser.add_argument("--threads", type=int, default=1, help="solver threads per sweep / batch process")
+    parser.add_argument("--batch", action="store_true",
+                        help="the workbook argument is a JSON-lines manifest of instances to solve in a process pool; "
+                             "rerunning resumes from batch_results.jsonl")
+    parser.add_argument("--retries", type=int, default=1, help="extra attempts of a failed batch instance")
+    parser.add_argument("--backend", choices=("auto", "cplex", "highs", "cbc"), default=None,
+                        help="solve the sparse model with this backend instead of docplex "
+                             "(auto: CPLEX when licensed for the size, else HiGHS, else CBC)")
+    parser.add_argument("--warm-start", default=None, metavar="SOLUTION_JSON",
+                        help="MIP start from the D-Char / D-DChar / D-WPR values of a solution.json, "
+                             "or 'heuristic' for the day-ahead price rule")
+    parser.add_argument("--deadline", default=None,
+                        help="wall-clock deadline (ISO date-time, or +SECONDS from now): best bids found by then, "
+                             "with a heuristic fallback")
+    parser.add_argument("--telemetry", default=None, metavar="JSONL",
+                        help="append phase times and solver progress of this run to a JSON-lines file")
+    parser.add_argument("--start-effort", choices=("auto", "check", "fixed", "mip", "repair", "none"), default="auto",
+                        help="CPLEX MIP start effort level")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    out_dir = args.out_dir or os.path.dirname(os.path.abspath(args.workbook))
+
+    from .cache import load_market_data_cached
+    from .data import load_market_data
+    from .model import build_optimization_model
+    from .sparse import build_optimization_model_sparse
+    from .params import BiddingParameters
+    from . import results
+
+    if args.batch:   # 여러 인스턴스 병렬 풀이 - batch.run_batch
+        from .batch import batch_table, run_batch
+
+        log = lambda r: print("* %s attempt %d: %s %s" % (r.id, r.attempt, r.status, r.error or r.objective))
+        records = run_batch(args.workbook, os.path.join(out_dir, "batch_results.jsonl"), args.workers, args.threads,
+                            args.retries, args.backend or "auto", solution_dir=os.path.join(out_dir, "solutions"),
+                            progress=log, telemetry=args.telemetry)
+        print(batch_table(records))
+        return int(any(r.failed for r in records))
+
+    params = BiddingParameters()
+    if args.interval is not None:
+        params = params.replace(interval=args.interval)
+    if args.hourly_bids is not None:
+        params = params.replace(hourly_bids=args.hourly_bids)
+    if args.big_m is not None:
+        params = params.replace(big_m=args.big_m)
+    if args.symmetry is not None:
+        params = params.replace(symmetry=args.symmetry)
+    if args.uncertainty is not None:
+        params = params.replace(uncertainty=args.uncertainty)
+    if args.gamma is not None:
+        params = params.replace(gamma=args.gamma)
+    if args.budget_scope is not None:
+        params = params.replace(budget_scope=args.budget_scope)
+    if args.no_bounds:
+        params = params.replace(tighten_bounds=False)
+
+    telemetry = None   # 단계별 시간과 풀이 진행 기록 - 예외로 끝난 실행에는 end 가 없음
+    if args.telemetry is not None:
+        from .telemetry import Telemetry
+        telemetry = Telemetry(args.telemetry, meta={
+            "workbook": os.path.abspath(args.workbook), "backend": args.backend or ("sparse" if args.sparse else "docplex"),
+            "interval": params.interval, "uncertainty": params.uncertainty, "hourly_bids": params.hourly_bids})
+    phase = telemetry.phase if telemetry is not None else (lambda name: nullcontext())
+
+    def finish(code, status=None, objective=None):
+        if telemetry is not None:
+            telemetry.finish(status, objective)
+        return code
+
+    loader = load_market_data if args.no_cache else load_market_data_cached
+    with phase("load"):
+        data = loader(args.workbook, params.time_dim, params.min_dim)
+
+    if args.sweep_interval or args.sweep_gamma:   # 구간 폭 / Γ 스윕 - sweep.run_sweep
+        from .sweep import frontier_table, run_sweep
+
+        points = run_sweep(data, params, args.sweep_interval, args.sweep_gamma, args.workers, args.threads,
+                           backend=args.backend or "auto")
+        print(frontier_table(points))
+        with open(os.path.join(out_dir, "frontier.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["interval", "gamma", "objective", "day_ahead", "real_time", "price_of_robustness",
+                             "seconds", "status"])
+            for pt in points:
+                writer.writerow([pt.interval, pt.gamma, pt.objective, pt.day_ahead, pt.real_time,
+                                 pt.price_of_robustness, pt.seconds, pt.status])
+        return finish(0)
+
+    if params.tighten_bounds and params.uncertainty != "affine":
+        from .bounds import count_tightened, variable_bounds
+        print("* bounds tightened: %d lower, %d upper over %d continuous variables"
+              % count_tightened(variable_bounds(data, params), params))
+
+    warm_start = args.warm_start
+    if warm_start == "heuristic":   # 전일 가격 규칙 - warmstart.heuristic_start
+        from .warmstart import heuristic_start
+        warm_start = heuristic_start(data, params)
+
+    if args.backend is not None or args.deadline is not None:   # docplex 없이 SparseModel 을 직접 풀이 - solvers.solve
+        from .solvers import solve
+        from .sparse import build_sparse_model
+
+        with phase("build"):
+            sparse = build_sparse_model(data, params)
+        print("* %r" % sparse)
+        if args.deadline is not None:   # 마감 시각까지의 최선 입찰 - deadline.solve_by_deadline
+            from .deadline import solve_by_deadline
+
+            with phase("solve"):
+                result = solve_by_deadline(sparse, args.deadline, args.backend or "auto",
+                                           starts=[warm_start] if warm_start is not None else (),
+                                           checkpoint=os.path.join(out_dir, "solution.json"), telemetry=telemetry)
+            print("* accepted gap %g%s" % (result.stages[-1][0], ", fallback: %s" % result.fallback if result.fallback else ""))
+        else:
+            with phase("solve"):
+                result = solve(sparse, args.backend, start=warm_start, effort=args.start_effort, telemetry=telemetry)
+            if warm_start is not None:
+                print("* MIP start %s, first incumbent after %s s" % (result.start, result.first_incumbent))
+        print("* backend=%s status=%s (%s) %.2f s" % (result.backend, result.status, result.solver_status, result.seconds))
+        if not result.solved:
+            print("* model has no solution")
+            return finish(1, result.status)
+        print("* Total cost=%g" % result.objective)
+        print("* Gap = %s" % result.gap)
+        with phase("extract"):
+            results.sparse_solution_frame(sparse, result.x).to_excel(os.path.join(out_dir, "variable_result.xlsx"))
+            revenue = results.asset_revenue(result.arrays, data, params)   # 자원별 수익
+            results.revenue_frame(revenue).to_excel(os.path.join(out_dir, "asset_revenue.xlsx"))
+            results.export_result_json(result, sparse, os.path.join(out_dir, "solution.json"))
+        return finish(0, result.status, result.objective)
+
+    builder = build_optimization_model_sparse if args.sparse else build_optimization_model
+    with phase("build"):
+        mdl = builder(data, params)                # 최적화 모델 생성
+    mdl.print_information()                        # 모델로부터 나온 정보를 출력
+    if warm_start is not None:                     # 이전 해 / 휴리스틱 일정으로 MIP start
+        from .warmstart import add_mip_start
+        print("* MIP start: %d values" % add_mip_start(mdl, warm_start, args.start_effort))
+    if telemetry is not None:
+        from .telemetry import add_progress_listener
+        add_progress_listener(mdl, telemetry)
+    with phase("solve"):
+        s = mdl.solve(log_output=True)             # 모델 풀기
+
+    if not s:   # 해가 존재하지 않는 경우
+        print("* model has no solution")
+        return finish(1, str(mdl.solve_details.status))
+
+    print("* Total cost=%g" % mdl.objective_value)
+    print("*Gap tolerance = ", mdl.parameters.mip.tolerances.mipgap.get())
+
+    with phase("extract"):
+        frame = results.solution_frame(mdl, s)
+        frame.to_excel(os.path.join(out_dir, "variable_result.xlsx"))
+        revenue = results.asset_revenue(results.solution_arrays(mdl, s), data, params)   # 자원별 수익
+        results.revenue_frame(revenue).to_excel(os.path.join(out_dir, "asset_revenue.xlsx"))
+        if not args.no_excel:
+            try:
+                results.write_result_workbook(mdl, frame, os.path.join(out_dir, "robust model_result.xlsx"), revenue)
+            except ImportError:
+                print("* win32com not available - robust model_result.xlsx not written")
+        results.export_solution_json(mdl, os.path.join(out_dir, "solution.json"))
+    if telemetry is not None:
+        telemetry.progress(mdl.objective_value, mdl.solve_details.best_bound, mdl.solve_details.mip_relative_gap,
+                           mdl.solve_details.nb_nodes_processed, force=True)
+    return finish(0, str(mdl.solve_details.status), mdl.objective_value)
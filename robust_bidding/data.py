@@ -0,0 +1,222 @@
+"""Input data loading for the robust bidding model.
+
+The original scripts fetch every coefficient with ``Sheet.Cells(r, c).Value``
+while the model is being built, i.e. one cross-process Excel COM call per
+coefficient (often several per expression).  This module reads each sheet
+once into a NumPy array and the builder only indexes those arrays.
+
+Two readers are provided:
+
+* :func:`read_xlsx` - pure Python (``zipfile`` + ``xml.etree``), works on any
+  platform without Excel installed.
+* :func:`read_xlsx_com` - Excel COM, one bulk ``Range.Value`` call per sheet.
+  Only available on Windows with ``pywin32``.
+
+Both return the sheet as a dense float grid where ``grid[r-1, c-1]`` is the
+value of ``Cells(r, c)`` (empty / text cells are ``nan``).
+"""
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+### 엑셀 시트 이름
+SHEETS = (
+    "Price_DA",           # Day-ahead price (hourly, column B)
+    "Price_RS",           # Reserve prices (hourly, column B)
+    "Price_UR",           # Up regulation prices
+    "Price_DR",           # Down regulation prices
+    "Expected_P_UR",      # Expected deployed power in up regulation services
+    "Expected_P_DR",      # Expected deployed power in down regulation services
+    "Expected_P_RT_WPR",  # Expected wind power realization
+)
+HOURLY_SHEETS = ("Price_DA", "Price_RS")
+OPTIONAL_SHEETS = ("Ramp_rate_BESS",)   # only in the v001 workbooks (Cells(s,3))
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+class MarketData(object):
+    """Sheet arrays used by ``build_optimization_model``.
+
+    Interval sheets are shaped ``(time_dim, min_dim)`` and indexed with
+    ``[t-1, j-1]``.  The hourly sheets (``Price_DA``, ``Price_RS``) are
+    repeated along the intra-hour axis so they share the same shape.
+    ``Ramp_rate_BESS`` is a ``(BESS_dim,)`` vector or ``None`` when the
+    workbook has no such sheet.
+    """
+
+    def __init__(self, time_dim, min_dim, arrays):
+        self.time_dim = time_dim
+        self.min_dim = min_dim
+        self.arrays = dict(arrays)
+        for name in SHEETS:
+            if name not in self.arrays:
+                raise KeyError("missing sheet array %r" % name)
+        self.arrays.setdefault("Ramp_rate_BESS", None)
+
+    def __getattr__(self, name):
+        arrays = self.__dict__.get("arrays")
+        if arrays is not None and name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+    def hours(self, start, stop):
+        """Hours ``start:stop`` (0-based) as a new :class:`MarketData`."""
+        if not 0 <= start < stop <= self.time_dim:
+            raise ValueError("hours %d:%d outside 0:%d" % (start, stop, self.time_dim))
+        arrays = {name: (value[start:stop] if value is not None and np.ndim(value) == 2 else value)
+                  for name, value in self.arrays.items()}
+        return MarketData(stop - start, self.min_dim, arrays)
+
+    @classmethod
+    def concatenate(cls, days):
+        """Join consecutive :class:`MarketData` (e.g. one per day) along the hour axis."""
+        days = list(days)
+        if len({d.min_dim for d in days}) != 1:
+            raise ValueError("all days need the same min_dim")
+        arrays = {name: (np.concatenate([d.arrays[name] for d in days]) if value is not None and np.ndim(value) == 2 else value)
+                  for name, value in days[0].arrays.items()}
+        return cls(sum(d.time_dim for d in days), days[0].min_dim, arrays)
+
+    def __repr__(self):
+        return "MarketData(time_dim=%d, min_dim=%d, sheets=%s)" % (
+            self.time_dim, self.min_dim, sorted(k for k, v in self.arrays.items() if v is not None))
+
+
+### xlsx 직접 읽기 (Excel 불필요)
+def _column_index(letters):
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - 64)
+    return index
+
+
+def _sheet_targets(zf):
+    """Map sheet name -> worksheet part name inside the xlsx archive."""
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels.iter(_NS_PKG + "Relationship"):
+        target = rel.get("Target")
+        if target.startswith("/"):
+            target = target[1:]
+        elif not target.startswith("xl/"):
+            target = "xl/" + target
+        targets[rel.get("Id")] = target
+    return {sheet.get("name"): targets[sheet.get(_NS_REL + "id")]
+            for sheet in workbook.iter(_NS_MAIN + "sheet")}
+
+
+def _parse_sheet(xml_bytes):
+    cells = []
+    max_row = max_col = 0
+    for c in ET.fromstring(xml_bytes).iter(_NS_MAIN + "c"):
+        kind = c.get("t", "n")
+        v = c.find(_NS_MAIN + "v")
+        if v is None or kind not in ("n", "b"):
+            continue   # empty, shared/inline strings, errors
+        col, row = _CELL_REF.match(c.get("r")).groups()
+        row, col = int(row), _column_index(col)
+        cells.append((row, col, float(v.text)))
+        max_row, max_col = max(max_row, row), max(max_col, col)
+    grid = np.full((max_row, max_col), np.nan)
+    for row, col, value in cells:
+        grid[row - 1, col - 1] = value
+    return grid
+
+
+def read_xlsx(path, sheets=SHEETS, optional=()):
+    """Read ``sheets`` from an xlsx file into dense float grids (pure Python)."""
+    grids = {}
+    with zipfile.ZipFile(path) as zf:
+        targets = _sheet_targets(zf)
+        for name in tuple(sheets) + tuple(optional):
+            if name not in targets:
+                if name in optional:
+                    continue
+                raise KeyError("sheet %r not found in %s" % (name, path))
+            grids[name] = _parse_sheet(zf.read(targets[name]))
+    return grids
+
+
+### Excel COM 읽기 (Windows)
+def read_xlsx_com(path, sheets=SHEETS, optional=(), excel=None):
+    """Read ``sheets`` through Excel COM with one ``Range.Value`` call per sheet."""
+    import win32com.client as win32
+
+    own_excel = excel is None
+    if own_excel:
+        excel = win32.Dispatch("Excel.Application")
+    wb = excel.Workbooks.Open(os.path.abspath(path))
+    try:
+        names = [wb.Sheets(i).Name for i in range(1, wb.Sheets.Count + 1)]
+        grids = {}
+        for name in tuple(sheets) + tuple(optional):
+            if name not in names:
+                if name in optional:
+                    continue
+                raise KeyError("sheet %r not found in %s" % (name, path))
+            ws = wb.Sheets(name)
+            used = ws.UsedRange
+            n_rows = used.Row + used.Rows.Count - 1
+            n_cols = used.Column + used.Columns.Count - 1
+            values = ws.Range(ws.Cells(1, 1), ws.Cells(n_rows, n_cols)).Value
+            if not isinstance(values, tuple):
+                values = ((values,),)
+            grids[name] = np.array([[v if isinstance(v, (int, float)) else np.nan for v in row]
+                                    for row in values], dtype=float)
+    finally:
+        wb.Close(False)
+        if own_excel:
+            excel.Quit()
+    return grids
+
+
+READERS = {
+    "xlsx": read_xlsx,
+    "com": read_xlsx_com,
+}
+
+
+### 모델 입력 배열 생성
+def _block(grids, name, rows, cols):
+    grid = grids[name]
+    if grid.shape[0] < rows.stop or grid.shape[1] < cols.stop:
+        raise ValueError("sheet %r is %dx%d, need at least %dx%d"
+                         % (name, grid.shape[0], grid.shape[1], rows.stop, cols.stop))
+    return np.nan_to_num(grid[rows, cols])
+
+
+def market_data_from_grids(grids, time_dim=24, min_dim=12):
+    """Slice raw sheet grids into :class:`MarketData` arrays.
+
+    Interval sheets use ``Cells(t+1, j+1)`` and the hourly sheets use
+    ``Cells(t+1, 2)``, exactly as the original builder did.
+    """
+    rows = slice(1, time_dim + 1)
+    arrays = {}
+    for name in SHEETS:
+        if name in HOURLY_SHEETS:
+            hourly = _block(grids, name, rows, slice(1, 2))
+            arrays[name] = np.repeat(hourly, min_dim, axis=1)
+        else:
+            arrays[name] = _block(grids, name, rows, slice(1, min_dim + 1))
+    if "Ramp_rate_BESS" in grids:
+        column = grids["Ramp_rate_BESS"][:, 2]   # Cells(s,3)
+        arrays["Ramp_rate_BESS"] = column[~np.isnan(column)]
+    return MarketData(time_dim, min_dim, arrays)
+
+
+def load_market_data(path, time_dim=24, min_dim=12, reader="xlsx"):
+    """Load the model input workbook into :class:`MarketData`.
+
+    ``reader`` is ``"xlsx"`` (pure Python, default) or ``"com"`` (Excel).
+    """
+    grids = READERS[reader](path, SHEETS, OPTIONAL_SHEETS)
+    return market_data_from_grids(grids, time_dim, min_dim)
@@ -0,0 +1,184 @@
+"""Anytime solving against a wall-clock deadline (market gate closure).
+
+``mdl.parameters.mip.tolerances.mipgap`` is the only stopping rule of the
+scripts, so a hard day can run past gate closure with nothing to submit.
+:func:`solve_by_deadline` takes an absolute deadline and runs the MIP as one
+:func:`~robust_bidding.solvers.solve` call that ends ``reserve`` seconds
+before it:
+
+* every improving incumbent is published from the solver callback
+  (``checkpoint`` ``solution.json`` and ``on_incumbent``), so the best bids
+  are on disk whenever the process is stopped;
+* the gap accepted for stopping starts at ``params.mipgap`` and relaxes
+  along :data:`GAP_SCHEDULE` as the deadline nears (an equal share of the
+  time per gap); the search is aborted from the callback once the proven
+  gap is within the accepted one;
+* without any incumbent by then the binaries are fixed from the ``starts``
+  schedules or from the rounded LP relaxation, and one LP gives the bids.
+
+The result carries the best bids with the gap proven against the best bound.
+"""
+import copy
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+
+from .solvers import SolveResult, select_backend, solve
+from .warmstart import BINARIES, start_arrays, start_columns
+
+### 마감이 가까워질수록 허용하는 상대 갭 - params.mipgap 부터 느슨한 갭까지
+GAP_SCHEDULE = (0.05, 0.01, 0.001)
+
+MIN_SLICE = 0.2   # 이보다 짧게 남은 풀이는 건너뜀 (초)
+
+
+@dataclass
+class DeadlineResult:
+    """Best bids of :func:`solve_by_deadline`."""
+
+    status: str                  # solvers.STATUSES - "optimal" only once params.mipgap is reached
+    objective: float             # None without any bids
+    bound: float                 # best bound of the MIP, None if unknown
+    gap: float                   # relative gap proven for objective, None if unknown
+    seconds: float
+    backend: str = None
+    solver_status: str = None
+    fallback: str = None         # "start <k>" / "rounding" when the bids come from the fallback LP
+    x: np.ndarray = field(default=None, repr=False)
+    arrays: dict = field(default_factory=dict, repr=False)
+    stages: list = field(default_factory=list, repr=False)   # (accepted gap, seconds) from each relaxation
+
+    @property
+    def solved(self):
+        return self.x is not None
+
+
+def deadline_timestamp(deadline):
+    """``deadline`` (``datetime``, POSIX seconds, or ``"+<seconds>"`` from now) as POSIX seconds."""
+    if isinstance(deadline, datetime):
+        return deadline.timestamp()
+    if isinstance(deadline, str):
+        if deadline.startswith("+"):
+            return time.time() + float(deadline[1:])
+        return datetime.fromisoformat(deadline).timestamp()
+    return float(deadline)
+
+
+def relative_gap(objective, bound):
+    """``|bound - objective| / (1e-10 + |objective|)`` as reported by CPLEX."""
+    return abs(bound - objective) / (1e-10 + abs(objective))
+
+
+def _fixed(sparse, cols, values):
+    """``sparse`` with the columns ``cols`` fixed to ``values`` and no integrality left."""
+    fixed = copy.copy(sparse)
+    fixed.col_lo, fixed.col_hi = sparse.col_lo.copy(), sparse.col_hi.copy()
+    fixed.col_lo[cols] = fixed.col_hi[cols] = values
+    fixed.binary = np.zeros_like(sparse.binary)
+    return fixed
+
+
+def rounded_binaries(sparse, x):
+    """:data:`BINARIES` of an LP point: the larger of ``D-Char`` / ``D-DChar`` per interval, ``D-WPR`` when > 0."""
+    arrays = {name: x[sparse.blocks[name]] for name in BINARIES if name in sparse.blocks}
+    if "D-Char" in arrays and "D-DChar" in arrays:   # 식(42), 식(32): 정확히 하나를 1 로
+        charge = arrays["D-Char"] >= arrays["D-DChar"]
+        arrays["D-Char"], arrays["D-DChar"] = charge.astype(float), (~charge).astype(float)
+    if "D-WPR" in arrays:
+        arrays["D-WPR"] = (arrays["D-WPR"] > 1e-6).astype(float)
+    return arrays
+
+
+def _fallback(sparse, starts, backend, end, threads):
+    """First feasible LP over the binaries of ``starts``, then of the rounded relaxation; ``(label, SolveResult)``.
+
+    Every LP gets the time left until ``end``; none starts with less than :data:`MIN_SLICE`.
+    """
+    candidates = [("start %d" % (k + 1), start) for k, start in enumerate(starts)] + [("rounding", None)]
+    for label, start in candidates:
+        if end - time.time() < MIN_SLICE:
+            break
+        if start is None:   # LP 완화 해를 반올림
+            relaxed = solve(_fixed(sparse, [], []), backend, end - time.time(), threads=threads)
+            if not relaxed.solved:
+                continue
+            start = rounded_binaries(sparse, relaxed.x)
+        cols, values = start_columns(sparse, start_arrays(start))
+        cols, values = cols[sparse.binary[cols]], values[sparse.binary[cols]]
+        if not len(cols) or end - time.time() < MIN_SLICE:
+            continue
+        result = solve(_fixed(sparse, cols, values), backend, end - time.time(), threads=threads)
+        if result.solved:
+            return label, result
+    return None, None
+
+
+def solve_by_deadline(sparse, deadline, backend="auto", gaps=GAP_SCHEDULE, reserve=None, starts=(), threads=None,
+                      checkpoint=None, on_incumbent=None, telemetry=None):
+    """Best bids of ``sparse`` found before ``deadline`` (see :func:`deadline_timestamp`); returns a :class:`DeadlineResult`.
+
+    ``reserve`` (default 5 % of the time left, at least 1 s) is kept for the
+    fallback; each of its solves is limited to the time left until the
+    deadline and skipped below :data:`MIN_SLICE`.  ``starts`` are schedules for the MIP start and the fallback
+    (any source of :func:`~robust_bidding.warmstart.start_arrays`, e.g. the
+    previous day's result or :func:`~robust_bidding.warmstart.heuristic_start`).
+    ``checkpoint`` is a ``solution.json`` path rewritten for every new
+    incumbent; ``on_incumbent(result)`` is called as well.  ``telemetry``
+    goes to :func:`~robust_bidding.solvers.solve`.  CBC has no callbacks: its
+    bids are published once, at the end of the search.
+    """
+    from .results import export_result_json
+
+    begin = time.time()
+    end = deadline_timestamp(deadline)
+    if end <= begin:
+        raise ValueError("deadline is %.1f s in the past" % (begin - end))
+    reserve = max(1.0, 0.05 * (end - begin)) if reserve is None else reserve
+    backend = select_backend(sparse) if backend == "auto" else backend
+    schedule = sorted({max(g, sparse.params.mipgap) for g in gaps} | {sparse.params.mipgap})
+    budget = end - reserve - begin
+    starts = list(starts)
+    out = DeadlineResult("unknown", None, None, None, 0.0, stages=[(schedule[0], 0.0)])
+
+    def publish(result, fallback=None):
+        out.status, out.objective, out.x, out.arrays, out.fallback = (
+            "feasible", result.objective, result.x, result.arrays, fallback)
+        out.backend, out.solver_status = result.backend, result.solver_status
+        if checkpoint is not None:   # 임시 파일에 쓴 뒤 교체
+            export_result_json(result, sparse, checkpoint + ".tmp")
+            os.replace(checkpoint + ".tmp", checkpoint)
+        if on_incumbent is not None:
+            on_incumbent(out)
+
+    def incumbent(objective, x):   # 솔버 콜백 - 개선된 해마다 바로 게시
+        if not out.solved or objective > out.objective:
+            publish(SolveResult(backend, "feasible", "incumbent", objective, None, None, time.time() - begin, x=x,
+                                arrays={name: x[index] for name, index in sparse.blocks.items()}))
+
+    def stop(objective, bound):   # 경과 시간에 따라 허용 갭 완화, 증명한 갭이 그 안이면 중단
+        level = min(int(len(schedule) * (time.time() - begin) / budget), len(schedule) - 1)
+        if schedule[level] != out.stages[-1][0]:
+            out.stages.append((schedule[level], time.time() - begin))
+        return level > 0 and objective is not None and relative_gap(objective, bound) <= schedule[level]
+
+    if budget >= MIN_SLICE:
+        result = solve(sparse, backend, budget - (time.time() - begin), threads=threads,
+                       start=starts[0] if starts else None, telemetry=telemetry, on_incumbent=incumbent, stop=stop)
+        if result.solved:   # 최종 해 (헤더에 bound / gap 포함)
+            publish(result)
+            if result.bound is not None:
+                out.bound, out.gap = result.bound, relative_gap(result.objective, result.bound)
+        if result.status in ("optimal", "infeasible", "unbounded"):
+            out.status = result.status
+        elif out.gap is not None and out.gap <= sparse.params.mipgap:   # 중단 직전에 목표 갭 도달
+            out.status = "optimal"
+
+    if not out.solved and out.status not in ("infeasible", "unbounded"):
+        label, result = _fallback(sparse, starts, backend, end, threads)
+        if result is not None:
+            publish(result, label)
+    out.seconds = time.time() - begin
+    return out
@@ -0,0 +1,70 @@
+"""Shared hourly sums of the docplex builder.
+
+The objective 식(1), 식(65) (``AV-RO``), ``AV-RO-DA``, 식(2) (``B-t``),
+식(3) (``C-t``), 식(7)~(11) and the per-asset income rows all contain the same
+sums ``Σ_j Σ_k X[t, j, k]`` - day-ahead net energy, reserve, deployed up/down
+regulation and marginal cost - only weighted by different prices.
+:class:`HourlyExpressions` builds each of them once per (family, hour[,
+interval], asset subset) and hands the same docplex expression to every
+formula; the formulas scale it by their price, which copies it, so the cached
+expression itself is never modified.
+"""
+
+
+class HourlyExpressions(object):
+    """Memoized sums of linear families over intervals and assets.
+
+    A family is ``Σ coef * X[(t, j, k)]`` over the assets ``k`` of one or more
+    asset kinds, e.g.::
+
+        h = HourlyExpressions(mdl, min_dim, BESS=BESS_dim, WPR=WPR_dim)
+        h.define("DA", BESS=[(1, P_DA_DCH), (-1, P_DA_CH)], WPR=[(1, P_DA_WPR)])
+        h.hourly("DA", t)                  # Σ_j over every BESS and WPR
+        h.hourly("DA", t, ("BESS", s))     # Σ_j for BESS s only
+        h.interval("DA", t, j)             # interval j of hour t, every asset
+
+    Fleet-wide hourly sums are the sum of the cached per-asset hourly sums.
+    ``built`` / ``reused`` count cache misses and hits.
+    """
+
+    def __init__(self, mdl, min_dim, **assets):
+        self.mdl = mdl
+        self.min_dim = min_dim
+        self.assets = assets            # kind -> number of assets (1-based k)
+        self._families = {}             # name -> {kind: [(coef, X), ...]}
+        self._cache = {}
+        self.built = self.reused = 0
+
+    def define(self, name, **terms):
+        """Register family ``name``; ``terms`` maps an asset kind to ``(coef, X)`` pairs."""
+        unknown = set(terms) - set(self.assets)
+        if unknown:
+            raise ValueError("unknown asset kind(s) %s for %r" % (", ".join(sorted(unknown)), name))
+        self._families[name] = terms
+
+    def hourly(self, name, t, asset=None):
+        """``Σ_j`` of family ``name`` in hour ``t`` for ``asset = (kind, k)`` or every asset."""
+        return self._get(name, t, None, asset)
+
+    def interval(self, name, t, j, asset=None):
+        """Family ``name`` in interval ``(t, j)`` for ``asset = (kind, k)`` or every asset."""
+        return self._get(name, t, j, asset)
+
+    def _get(self, name, t, j, asset):
+        key = (name, t, j, asset)
+        if key in self._cache:
+            self.reused += 1
+            return self._cache[key]
+        self.built += 1
+        terms, mdl = self._families[name], self.mdl
+        intervals = range(1, self.min_dim + 1) if j is None else (j,)
+        if asset is not None:
+            kind, k = asset
+            expr = mdl.sum(coef * X[(t, i, k)] for i in intervals for coef, X in terms.get(kind, ()))
+        elif j is None:   # 자원별 시간 합을 재사용
+            expr = mdl.sum(self._get(name, t, None, (kind, k)) for kind in terms for k in range(1, self.assets[kind] + 1))
+        else:
+            expr = mdl.sum(coef * X[(t, j, k)] for kind, pairs in terms.items()
+                           for k in range(1, self.assets[kind] + 1) for coef, X in pairs)
+        self._cache[key] = expr
+        return expr
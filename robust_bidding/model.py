@@ -0,0 +1,556 @@
+"""docplex formulation of the robust bidding model (v003).
+
+Ported from ``v002/Code_v003.py``; coefficients come from
+:class:`~robust_bidding.data.MarketData` arrays and scalar settings from
+:class:`~robust_bidding.params.BiddingParameters`.  docplex is imported on
+first build so that importing this module does no I/O and needs no solver.
+"""
+from math import inf
+
+import numpy as np
+
+from .bounds import variable_bounds, wpr_big_m
+from .expressions import HourlyExpressions
+from .params import BIG_M_MODES, HOURLY_BID_MODES, TERMINAL_SOC_MODES, BiddingParameters
+from .symmetry import ordered_pairs
+from .uncertainty import (budget_groups, budget_weights, check_uncertainty, deviation_arrays, realization_band,
+                          relative_deviation, reserve_cover)
+
+
+def _per_interval(hourly, domain):
+    """Expose a ``(t, s)`` variable dict under the ``(t, j, s)`` keys of ``domain``."""
+    return {(t, j, k): hourly[(t, k)] for (t, j, k) in domain}
+
+
+def _add_hourly_equalities(mdl, X, time_dim, min_dim, n_dim, mode):
+    """X[(t,j,k)] is constant within hour t - 식(4)~(6), (12)~(14), (39)~(41).
+
+    ``pairwise`` writes every (j, J) pair as in the paper, ``chain`` only
+    j-1 -> j.  In ``hourly`` mode the variables are per (t, k) and nothing is
+    added.
+    """
+    if mode == "pairwise":
+        mdl.add_constraints(X[(t,j,k)] == X[(t,J,k)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for J in range(1,min_dim+1) for k in range(1,n_dim+1))
+    elif mode == "chain":
+        mdl.add_constraints(X[(t,j,k)] == X[(t,j-1,k)] for t in range(1,time_dim+1) for j in range(2,min_dim+1) for k in range(1,n_dim+1))
+
+
+def _var_bounds(bounds, name, keys):
+    """``lb``/``ub`` keywords of ``continuous_var_dict`` for family ``name`` over ``keys``.
+
+    ``bounds`` is the output of :func:`~robust_bidding.bounds.variable_bounds`
+    (``(0, inf)`` for families it does not list); hourly ``(t, k)`` keys read
+    the ``j = 1`` entry.
+    """
+    if name not in bounds:
+        return {"lb": 0, "ub": inf}
+    lb, ub = bounds[name]
+    index = np.array([(k,) if isinstance(k, int) else k for k in keys]) - 1
+    if index.shape[1] < lb.ndim:   # hourly 입찰 변수 (t, k) -> (t, 1, k)
+        index = np.insert(index, 1, 0, axis=1)
+    index = tuple(index.T)
+    return {"lb": lb[index].tolist(), "ub": ub[index].tolist()}
+
+
+### 최적화 파트
+def build_optimization_model(data, params=None, name='Robust_Optimization_Model'):
+    """Build the robust bidding MILP (v003 formulation) as a docplex ``Model``.
+
+    ``data`` is a :class:`~robust_bidding.data.MarketData`; ``params`` defaults
+    to :class:`~robust_bidding.params.BiddingParameters` ().  With
+    ``uncertainty="affine"`` the model comes from
+    :func:`~robust_bidding.affine.build_affine_model` through ``to_docplex``.
+    """
+    if params is not None and params.uncertainty == "affine":
+        from .affine import build_affine_model
+        from .sparse import to_docplex
+        return to_docplex(build_affine_model(data, params), name)
+    return _build_model(data, params, name)[0]
+
+
+def _build_model(data, params, name):
+    """``build_optimization_model`` plus the handles that
+    :class:`~robust_bidding.template.BiddingModelTemplate` rewrites.
+
+    Returns ``(mdl, parts)`` where ``parts`` holds ``price_terms`` (the
+    price-dependent expressions as a function of the four price arrays),
+    ``price_rows`` (their constraints, one per hour, expression on the right),
+    ``income_rows`` (per-asset income ``>= 0``, expression on the left),
+    ``bound_rows`` (the lower/upper rows of 식(61)~(63), in (t, j[, w]) order)
+    and, with ``big_m="derived"``, ``big_m_rows`` (식(33)~(35) as a function
+    of the big-M array) with their constraints in ``commitment_rows``.
+    ``soc_rows`` gives the initial-energy rows 식(17)+(19) / 식(19) for a
+    per-unit initial energy, posted as ``soc_constraints`` (start, end);
+    ``symmetry_rows`` maps each ordered pair of identical units to its row.
+    ``reserve_rows`` gives 식(15)/(16) for a reserve cover (posted as
+    ``reserve_constraints``); with ``uncertainty="budget"`` ``price_terms``
+    takes the weights and ``ρ`` of :mod:`~robust_bidding.uncertainty` and also
+    returns the dual rows ``RO-UR`` / ``RO-UR-`` / ``RO-DR`` / ``RO-DR-``.
+    ``expressions`` is the :class:`~robust_bidding.expressions.HourlyExpressions`
+    cache that ``price_terms`` draws its hourly sums from.
+    """
+    from docplex.mp.model import Model
+
+    p = params if params is not None else BiddingParameters()
+    time_dim, min_dim, BESS_dim, WPR_dim = p.time_dim, p.min_dim, p.BESS_dim, p.WPR_dim
+    del_S = p.del_S
+    Marginal_cost_CH, Marginal_cost_DCH, Marginal_cost_WPR = p.Marginal_cost_CH, p.Marginal_cost_DCH, p.Marginal_cost_WPR
+    Ramp_rate_WPR, Ramp_rate_BESS = p.Ramp_rate_WPR, p.Ramp_rate_BESS
+    Initial_BESS, E_min_BESS, E_max_BESS = p.initial_energy, p.E_min_BESS, p.E_max_BESS
+    P_max_BESS, P_min_BESS = p.P_max_BESS, p.P_min_BESS
+    hourly_bids = p.hourly_bids
+    big_m = p.big_m
+    if hourly_bids not in HOURLY_BID_MODES:
+        raise ValueError("hourly_bids must be one of %s, got %r" % (", ".join(HOURLY_BID_MODES), hourly_bids))
+    if big_m not in BIG_M_MODES:
+        raise ValueError("big_m must be one of %s, got %r" % (", ".join(BIG_M_MODES), big_m))
+    if p.terminal_soc not in TERMINAL_SOC_MODES:
+        raise ValueError("terminal_soc must be one of %s, got %r" % (", ".join(TERMINAL_SOC_MODES), p.terminal_soc))
+    check_uncertainty(p)
+    if p.uncertainty == "affine":
+        raise ValueError("uncertainty='affine' is built by affine.build_affine_model (build_optimization_model)")
+    budget = p.uncertainty == "budget"
+
+    Price_DA, Price_RS = data.Price_DA, data.Price_RS
+    Price_UR, Price_DR = data.Price_UR, data.Price_DR
+    Expected_P_UR, Expected_P_DR, Expected_P_RT_WPR = data.Expected_P_UR, data.Expected_P_DR, data.Expected_P_RT_WPR
+    expected = {"P-UR": Expected_P_UR, "P-DR": Expected_P_DR, "P-RT-WPR": Expected_P_RT_WPR}
+    deviation = deviation_arrays(data, p) if budget else None   # 식(61)~(63) 편차 Δ - uncertainty.deviation_arrays
+
+    bounds = variable_bounds(data, p) if p.tighten_bounds else {}   # 변수 상/하한 - bounds.variable_bounds
+
+    mdl = Model(name=name)   # Model - Cplex에 입력할 Model 이름 입력 및 Model 생성
+    mdl.parameters.mip.tolerances.mipgap = p.mipgap   # 최적화 계산 오차 설정
+
+    time = [t for t in range(1,time_dim+1)]    # (t)의 one dimension
+    time_min = [(t,j) for t in range(1,time_dim + 1) for j in range(1,min_dim+1)]   # (t,j)의 two dimension
+    time_n_BESS = [(t,j,s) for t in range(1,time_dim + 1) for j in range(1,min_dim+1) for s in range(1,BESS_dim+1)]   # (t,j,s)의 three dimension
+    time_n_WPR = [(t,j,w) for t in range(1,time_dim + 1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1)]     # (t,j,w)의 three dimension
+    if hourly_bids == "hourly":   # 시간 단위 입찰 변수 (t,s) / (t,w)
+        bid_BESS = [(t,s) for t in range(1,time_dim + 1) for s in range(1,BESS_dim+1)]
+        bid_WPR = [(t,w) for t in range(1,time_dim + 1) for w in range(1,WPR_dim+1)]
+    else:
+        bid_BESS, bid_WPR = time_n_BESS, time_n_WPR
+
+    ### Continous Variable 지정 (연속 변수, 실수 변수)
+    # Day-ahead
+    P_DA_S = mdl.continuous_var_dict(time, **_var_bounds(bounds, "P-DA-S", time), name="P-DA-S")   # Selling bids in the day-ahead market
+    P_DA_B = mdl.continuous_var_dict(time, **_var_bounds(bounds, "P-DA-B", time), name="P-DA-B")   # Buying bids in the day-ahead market
+    P_RS = mdl.continuous_var_dict(time, **_var_bounds(bounds, "P-RS", time), name="P-RS")       # Reserve bid
+
+    P_UR = mdl.continuous_var_dict(time_min, **_var_bounds(bounds, "P-UR", time_min), name="P-UR")   # Deployed power in the up-regulation services
+    P_DR = mdl.continuous_var_dict(time_min, **_var_bounds(bounds, "P-DR", time_min), name="P-DR")   # Deployed power in the down-regulation services
+
+    P_DA_CH = mdl.continuous_var_dict(bid_BESS, **_var_bounds(bounds, "P-DA-CH", bid_BESS), name="P-DA-CH")     # Day-ahead scheduling of BES in charging modes
+    P_DA_DCH = mdl.continuous_var_dict(bid_BESS, **_var_bounds(bounds, "P-DA-DCH", bid_BESS), name="P-DA-DCH")   # Day-ahead scheduling of BES in discharging modes
+    P_DA_WPR = mdl.continuous_var_dict(bid_WPR, **_var_bounds(bounds, "P-DA-WPR", bid_WPR), name="P-DA-WPR")    # Day-ahead scheduling of WPR
+
+    P_UR_DCH = mdl.continuous_var_dict(time_n_BESS, **_var_bounds(bounds, "P-UR-DCH", time_n_BESS), name="P-UR-DCH")   # Deployed up regulation power of BES in discharging mode
+    P_UR_WPR = mdl.continuous_var_dict(time_n_WPR, **_var_bounds(bounds, "P-UR-WPR", time_n_WPR), name="P-UR-WPR")    # Deployed up regulation power of WPR
+
+    P_DR_CH = mdl.continuous_var_dict(time_n_BESS, **_var_bounds(bounds, "P-DR-CH", time_n_BESS), name="P-DR-CH")      # Deployed down regulation power of BES in charging mode
+    P_DR_WPR = mdl.continuous_var_dict(time_n_WPR, **_var_bounds(bounds, "P-DR-WPR", time_n_WPR), name="P-DR-WPR")     # Deployed down regulation power of WPR
+
+    P_RS_CH = mdl.continuous_var_dict(bid_BESS, **_var_bounds(bounds, "P-RS-CH", bid_BESS), name="P-RS-CH")      # Reserve scheduling of BES in charging modes
+    P_RS_DCH = mdl.continuous_var_dict(bid_BESS, **_var_bounds(bounds, "P-RS-DCH", bid_BESS), name="P-RS-DCH")    # Reserve scheduling of BES in discharging modes
+    P_RS_WPR = mdl.continuous_var_dict(bid_WPR, **_var_bounds(bounds, "P-RS-WPR", bid_WPR), name="P-RS-WPR")     # Reserve scheduling of WPR
+
+    # Real-time
+    P_SP_WPR = mdl.continuous_var_dict(time_n_WPR, **_var_bounds(bounds, "P-SP-WPR", time_n_WPR), name="P-SP-WPR")            # Spilled power of WPR (difference between the realization of wind power and the scheduled power of WPR)
+    E_BESS_DA = mdl.continuous_var_dict(time_n_BESS, **_var_bounds(bounds, "E-BESS-DA", time_n_BESS), name="E-BESS-DA")        # Energy level of BES in Day-ahead
+    E_BESS_RT = mdl.continuous_var_dict(time_n_BESS, **_var_bounds(bounds, "E-BESS-RT", time_n_BESS), name="E-BESS-RT")        # Energy level of BES in Real-time
+    P_RT_WPR = mdl.continuous_var_dict(time_n_WPR, **_var_bounds(bounds, "P-RT-WPR", time_n_WPR), name="P-RT-WPR")                # Realization of wind power in real-time
+
+    AV_WPR = mdl.continuous_var_dict(time_n_WPR, **_var_bounds(bounds, "AV-WPR", time_n_WPR), name="AV-WPR")                    # Auxiliary variables for linearization
+
+    ### Functions
+    AV_RO = mdl.continuous_var_dict(time, **_var_bounds(bounds, "AV-RO", time), name="AV-RO")      # Auxiliary variable of RO / Income in real-time
+
+    AV_RO_DA = mdl.continuous_var_dict(time, **_var_bounds(bounds, "AV-RO-DA", time), name="AV-RO-DA")      # Income in day-ahead
+    B_t = mdl.continuous_var_dict(time, **_var_bounds(bounds, "B-t", time), name="B-t")                # Income function of owner
+    C_t = mdl.continuous_var_dict(time, **_var_bounds(bounds, "C-t", time), name="C-t")                # Cost function of owner
+
+    if budget:   # 식(64) 내부 최소화 문제의 쌍대 변수 - uncertainty.py
+        groups = budget_groups(p)
+        RO_Z = mdl.continuous_var_dict(range(1,int(groups.max())+1), name="RO-Z")          # Dual of the budget Γ (per hour or per day)
+        RO_Q_UR = mdl.continuous_var_dict(time_min, name="RO-Q-UR")               # Dual of |ζ_UR[t,j]| <= 1
+        RO_Q_DR = mdl.continuous_var_dict(time_min, name="RO-Q-DR")               # Dual of |ζ_DR[t,j]| <= 1
+
+    ### Binary Variable 지정 (이진 변수)
+    D_Char = mdl.binary_var_dict(bid_BESS, name="D-Char")      # Charging binary variables of BES (알파)
+    D_Dchar = mdl.binary_var_dict(bid_BESS, name="D-DChar")    # Discharging binary variables of BES (베타)
+    D_WPR = mdl.binary_var_dict(bid_WPR, name="D-WPR")         # Commitment status binary variable of WPR
+
+    if hourly_bids == "hourly":   # 이하 수식은 (t,j,s) 인덱스 그대로 사용
+        P_DA_CH, P_DA_DCH, P_RS_CH, P_RS_DCH, D_Char, D_Dchar = (_per_interval(X, time_n_BESS) for X in (P_DA_CH, P_DA_DCH, P_RS_CH, P_RS_DCH, D_Char, D_Dchar))
+        P_DA_WPR, P_RS_WPR, D_WPR = (_per_interval(X, time_n_WPR) for X in (P_DA_WPR, P_RS_WPR, D_WPR))
+
+    ### 시간별 합 (전일 순전력, 예비력, 상/하향 조정, 한계비용) - 아래 수식들이 공유 (expressions.HourlyExpressions)
+    h = HourlyExpressions(mdl, min_dim, BESS=BESS_dim, WPR=WPR_dim)
+    h.define("DA", BESS=[(1, P_DA_DCH), (-1, P_DA_CH)], WPR=[(1, P_DA_WPR)])        # 전일 순전력
+    h.define("DA-S", BESS=[(1, P_DA_DCH)], WPR=[(1, P_DA_WPR)])                      # 식(7)
+    h.define("DA-B", BESS=[(1, P_DA_CH)])                                            # 식(8)
+    h.define("RS", BESS=[(1, P_RS_CH), (1, P_RS_DCH)], WPR=[(1, P_RS_WPR)])           # 식(9)
+    h.define("UR", BESS=[(1, P_UR_DCH)], WPR=[(1, P_UR_WPR)])                        # 식(10)
+    h.define("DR", BESS=[(1, P_DR_CH)], WPR=[(1, P_DR_WPR)])                         # 식(11)
+    h.define("DA-cost", BESS=[(Marginal_cost_DCH * del_S, P_DA_DCH), (Marginal_cost_CH * del_S, P_DA_CH)],
+             WPR=[(Marginal_cost_WPR * del_S, P_DA_WPR)])
+    h.define("RT-cost", BESS=[(Marginal_cost_DCH * del_S, P_UR_DCH), (Marginal_cost_CH * del_S, P_DR_CH)],
+             WPR=[(Marginal_cost_WPR * del_S, P_UR_WPR)])
+    if budget:   # 구간별 실시간 한계비용 (상향 / 하향)
+        h.define("UR-cost", BESS=[(Marginal_cost_DCH * del_S, P_UR_DCH)], WPR=[(Marginal_cost_WPR * del_S, P_UR_WPR)])
+        h.define("DR-cost", BESS=[(Marginal_cost_CH * del_S, P_DR_CH)])
+
+    ### 가격에 따라 바뀌는 수식 - 목적함수, 식(65), 식(2), 전일 수익 (BiddingModelTemplate.update 에서 재사용)
+    def price_terms(Price_DA, Price_RS, Price_UR, Price_DR, budget_terms=None):
+        """Objective and the per-hour right-hand sides that depend on the prices.
+
+        ``budget_terms = ((w, Γ), ρ)`` with ``uncertainty="budget"``
+        (:func:`~robust_bidding.uncertainty.budget_weights`).
+        """
+        terms = {}
+        day_ahead = lambda t, asset=None: (Price_DA[t-1,0] * del_S * h.hourly("DA", t, asset) + Price_RS[t-1,0] * del_S * h.hourly("RS", t, asset)
+                                           - h.hourly("DA-cost", t, asset))   # 전일 수익
+        regulation = lambda t, j, asset=None: (Price_UR[t-1,j-1] * del_S * h.interval("UR", t, j, asset)
+                                               + Price_DR[t-1,j-1] * del_S * h.interval("DR", t, j, asset))
+        regulation_hour = [mdl.sum(regulation(t, j) for j in range(1,min_dim+1)) for t in range(1,time_dim+1)]   # 식(65), 식(2) 공통
+        ### 식(65) 우변
+        terms["AV-RO"] = [regulation_hour[t-1] - h.hourly("RT-cost", t) for t in range(1,time_dim+1)]
+        if budget_terms is not None:   ### 식(64) 최악 편차의 쌍대 - 보호항 w[t] * RO_Z + Σ_j RO_Q, 구간 수익 변화 ±ρ * margin
+            (w, _), rho = budget_terms
+            terms["AV-RO"] = [terms["AV-RO"][t-1] - float(w[t-1]) * RO_Z[int(groups[t-1])] - mdl.sum(RO_Q_UR[(t,j)] + RO_Q_DR[(t,j)] for j in range(1,min_dim+1))
+                              for t in range(1,time_dim+1)]
+            for name, price in (("UR", Price_UR), ("DR", Price_DR)):
+                margin = [float(rho["P-" + name][t-1,j-1]) * (price[t-1,j-1] * del_S * h.interval(name, t, j) - h.interval(name + "-cost", t, j))
+                          for t in range(1,time_dim+1) for j in range(1,min_dim+1)]
+                terms["RO-" + name], terms["RO-%s-" % name] = margin, [-1 * m for m in margin]
+        ### data for excel - 전일 수익, 식(2)
+        terms["AV-RO-DA"] = [day_ahead(t) for t in range(1,time_dim+1)]
+        terms["B-t"] = [terms["AV-RO-DA"][t-1] + h.hourly("DA-cost", t) + regulation_hour[t-1] for t in range(1,time_dim+1)]
+        ### Objective function - 식(1) / 식(65)
+        terms["objective"] = mdl.sum(terms["AV-RO-DA"][t-1] + AV_RO[t] for t in range(1,time_dim+1))
+        if budget_terms is not None and budget_terms[0][1]:   # budget_scope="day" - Γ * RO_Z
+            terms["objective"] = terms["objective"] - budget_terms[0][1] * RO_Z[1]
+        ### 자원별 수익 (t, s) / (t, w) 순서 - 식(65) / 전일 수익을 자원별로 나눈 것
+        if p.nonnegative_asset_income:
+            real_time = lambda t, asset: mdl.sum(regulation(t, j, asset) for j in range(1,min_dim+1)) - h.hourly("RT-cost", t, asset)
+            terms["BESS-DA"] = [day_ahead(t, ("BESS", s)) for t in range(1,time_dim+1) for s in range(1,BESS_dim+1)]
+            terms["WPR-DA"] = [day_ahead(t, ("WPR", w)) for t in range(1,time_dim+1) for w in range(1,WPR_dim+1)]
+            terms["BESS-RT"] = [real_time(t, ("BESS", s)) for t in range(1,time_dim+1) for s in range(1,BESS_dim+1)]
+            terms["WPR-RT"] = [real_time(t, ("WPR", w)) for t in range(1,time_dim+1) for w in range(1,WPR_dim+1)]
+        return terms
+
+    ### 식(33)~(35) big-M 행 - derived M 은 예측 풍력에 따라 바뀜 (BiddingModelTemplate.update 에서 재사용)
+    def big_m_rows(M_WPR):
+        """식(33)~(35) as constraints not yet added, one list per row family, (t, j, w) order."""
+        tjw = [(t,j,w) for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1)]
+        M = {(t,j,w): M_WPR[t-1,j-1,w-1] for (t,j,w) in tjw}
+        return [
+            [P_DA_WPR[k] <= P_RT_WPR[k] + (1 - D_WPR[k]) * M[k] for k in tjw],   # 식(33)
+            [P_DA_WPR[k] <= M[k] * D_WPR[k] for k in tjw],   # 식(33)
+            [-1 * M[k] * D_WPR[k] <= P_DA_WPR[k] for k in tjw],   # 식(33)
+            [P_RS_WPR[k] <= P_RT_WPR[k] - P_DA_WPR[k] + (1 - D_WPR[k]) * M[k] for k in tjw],   # 식(34)
+            [P_RS_WPR[k] <= M[k] * D_WPR[k] for k in tjw],   # 식(34)
+            [-1 * M[k] * D_WPR[k] <= P_RS_WPR[k] for k in tjw],   # 식(34)
+            [P_DA_WPR[k] + P_RS_WPR[k] <= P_RT_WPR[k] + (1 - D_WPR[k]) * M[k] for k in tjw],   # 식(35)
+            [P_DA_WPR[k] + P_RS_WPR[k] <= M[k] * D_WPR[k] for k in tjw],   # 식(35)
+            [P_DA_WPR[k] + P_RS_WPR[k] >= (-1) * M[k] * D_WPR[k] for k in tjw],   # 식(35)
+        ]
+
+    ### 식(17)+(19), 식(19) - 초기 저장 에너지 (BiddingModelTemplate.set_initial_energy 에서 재사용)
+    def soc_rows(initial):
+        """First-interval rows 식(17)+(19) and end rows 식(19) for ``initial`` (per unit), not yet added."""
+        start = [E_BESS_DA[(t,j,s)] == initial[s-1] + del_S * (P_DA_CH[(t,j,s)] - P_DA_DCH[(t,j,s)])
+                 for t in range(1, 2) for j in range(1, 2) for s in range(1,BESS_dim+1)]
+        end = [E_BESS_DA[(t,j,s)] == initial[s-1]
+               for t in range(time_dim, time_dim+1) for j in range(min_dim, min_dim+1) for s in range(1,BESS_dim+1)] if p.terminal_soc == "initial" else []
+        return start, end
+
+    ### 식(15)~(16) - budget 모드는 편차만큼 예비력 여유 (BiddingModelTemplate.set_budget 에서 재사용)
+    def reserve_rows(cover=None):
+        """식(15)/(16) with ``(1 + cover[name][t-1, j-1]) * P_UR`` / ``P_DR`` below ``P_RS``, not yet added."""
+        dep = lambda X, name, t, j: X[(t,j)] if cover is None else float(1 + cover[name][t-1,j-1]) * X[(t,j)]
+        return [[dep(P_UR, "P-UR", t, j) <= P_RS[t] for t in range(1,time_dim+1) for j in range(1,min_dim+1)],   # 식(15)
+                [dep(P_DR, "P-DR", t, j) <= P_RS[t] for t in range(1,time_dim+1) for j in range(1,min_dim+1)]]   # 식(16)
+
+    budget_terms = (budget_weights(p), relative_deviation(expected, deviation)) if budget else None
+    terms = price_terms(Price_DA, Price_RS, Price_UR, Price_DR, budget_terms)
+    price_rows = {}
+    commitment_rows = []
+
+    ### Objective function - 식(1) / 식(65)
+    mdl.maximize(terms["objective"])
+
+    ### Robust Optizimation을 위한 변수 (BESS + WPR) - 식(65)
+    price_rows["AV-RO"] = mdl.add_constraints(AV_RO[t] <= terms["AV-RO"][t-1] for t in range(1,time_dim+1))
+
+    ### Equality constraints - 식(4) ~ 식(6) + 식(12) ~ 식(14)
+    # Day-ahead bids 식(4)~식(6)
+    _add_hourly_equalities(mdl, P_DA_DCH, time_dim, min_dim, BESS_dim, hourly_bids)   # 식(4)
+
+    _add_hourly_equalities(mdl, P_DA_CH, time_dim, min_dim, BESS_dim, hourly_bids)   # 식(5)
+
+    _add_hourly_equalities(mdl, P_DA_WPR, time_dim, min_dim, WPR_dim, hourly_bids)   # 식(6)
+
+    # Reserve bids 식(12)~식(14)
+    _add_hourly_equalities(mdl, P_RS_CH, time_dim, min_dim, BESS_dim, hourly_bids)   # 식(12)
+
+    _add_hourly_equalities(mdl, P_RS_DCH, time_dim, min_dim, BESS_dim, hourly_bids)   # 식(13)
+
+    _add_hourly_equalities(mdl, P_RS_WPR, time_dim, min_dim, WPR_dim, hourly_bids)   # 식(14)
+
+    ### Constraints of day-ahead energy / reserve bids / real-time deployed power in the up and down regulation services - 식(7) ~ 식(11),
+
+    # 식(7)-(9)는 논문이 틀림
+    mdl.add_constraints(P_DA_S[t] == del_S * h.hourly("DA-S", t) for t in range(1,time_dim+1))  # 식(7)
+
+    mdl.add_constraints(P_DA_B[t] == del_S * h.hourly("DA-B", t) for t in range(1,time_dim+1))  # 식(8)
+
+    mdl.add_constraints(P_RS[t] == del_S * h.hourly("RS", t) for t in range(1,time_dim+1))  # 식(9)
+
+    #식(10)-(11) 변형
+    mdl.add_constraints(P_UR[(t,j)] == h.interval("UR", t, j) for j in range(1,min_dim+1) for t in range(1,time_dim+1))
+    mdl.add_constraints(P_DR[(t,j)] == h.interval("DR", t, j) for j in range(1,min_dim+1) for t in range(1,time_dim+1))
+
+    ### 식(15) ~ 식(16)
+    reserve_constraints = [mdl.add_constraints(cts) for cts in reserve_rows(reserve_cover(expected, deviation, p) if budget else None)]
+
+    ### Constarints of stored energy of BES - 식(17) ~ 식(19)
+    ## Day-ahead
+    ## 식(17) t>=1, j>=2
+    mdl.add_constraints(E_BESS_DA[(t,j,s)] == E_BESS_DA[(t,j-1,s)] + del_S * (P_DA_CH[(t,j,s)] - P_DA_DCH[(t,j,s)])
+                       for t in range(1, time_dim+1) for j in range(2, min_dim+1) for s in range(1,BESS_dim+1))
+    ## 식(17) + 식(18) t>=2, j=1
+    mdl.add_constraints(E_BESS_DA[(t,j,s)] == E_BESS_DA[(t-1,min_dim,s)] + del_S * (P_DA_CH[(t,j,s)] - P_DA_DCH[(t,j,s)])
+                       for t in range(2, time_dim+1) for j in range(1, 2) for s in range(1,BESS_dim+1))
+    soc_start, soc_end = soc_rows(Initial_BESS)
+    ## 식(17) + 식(19) t=1, j=1
+    soc_start = mdl.add_constraints(soc_start)
+    ## 식(19) t=T, j=Nj - terminal_soc="free" 이면 생략
+    soc_end = mdl.add_constraints(soc_end)
+
+    ## Real time
+    ## 식(17) t>=1, j>=2
+    mdl.add_constraints(E_BESS_RT[(t,j,s)] == E_BESS_RT[(t,j-1,s)] + del_S * (P_DA_CH[(t,j,s)] - P_DA_DCH[(t,j,s)] + P_DR_CH[(t,j,s)] - P_UR_DCH[(t,j,s)])
+                       for t in range(1, time_dim+1) for j in range(2, min_dim+1) for s in range(1,BESS_dim+1))
+
+    ## 식(17) + 식(18) t>=2, j=1
+    mdl.add_constraints(E_BESS_RT[(t,j,s)] == E_BESS_RT[(t-1,min_dim,s)] + del_S * (P_DA_CH[(t,j,s)] - P_DA_DCH[(t,j,s)] + P_DR_CH[(t,j,s)] - P_UR_DCH[(t,j,s)])
+                       for t in range(2, time_dim+1) for j in range(1, 2) for s in range(1,BESS_dim+1))
+
+    ## 식(19) t=T, j=Nj
+    mdl.add_constraints(E_BESS_RT[(t,j,s)] == E_BESS_DA[(t,j,s)]
+                       for t in range(time_dim, time_dim+1) for j in range(min_dim, min_dim+1) for s in range(1,BESS_dim+1))
+
+    ## 식(17) + 식(19) t=1, j=1
+    mdl.add_constraints(E_BESS_RT[(t,j,s)] == E_BESS_DA[(t,j,s)] + del_S * (P_DR_CH[(t,j,s)] - P_UR_DCH[(t,j,s)])
+                       for t in range(1, 2) for j in range(1, 2) for s in range(1,BESS_dim+1))
+
+    ### Constarints of capacity - 식(20) ~ 식(38)
+    # Power capacity of BES in day-ahead planning - 식(20) ~ 식(25)
+    # Deployed power of BES in regulation service - 식(26) ~ 식(31)
+    for t in range(1,time_dim+1):
+        for j in range(1,min_dim+1):
+            for s in range(1,BESS_dim+1):
+                mdl.add_constraint(P_DA_CH[(t,j,s)] <= P_max_BESS[s-1] * D_Char[(t,j,s)])                         # 식(20)
+                mdl.add_constraint(P_min_BESS[s-1] * D_Char[(t,j,s)] <= P_DA_CH[(t,j,s)])                         # 식(20)
+
+                mdl.add_constraint(P_RS_CH[(t,j,s)] <= P_max_BESS[s-1] * D_Char[(t,j,s)] - P_DA_CH[(t,j,s)])     # 식(21)
+                mdl.add_constraint(P_min_BESS[s-1] <= P_RS_CH[(t,j,s)])                                          # 식(21)
+
+                mdl.add_constraint(P_DA_CH[(t,j,s)] + P_RS_CH[(t,j,s)] <= P_max_BESS[s-1] * D_Char[(t,j,s)])     # 식(22)
+
+                mdl.add_constraint(P_min_BESS[s-1] * D_Char[(t,j,s)] <= P_DA_CH[(t,j,s)] - P_RS_CH[(t,j,s)])     # 식(23)
+
+                mdl.add_constraint(P_DA_DCH[(t,j,s)] <= P_max_BESS[s-1] * D_Dchar[(t,j,s)])                      # 식(24)
+                mdl.add_constraint(P_min_BESS[s-1] * D_Dchar[(t,j,s)] <= P_DA_DCH[(t,j,s)])                      # 식(24)
+
+                mdl.add_constraint(P_RS_DCH[(t,j,s)] <= P_max_BESS[s-1] * D_Dchar[(t,j,s)] - P_DA_DCH[(t,j,s)])  # 식(25)
+                mdl.add_constraint(P_min_BESS[s-1] <= P_RS_DCH[(t,j,s)])                                         # 식(25)
+
+                mdl.add_constraint(P_DR_CH[(t,j,s)] <= P_RS_CH[(t,j,s)])                                       # 식(27)
+
+                mdl.add_constraint(P_UR_DCH[(t,j,s)] <= P_RS_DCH[(t,j,s)])                                     # 식(28)
+
+                mdl.add_constraint(P_DA_DCH[(t,j,s)] + P_RS_DCH[(t,j,s)] <= P_max_BESS[s-1] * D_Dchar[(t,j,s)])  # 식(30)
+
+                mdl.add_constraint(P_min_BESS[s-1] * D_Dchar[(t,j,s)] <= P_DA_DCH[(t,j,s)] - P_RS_DCH[(t,j,s)])  # 식(31)
+
+                # Energy capacity in the real-time - 식(32)
+                mdl.add_constraint(E_min_BESS[s-1] * (D_Char[(t,j,s)] + D_Dchar[(t,j,s)]) <= E_BESS_RT[(t,j,s)])  #식(32) - RT
+                mdl.add_constraint(E_BESS_RT[(t,j,s)] <= E_max_BESS[s-1] * (D_Char[(t,j,s)] + D_Dchar[(t,j,s)]))  #식(32) - RT
+
+                mdl.add_constraint(E_min_BESS[s-1] * (D_Char[(t,j,s)] + D_Dchar[(t,j,s)]) <= E_BESS_DA[(t,j,s)])  #식(32) - DA
+                mdl.add_constraint(E_BESS_DA[(t,j,s)] <= E_max_BESS[s-1] * (D_Char[(t,j,s)] + D_Dchar[(t,j,s)]))  #식(32) - DA
+
+    # Capacity of WPR in the day-ahead planning - 식(33) ~ 식(36)
+    if big_m == "indicator":   # D_WPR = 1 이면 실시간 풍력 이내, 0 이면 입찰 없음
+        tjw = [(t,j,w) for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1)]
+        D = [D_WPR[k] for k in tjw]
+        mdl.add_indicators(D, [P_DA_WPR[k] <= P_RT_WPR[k] for k in tjw], 1)   # 식(33)
+        mdl.add_indicators(D, [P_DA_WPR[k] <= 0 for k in tjw], 0)   # 식(33)
+        mdl.add_indicators(D, [P_RS_WPR[k] <= P_RT_WPR[k] - P_DA_WPR[k] for k in tjw], 1)   # 식(34)
+        mdl.add_indicators(D, [P_RS_WPR[k] <= 0 for k in tjw], 0)   # 식(34)
+        mdl.add_indicators(D, [P_DA_WPR[k] + P_RS_WPR[k] <= P_RT_WPR[k] for k in tjw], 1)   # 식(35)
+        mdl.add_indicators(D, [P_DA_WPR[k] + P_RS_WPR[k] <= 0 for k in tjw], 0)   # 식(35)
+    else:
+        commitment_rows = [mdl.add_constraints(cts) for cts in big_m_rows(wpr_big_m(Expected_P_RT_WPR, p))]
+
+    # 식(36)
+    mdl.add_constraints(0 <= P_DA_WPR[(t,j,w)] - P_RS_WPR[(t,j,w)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))   # 식(36)
+
+    # Deployed power of WPR in the regulation service - 식(37) ~ 식(38)
+    mdl.add_constraints(0 <= P_UR_WPR[(t,j,w)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))   # 식(37)
+
+    mdl.add_constraints(P_UR_WPR[(t,j,w)] <= P_RS_WPR[(t,j,w)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))   # 식(37)
+
+    mdl.add_constraints(0 <= P_DR_WPR[(t,j,w)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))   # 식(38)
+
+    mdl.add_constraints(P_DR_WPR[(t,j,w)] <= P_RS_WPR[(t,j,w)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))   # 식(38)
+
+    ### Constarints of binary decision Variables - 식(39) ~ 식(42)
+    # Commitment status of WPRs, and BESs in the charging and discharging modes in the dayahead planning
+    _add_hourly_equalities(mdl, D_WPR, time_dim, min_dim, WPR_dim, hourly_bids)   # 식(39)
+
+    _add_hourly_equalities(mdl, D_Char, time_dim, min_dim, BESS_dim, hourly_bids)   # 식(40)
+
+    _add_hourly_equalities(mdl, D_Dchar, time_dim, min_dim, BESS_dim, hourly_bids)   # 식(41)
+
+    mdl.add_constraints(0 <= D_Char[(t,j,s)] + D_Dchar[(t,j,s)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for s in range(1,BESS_dim+1))  # 식(42)
+
+    mdl.add_constraints(D_Char[(t,j,s)] + D_Dchar[(t,j,s)] <= 1 for t in range(1,time_dim+1) for j in range(1,min_dim+1) for s in range(1,BESS_dim+1))  # 식(42)
+
+    ### 동일 정격 BESS 의 대칭 제거 - 전일/예비력 계획 전력 합으로 순서 지정 (symmetry.ordered_pairs)
+    scheduled = lambda s: mdl.sum(P_DA_CH[(t,j,s)] + P_DA_DCH[(t,j,s)] + P_RS_CH[(t,j,s)] + P_RS_DCH[(t,j,s)] for t in range(1,time_dim+1) for j in range(1,min_dim+1))
+    pairs = ordered_pairs(p)
+    symmetry_rows = dict(zip(pairs, mdl.add_constraints(scheduled(a+1) >= scheduled(b+1) for a, b in pairs)))
+
+    ### Constarints of ramp-rate - 식(43) ~ 식(57)
+    ## 식(43) and 식(53)
+    # t>=1, j>=2, 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_BESS[s-1]*del_S <= P_DA_CH[(t,j,s)] - P_DA_CH[(t,j-1,s)] for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+    mdl.add_constraints( Ramp_rate_BESS[s-1]*del_S >= P_DA_CH[(t,j,s)] - P_DA_CH[(t,j-1,s)] for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+
+    # t>=2 and j=1 , 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_BESS[s-1]*del_S <= P_DA_CH[(t,j,s)] - P_DA_CH[(t-1,min_dim,s)] for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+    mdl.add_constraints( Ramp_rate_BESS[s-1]*del_S >= P_DA_CH[(t,j,s)] - P_DA_CH[(t-1,min_dim,s)] for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+
+
+    ## 식(44) and 식(52)
+    # t>=1 and j>=2, 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_BESS[s-1]*del_S <= P_DA_DCH[(t,j,s)] - P_DA_DCH[(t,j-1,s)] for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= P_DA_DCH[(t,j,s)] - P_DA_DCH[(t,j-1,s)] for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+
+    # t>=2 and j=1 , 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_BESS[s-1]*del_S <= P_DA_DCH[(t,j,s)] - P_DA_DCH[(t-1,min_dim,s)] for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= P_DA_DCH[(t,j,s)] - P_DA_DCH[(t-1,min_dim,s)] for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+
+
+    ## 식(45) and 식(55)
+    # t>=1 and j>=2, 식 논문과 틀림
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= P_RS_CH[(t,j,s)] - ((-1) * P_RS_CH[(t,j-1,s)]) for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+
+    # t>=2 and j=1 , 식 논문과 틀림
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= P_RS_CH[(t,j,s)] - ((-1) * P_RS_CH[(t-1,min_dim,s)]) for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+
+
+    ## 식(46) and 식(56)
+    # t>=1 and j>=2, 식 논문과 틀림
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= P_RS_DCH[(t,j,s)] - ((-1) * P_RS_DCH[(t,j-1,s)]) for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+
+    # t>=2 and j=1 , 식 논문과 틀림
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= P_RS_DCH[(t,j,s)] - ((-1) * P_RS_DCH[(t-1,min_dim,s)]) for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+
+
+    ## 식(47)
+    # t>=1, j>=2, 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_BESS[s-1]*del_S <= (P_DA_CH[(t,j,s)] + P_RS_CH[(t,j,s)]) - (P_DA_CH[(t,j-1,s)] - P_RS_CH[(t,j-1,s)]) for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= (P_DA_CH[(t,j,s)] + P_RS_CH[(t,j,s)]) - (P_DA_CH[(t,j-1,s)] - P_RS_CH[(t,j-1,s)]) for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+
+    # t>=2 and j=1 , 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_BESS[s-1]*del_S <= (P_DA_CH[(t,j,s)] + P_RS_CH[(t,j,s)]) - (P_DA_CH[(t-1,min_dim,s)] - P_RS_CH[(t-1,min_dim,s)]) for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= (P_DA_CH[(t,j,s)] + P_RS_CH[(t,j,s)]) - (P_DA_CH[(t-1,min_dim,s)] - P_RS_CH[(t-1,min_dim,s)]) for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+
+
+    ## 식(48)
+    # t>=1, j>=2, 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_BESS[s-1]*del_S <= (P_DA_DCH[(t,j,s)] + P_RS_DCH[(t,j,s)]) - (P_DA_DCH[(t,j-1,s)] - P_RS_DCH[(t,j-1,s)]) for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= (P_DA_DCH[(t,j,s)] + P_RS_DCH[(t,j,s)]) - (P_DA_DCH[(t,j-1,s)] - P_RS_DCH[(t,j-1,s)]) for t in range(1,time_dim+1) for j in range(2,min_dim+1) for s in range(1,BESS_dim+1))
+
+    # t>=2 and j=1 , 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_BESS[s-1]*del_S <= (P_DA_DCH[(t,j,s)] + P_RS_DCH[(t,j,s)]) - (P_DA_DCH[(t-1,min_dim,s)] - P_RS_DCH[(t-1,min_dim,s)]) for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+    mdl.add_constraints(Ramp_rate_BESS[s-1]*del_S >= (P_DA_DCH[(t,j,s)] + P_RS_DCH[(t,j,s)]) - (P_DA_DCH[(t-1,min_dim,s)] - P_RS_DCH[(t-1,min_dim,s)]) for t in range(2,time_dim+1) for j in range(1,2) for s in range(1,BESS_dim+1))
+
+
+    ## 식(49) and 식(54)
+    # t>=1, j>=2, 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_WPR * del_S <= P_DA_WPR[(t,j,w)] - P_DA_WPR[(t,j-1,w)] for t in range(1,time_dim+1) for j in range(2,min_dim+1) for w in range(1,WPR_dim+1))
+    mdl.add_constraints(Ramp_rate_WPR * del_S >= P_DA_WPR[(t,j,w)] - P_DA_WPR[(t,j-1,w)] for t in range(1,time_dim+1) for j in range(2,min_dim+1) for w in range(1,WPR_dim+1))
+
+    # t>=2 and j=1 , 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_WPR * del_S <= P_DA_WPR[(t,j,w)] - P_DA_WPR[(t-1,min_dim,w)] for t in range(2,time_dim+1) for j in range(1,2) for w in range(1,WPR_dim+1))
+    mdl.add_constraints(Ramp_rate_WPR * del_S >= P_DA_WPR[(t,j,w)] - P_DA_WPR[(t-1,min_dim,w)] for t in range(2,time_dim+1) for j in range(1,2) for w in range(1,WPR_dim+1))
+
+
+    ## 식(50) and 식(57)
+    # t>=1, j>=2, 식 논문과 틀림
+    mdl.add_constraints(Ramp_rate_WPR * del_S >= P_RS_WPR[(t,j,w)] - ((-1) * P_RS_WPR[(t,j-1,w)]) for t in range(1,time_dim+1) for j in range(2,min_dim+1) for w in range(1,WPR_dim+1))
+
+    # t>=2 and j=1 , 식 논문과 틀림
+    mdl.add_constraints(Ramp_rate_WPR * del_S >= P_RS_WPR[(t,j,w)] - ((-1) * P_RS_WPR[(t-1,min_dim,w)]) for t in range(2,time_dim+1) for j in range(1,2) for w in range(1,WPR_dim+1))
+
+
+    ## 식(51)
+    # t>=1, j>=2, 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_WPR * del_S <= (P_DA_WPR[(t,j,w)] + P_RS_WPR[(t,j,w)]) - (P_DA_WPR[(t,j-1,w)] - P_RS_WPR[(t,j-1,w)]) for t in range(1,time_dim+1) for j in range(2,min_dim+1) for w in range(1,WPR_dim+1))
+    mdl.add_constraints(Ramp_rate_WPR * del_S >= (P_DA_WPR[(t,j,w)] + P_RS_WPR[(t,j,w)]) - (P_DA_WPR[(t,j-1,w)] - P_RS_WPR[(t,j-1,w)]) for t in range(1,time_dim+1) for j in range(2,min_dim+1) for w in range(1,WPR_dim+1))
+
+    # t>=2 and j=1 , 식 논문과 틀림
+    mdl.add_constraints(-1 * Ramp_rate_WPR * del_S <= (P_DA_WPR[(t,j,w)] + P_RS_WPR[(t,j,w)]) - (P_DA_WPR[(t-1,min_dim,w)] - P_RS_WPR[(t-1,min_dim,w)]) for t in range(2,time_dim+1) for j in range(1,2) for w in range(1,WPR_dim+1))
+    mdl.add_constraints(Ramp_rate_WPR * del_S >= (P_DA_WPR[(t,j,w)] + P_RS_WPR[(t,j,w)]) - (P_DA_WPR[(t-1,min_dim,w)] - P_RS_WPR[(t-1,min_dim,w)]) for t in range(2,time_dim+1) for j in range(1,2) for w in range(1,WPR_dim+1))
+
+
+    ### Constraints of uncertain parameters-  식(61) ~ 식(63) - 변동구간 ±interval, budget 모드는 풍력 상한 축소 (uncertainty.realization_band)
+    band = realization_band(expected, deviation, p)
+    (ur_min, ur_max), (dr_min, dr_max), (wpr_min, wpr_max) = band["P-UR"], band["P-DR"], band["P-RT-WPR"]
+    ur_lo = mdl.add_constraints(ur_min[t-1,j-1] <= P_UR[(t,j)] for t in range(1,time_dim+1) for j in range(1,min_dim+1))  # 식 (61)
+
+    ur_hi = mdl.add_constraints(P_UR[(t,j)] <= ur_max[t-1,j-1] for t in range(1,time_dim+1) for j in range(1,min_dim+1))   # 식 (61)
+
+    dr_lo = mdl.add_constraints(dr_min[t-1,j-1] <= P_DR[(t,j)] for t in range(1,time_dim+1) for j in range(1,min_dim+1))  # 식 (62)
+
+    dr_hi = mdl.add_constraints(P_DR[(t,j)] <= dr_max[t-1,j-1] for t in range(1,time_dim+1) for j in range(1,min_dim+1))   # 식 (62)
+
+    wpr_lo = mdl.add_constraints(wpr_min[t-1,j-1] <= P_RT_WPR[(t,j,w)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))  # 식 (63)
+
+    wpr_hi = mdl.add_constraints(P_RT_WPR[(t,j,w)] <= wpr_max[t-1,j-1] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))  # 식 (63)
+    bound_rows = {"P-UR": (ur_lo, ur_hi), "P-DR": (dr_lo, dr_hi), "P-RT-WPR": (wpr_lo, wpr_hi)}   # 식(61)~(63) (하한, 상한)
+
+    ### data for excel
+    ### Income in day-ahead 전일 수익
+    price_rows["AV-RO-DA"] = mdl.add_constraints(AV_RO_DA[t] == terms["AV-RO-DA"][t-1] for t in range(1,time_dim+1))
+
+    ### B_t - 식(2)
+    price_rows["B-t"] = mdl.add_constraints(B_t[t] == terms["B-t"][t-1] for t in range(1,time_dim+1))   # Income of owner
+
+    ### 식(64) 쌍대 제약 - RO_Q + RO_Z >= |ρ * 구간 수익| (uncertainty.py)
+    if budget:
+        for key, Q in (("RO-UR", RO_Q_UR), ("RO-UR-", RO_Q_UR), ("RO-DR", RO_Q_DR), ("RO-DR-", RO_Q_DR)):
+            price_rows[key] = mdl.add_constraints(Q[(t,j)] + RO_Z[int(groups[t-1])] >= a for (t,j), a in zip(time_min, terms[key]))
+
+    ### C_t - 식(3)
+    mdl.add_constraints(C_t[t] == h.hourly("DA-cost", t) + h.hourly("RT-cost", t) for t in range(1,time_dim+1))   # Cost of owner
+
+    ### 자원별 수익 >= 0 (v003 에서는 BESS1-DA ~ WPR-RT 변수의 하한 lb=0)
+    income_rows = {}
+    if p.nonnegative_asset_income:
+        for key in ("BESS-DA", "WPR-DA", "BESS-RT", "WPR-RT"):
+            income_rows[key] = mdl.add_constraints(income >= 0 for income in terms[key])
+
+    parts = {"price_terms": price_terms, "price_rows": price_rows, "income_rows": income_rows, "bound_rows": bound_rows,
+             "big_m_rows": big_m_rows if big_m == "derived" else None, "commitment_rows": commitment_rows,
+             "soc_rows": soc_rows, "soc_constraints": (soc_start, soc_end), "symmetry_rows": symmetry_rows,
+             "reserve_rows": reserve_rows, "reserve_constraints": reserve_constraints,
+             "expressions": h}
+    return mdl, parts
+
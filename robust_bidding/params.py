@@ -0,0 +1,97 @@
+"""Scalar settings of the bidding model (the ``### 파라미터 설정`` block)."""
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+### 시간 내 일정한 입찰/이진 변수의 표현 방식 - 식(4)~(6), (12)~(14), (39)~(41)
+HOURLY_BID_MODES = (
+    "pairwise",   # X[t,j,s] == X[t,J,s] for all (j, J), as in the paper - min_dim² rows per hour
+    "chain",      # X[t,j,s] == X[t,j-1,s] - min_dim-1 rows per hour
+    "hourly",     # one variable per (t, s) / (t, w) - no equality rows
+)
+
+### 식(33)~(35) WPR 투입(D_WPR) 제약의 표현 방식
+BIG_M_MODES = (
+    "constant",    # M = 1e10, as in Code_v003.py
+    "derived",     # M[t,j,w] = (1 + interval) * Expected_P_RT_WPR[t,j] - bounds.wpr_big_m
+    "indicator",   # docplex indicator constraints on D_WPR (docplex builder only)
+)
+
+### 식(19) 마지막 구간의 전일 저장 에너지
+TERMINAL_SOC_MODES = (
+    "initial",   # E_BESS_DA[T, Nj, s] == Initial_BESS, as in Code_v003.py
+    "free",      # no end-of-horizon target (look-ahead windows of rolling.RollingHorizon)
+)
+
+### 동일 정격 BESS 의 대칭 제거 - symmetry.ordered_pairs
+SYMMETRY_MODES = (
+    "none",    # no extra rows, as in Code_v003.py
+    "order",   # identical units ranked by scheduled power, Σ(P_DA_CH + P_DA_DCH + P_RS_CH + P_RS_DCH)[a] >= ...[b]
+)
+
+### 식(61)~(63) 불확실성 집합 - uncertainty.realization_band
+UNCERTAINTY_MODES = (
+    "box",      # P_UR / P_DR / P_RT_WPR chosen by the optimizer within Expected × (1 ± interval), as in Code_v003.py
+    "budget",   # nominal values plus the dualized worst case over a Bertsimas-Sim budget Γ (uncertainty.py)
+    "affine",   # real-time deployments affine in the realization, worst case over the box (affine.py)
+)
+
+### Γ 를 적용하는 구간 묶음
+BUDGET_SCOPES = (
+    "hour",   # Σ_j |ζ[t, j]| <= Γ_t for every hour t
+    "day",    # Σ_t Σ_j |ζ[t, j]| <= Γ over the horizon
+)
+
+### BESS 별 정격 (s) - BiddingParameters 의 리스트 필드
+BESS_ARRAYS = ("E_min_BESS", "E_max_BESS", "P_max_BESS", "P_min_BESS", "Ramp_rate_BESS")
+
+@dataclass
+class BiddingParameters:
+    """Model dimensions and asset ratings.  Defaults are those of ``Code_v003.py``."""
+
+    time_dim: int = 24               # 시간 개수 (t)
+    min_dim: int = 12                # ex) 5분 x 12 = 1시간 (j)
+    BESS_dim: int = 2                # BESS 개수 (s)
+    WPR_dim: int = 1                 # 풍력발전기 개수 (w)
+    Marginal_cost_CH: float = 1      # Marginal cost of BES in charging modes
+    Marginal_cost_DCH: float = 1     # Marginal cost of BES in discharging modes
+    Marginal_cost_WPR: float = 3     # Marginal cost of WPR
+    Ramp_rate_WPR: float = 3         # Ramp-rate of WPR (MW)
+    Initial_BESS: float = 15         # Initial energy of BESS (MWh) - 공통 값 또는 BESS 별 리스트
+    E_min_BESS: list = field(default_factory=lambda: [0, 0])     # Minimum energy of BESS (MWh)
+    E_max_BESS: list = field(default_factory=lambda: [30, 30])   # Maximum energy of BESS (MWh)
+    P_max_BESS: list = field(default_factory=lambda: [5, 3])     # Maximum power of BESS (MW)
+    P_min_BESS: list = field(default_factory=lambda: [0, 0])     # Minimum power of BESS (MW)
+    Ramp_rate_BESS: list = field(default_factory=lambda: [5, 3])  # Ramp-rate of BESS
+    interval: float = 0.5            # 불확실성 변동구간 - 식(61)~(63), Expected × (1 ± interval)
+    uncertainty: str = "box"         # UNCERTAINTY_MODES 중 하나
+    budget_scope: str = "hour"       # BUDGET_SCOPES 중 하나 (uncertainty="budget")
+    gamma: float = None              # Γ - 스칼라 또는 시간별 리스트 (budget_scope="hour"); None 이면 모든 편차가 경계
+    shortfall_price: float = None    # 미이행 페널티 (€/MWh, uncertainty="affine"); None 이면 당일 최고 가격의 2배
+    mipgap: float = 0.0001           # 최적화 계산 오차
+    hourly_bids: str = "pairwise"    # HOURLY_BID_MODES 중 하나
+    big_m: str = "derived"           # BIG_M_MODES 중 하나
+    tighten_bounds: bool = True      # bounds.variable_bounds 를 변수 생성 시 적용 (False: 모든 연속 변수 lb=0, ub=inf)
+    terminal_soc: str = "initial"    # TERMINAL_SOC_MODES 중 하나 - 식(19)
+    symmetry: str = "order"          # SYMMETRY_MODES 중 하나 - 정격이 같은 BESS 사이의 순서 제약
+    nonnegative_asset_income: bool = True   # 자원별 시간당 전일/실시간 수익 >= 0 (v003 의 BESS1-DA ~ WPR-RT 변수 하한)
+
+    def __post_init__(self):
+        for name in BESS_ARRAYS:   # BESS 별 정격 - 길이 BESS_dim
+            if len(getattr(self, name)) != self.BESS_dim:
+                raise ValueError("%s has %d entries, BESS_dim is %d" % (name, len(getattr(self, name)), self.BESS_dim))
+        if np.ndim(self.Initial_BESS) and len(self.Initial_BESS) != self.BESS_dim:
+            raise ValueError("Initial_BESS has %d entries, BESS_dim is %d" % (len(self.Initial_BESS), self.BESS_dim))
+
+    @property
+    def initial_energy(self):
+        """``Initial_BESS`` per unit, a list of ``BESS_dim`` floats."""
+        return np.broadcast_to(np.asarray(self.Initial_BESS, dtype=float), (self.BESS_dim,)).tolist()
+
+    @property
+    def del_S(self):
+        """Duration of intra-hourly interval ex) 5min = 1/12(h)."""
+        return 1 / self.min_dim
+
+    def replace(self, **changes):
+        return replace(self, **changes)
@@ -0,0 +1,427 @@
+"""Rows, nonzeros, build time and memory per constraint family.
+
+Every constraint family of the builders is tagged with its equation number:
+the labels of :func:`~robust_bidding.sparse.build_sparse_model` (``"(17)-(18) DA"``,
+``"(43)/(53)"``, ``"symmetry"``, ...) and the ``# 식(N)`` comments of the
+docplex builders (``Code_v001.py``, ``Code_v002.py``,
+:func:`~robust_bidding.model.build_optimization_model`).
+
+* :func:`profile_sparse` builds with ``profile=True``
+  (:class:`~robust_bidding.sparse.RowBuilder`);
+* :func:`profile_docplex` runs any docplex builder and charges every
+  ``add_constraints`` / ``add_indicators`` / ... call to the ``식(N)``
+  comment of its statement (or of the ``###`` / ``##`` comment above it, or
+  of the calling line for helpers such as ``_add_hourly_equalities``);
+* :func:`profile_script` does the same for a ``Code_v00x.py`` script and
+  the workbook next to it.
+
+The result is a list of :class:`FamilyProfile`; :func:`group` sums it per
+equation number (the first ``(N)`` of the tag) or per tag, :func:`profile_table`
+prints it and :func:`compare_profiles` diffs two profiles - e.g. saved with
+:func:`write_profile` before a formulation change - flagging changed row /
+nonzero counts and build times beyond a tolerance::
+
+    python -m robust_bidding.profiling v001/Code_v001.py v002/Code_v002.py v002/Code_v003.py
+    python -m robust_bidding.profiling "v002/robust model_data.xlsx" --hourly-bids chain --save chain.json
+    python -m robust_bidding.profiling "v002/robust model_data.xlsx" --baseline chain.json
+"""
+import argparse
+import ast
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+import tokenize
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+### 보고서 정렬 / 묶음 기준
+SORT_KEYS = ("order", "rows", "nnz", "ms", "kib")
+GROUP_KEYS = ("equation", "label")
+
+### docplex 행 추가 메서드 - profile_docplex 가 호출마다 기록
+DOCPLEX_METHODS = ("add", "add_", "add_constraint", "add_constraint_", "add_constraints", "add_constraints_",
+                   "add_range", "add_ranges", "add_indicator", "add_indicators", "add_indicator_constraints",
+                   "add_indicator_constraints_", "add_equivalence", "add_equivalences", "add_if_then",
+                   "matrix_constraints", "matrix_ranges")
+
+EQUATION = re.compile(r"식\s*\((\d+)\)")
+
+
+@dataclass
+class FamilyProfile:
+    """One constraint family (sparse builder) or docplex call, or a :func:`group` of them."""
+
+    label: str                   # "(17)-(18) DA", "(43)/(53)", "symmetry", ...
+    rows: int
+    nnz: int
+    ms: float
+    kib: float = None            # memory kept (triplets and bounds / tracemalloc), None if not measured
+    peak_kib: float = None       # tracemalloc peak above the memory held before, None unless memory=True
+    calls: int = 1
+    kept: int = None             # rows left by SparseModel.compact (sparse builder), None for docplex
+
+    @property
+    def equation(self):
+        return equation_key(self.label)
+
+
+def equation_key(label):
+    """First equation number of a tag (``"(17)-(18) DA"`` -> ``"(17)"``); untagged labels as they are."""
+    match = re.match(r"\((\d+)\)", label)
+    return match.group(0) if match else label
+
+
+def equation_tag(comment):
+    """``"식(43) and 식(53)"`` -> ``"(43)/(53)"``, ``"식(4) ~ 식(6)"`` -> ``"(4)~(6)"``; ``None`` without ``식(N)``."""
+    matches = list(EQUATION.finditer(comment))
+    if not matches:
+        return None
+    tag = "(%s)" % matches[0].group(1)
+    for before, match in zip(matches, matches[1:]):
+        between = comment[before.end():match.start()]
+        tag += ("~" if "~" in between else "+" if "+" in between else "/") + "(%s)" % match.group(1)
+    return tag
+
+
+def profile_sparse(data, params=None, memory=False):
+    """``(sparse, [FamilyProfile])`` of :func:`~robust_bidding.sparse.build_sparse_model`.
+
+    ``nnz`` counts the stored triplets (duplicates summed by
+    :meth:`~robust_bidding.sparse.SparseModel.matrix` included, hence more
+    than docplex for the pairwise rows ``j == J``); ``kib`` are the COO
+    triplets and bounds of the family; ``memory=True``
+    traces the build (``peak_kib``; slows the build, so ``ms`` is inflated).
+    """
+    from .params import BiddingParameters
+    from .sparse import build_sparse_model
+
+    p = params if params is not None else BiddingParameters()
+    if p.uncertainty == "affine":
+        raise ValueError("uncertainty='affine' is not profiled per family, use 'box' or 'budget'")
+    tracing = memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    try:
+        sparse = build_sparse_model(data, p, profile=True)
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    kib = lambda value: None if value is None else value / 1024.0
+    profile = [FamilyProfile(label, rows, nnz, 1e3 * seconds, kib(kept), kib(peak), kept=end - first)
+               for (label, rows, nnz, seconds, kept, peak), (_, first, end) in zip(sparse.profile, sparse.families)]
+    return sparse, profile
+
+
+class _SourceTags(object):
+    """``식(N)`` tag of a source line: its statement's comments, else the comment lines above it."""
+
+    def __init__(self):
+        self._files, self._lines = {}, {}
+
+    def _parse(self, path):
+        if path not in self._files:
+            comments, spans, starts = {}, [], []
+            try:
+                with tokenize.open(path) as fp:
+                    source = fp.read()
+                for token in tokenize.generate_tokens(iter(source.splitlines(True)).__next__):
+                    if token.type == tokenize.COMMENT:
+                        comments[token.start[0]] = (token.string, not token.line[:token.start[1]].strip())
+                for node in ast.walk(ast.parse(source)):
+                    if isinstance(node, ast.stmt):
+                        spans.append((node.lineno, node.end_lineno))
+                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        starts.append(node.lineno)
+            except (OSError, SyntaxError, tokenize.TokenError):
+                pass
+            self._files[path] = comments, spans, sorted(starts)
+        return self._files[path]
+
+    def tag(self, path, line):
+        """``(tag, section)``: ``section`` is the nearest ``##`` comment above (the label of untagged calls)."""
+        key = (path, line)
+        if key not in self._lines:
+            comments, spans, starts = self._parse(path)
+            first, last = min((span for span in spans if span[0] <= line <= span[1]),
+                              key=lambda span: span[1] - span[0], default=(line, line))
+            tag = next((equation_tag(comments[k][0]) for k in range(first, last + 1)
+                        if k in comments and equation_tag(comments[k][0])), None)
+            section = None
+            top = max([s for s in starts if s <= first], default=1)
+            for k in range(first - 1, top - 1, -1):   # 위쪽 주석 줄 - ### / ## 구역 설명에서 멈춤
+                if k not in comments or not comments[k][1]:
+                    continue
+                text = comments[k][0]
+                if tag is None:
+                    tag = equation_tag(text)
+                if tag is not None or text.startswith("##"):
+                    section = text.lstrip("#").strip() or None
+                    break
+            self._lines[key] = tag, section or "%s:%d" % (os.path.basename(path), first)
+        return self._lines[key]
+
+
+def _constraint_terms(result):
+    """Rows and variable occurrences of what a docplex ``add_*`` call returned."""
+    items = result if isinstance(result, (list, tuple)) else [] if result is None else [result]
+    nnz = 0
+    for ct in items:
+        try:
+            nnz += sum(1 for _ in ct.iter_variables())
+        except AttributeError:
+            pass
+    return len(items), nnz
+
+
+def profile_docplex(build, *args, memory=False, **kwargs):
+    """``(model, [FamilyProfile])`` of ``build(*args, **kwargs)``, one entry per docplex ``add_*`` call.
+
+    Calls are tagged by :func:`equation_tag` of their source (see the module
+    docstring); untagged ones by the ``##`` comment above them, else
+    ``"<file>:<line>"``.  ``nnz`` counts the
+    variables of both sides of every row.  ``memory=True`` adds the
+    ``tracemalloc`` memory kept (``kib``) and peak per call.
+    """
+    from docplex.mp.advmodel import AdvModel
+    from docplex.mp.model import Model
+
+    tags, profile, depth = _SourceTags(), [], [0]
+    here = os.path.abspath(__file__)
+
+    def caller_tag():
+        frame, fallback = sys._getframe(2), None
+        while frame is not None and os.path.abspath(frame.f_code.co_filename) != here:
+            path = frame.f_code.co_filename
+            if os.sep + "docplex" + os.sep not in path:
+                tag, section = tags.tag(path, frame.f_lineno)
+                if tag is not None:
+                    return tag
+                fallback = fallback or section
+            frame = frame.f_back
+        return fallback or "?"
+
+    def wrap(method):
+        def recorded(*a, **kw):
+            if depth[0]:   # add -> add_constraint 같은 내부 호출은 바깥 호출에 포함
+                return method(*a, **kw)
+            label = caller_tag()
+            depth[0] += 1
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                held = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                result = method(*a, **kw)
+            finally:
+                depth[0] -= 1
+            seconds = time.perf_counter() - start
+            kib = peak = None
+            if tracemalloc.is_tracing():
+                current, top = tracemalloc.get_traced_memory()
+                kib, peak = (current - held) / 1024.0, (top - held) / 1024.0
+            profile.append(FamilyProfile(label, *_constraint_terms(result), ms=1e3 * seconds, kib=kib, peak_kib=peak))
+            return result
+        return recorded
+
+    patched = [(cls, name, cls.__dict__[name]) for cls in (Model, AdvModel) for name in DOCPLEX_METHODS
+               if name in cls.__dict__]
+    tracing = memory and not tracemalloc.is_tracing()
+    for cls, name, method in patched:
+        setattr(cls, name, wrap(method))
+    if tracing:
+        tracemalloc.start()
+    try:
+        mdl = build(*args, **kwargs)
+    finally:
+        if tracing:
+            tracemalloc.stop()
+        for cls, name, method in patched:
+            setattr(cls, name, method)
+    return mdl, profile
+
+
+def profile_script(path, workbook=None, memory=False):
+    """``(model, [FamilyProfile])`` of ``build_optimization_model`` of a ``Code_v00x.py`` script.
+
+    ``workbook`` defaults to ``robust model_data.xlsx`` next to the script;
+    the script's own ``time_dim`` / ``min_dim`` are used when it has them.
+    """
+    from .data import load_market_data
+
+    path = os.path.abspath(path)
+    spec = importlib.util.spec_from_file_location("_profiled_" + re.sub(r"\W", "_", os.path.basename(path)[:-3]), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)   # __name__ != "__main__" - main() 은 실행되지 않음
+    workbook = workbook or os.path.join(os.path.dirname(path), "robust model_data.xlsx")
+    dims = [getattr(module, name) for name in ("time_dim", "min_dim") if hasattr(module, name)]
+    data = load_market_data(workbook, *dims)
+    return profile_docplex(module.build_optimization_model, data, memory=memory)
+
+
+def group(profile, by="equation"):
+    """:class:`FamilyProfile` sums per ``equation`` (:func:`equation_key`) or per ``label``, in first-seen order."""
+    if by not in GROUP_KEYS:
+        raise ValueError("by must be one of %s, got %r" % (", ".join(GROUP_KEYS), by))
+    key = equation_key if by == "equation" else (lambda label: label)
+    add = lambda a, b: None if a is None or b is None else a + b
+    out = {}
+    for family in profile:
+        k = key(family.label)
+        if k not in out:
+            out[k] = FamilyProfile(k, family.rows, family.nnz, family.ms, family.kib, family.peak_kib, family.calls,
+                                   family.kept)
+            continue
+        total = out[k]
+        total.rows, total.nnz, total.ms, total.calls = (total.rows + family.rows, total.nnz + family.nnz,
+                                                        total.ms + family.ms, total.calls + family.calls)
+        total.kib, total.kept = add(total.kib, family.kib), add(total.kept, family.kept)
+        total.peak_kib = None if total.peak_kib is None or family.peak_kib is None else max(total.peak_kib, family.peak_kib)
+    return list(out.values())
+
+
+def _sorted(profile, sort):
+    if sort not in SORT_KEYS:
+        raise ValueError("sort must be one of %s, got %r" % (", ".join(SORT_KEYS), sort))
+    if sort == "order":
+        return list(profile)
+    return sorted(profile, key=lambda family: getattr(family, sort) or 0, reverse=True)
+
+
+def profile_table(profile, by="equation", sort="order", top=None):
+    """Text table of a profile grouped by ``by``, with each family's share of rows, nonzeros and time."""
+    rows = _sorted(group(profile, by), sort)
+    total = FamilyProfile("total", sum(f.rows for f in rows), sum(f.nnz for f in rows), sum(f.ms for f in rows),
+                          sum(f.kib for f in rows) if all(f.kib is not None for f in rows) else None,
+                          max((f.peak_kib for f in rows), default=None) if all(f.peak_kib is not None for f in rows) else None,
+                          sum(f.calls for f in rows),
+                          sum(f.kept for f in rows) if all(f.kept is not None for f in rows) else None)
+    share = lambda part, whole: 100.0 * part / whole if whole else 0.0
+    fmt = lambda value, spec: "-" if value is None else spec % value
+    head = "%-18s %5s %9s %6s %9s %10s %6s %9s %6s %10s %10s"
+    lines = [head % (by, "calls", "rows", "%", "kept", "nnz", "%", "ms", "%", "KiB", "peak KiB")]
+    for family in (rows[:top] if top else rows) + [total]:
+        lines.append(head % (family.label[:18], family.calls, family.rows, "%.1f" % share(family.rows, total.rows),
+                             fmt(family.kept, "%d"),
+                             family.nnz, "%.1f" % share(family.nnz, total.nnz), "%.2f" % family.ms,
+                             "%.1f" % share(family.ms, total.ms), fmt(family.kib, "%.1f"), fmt(family.peak_kib, "%.1f")))
+    return "\n".join(lines)
+
+
+def compare_profiles(before, after, by="equation", tolerance=0.25, min_ms=1.0):
+    """``(text, changed)`` diff of two profiles grouped by ``by``.
+
+    A family is flagged when it appears or disappears, its rows or nonzeros
+    change, or its time grows by more than ``tolerance`` (relative) and
+    ``min_ms``.  ``changed`` lists the flagged keys.
+    """
+    old, new = {f.label: f for f in group(before, by)}, {f.label: f for f in group(after, by)}
+    keys = list(old) + [key for key in new if key not in old]
+    head = "%-18s %9s %9s %10s %10s %9s %9s  %s"
+    lines, changed = [head % (by, "rows", "Δrows", "nnz", "Δnnz", "ms", "Δms", "")], []
+    for key in keys:
+        a, b = old.get(key), new.get(key)
+        if a is None or b is None:
+            family, note = (b, "added") if a is None else (a, "removed")
+            lines.append(head % (key[:18], family.rows, "", family.nnz, "", "%.2f" % family.ms, "", note))
+            changed.append(key)
+            continue
+        notes = [name for name in ("rows", "kept", "nnz") if getattr(a, name) != getattr(b, name)]
+        if b.ms - a.ms > max(tolerance * a.ms, min_ms):
+            notes.append("slower")
+        lines.append(head % (key[:18], b.rows, "%+d" % (b.rows - a.rows), b.nnz, "%+d" % (b.nnz - a.nnz),
+                             "%.2f" % b.ms, "%+.2f" % (b.ms - a.ms), " ".join(notes)))
+        if notes:
+            changed.append(key)
+    total = lambda profile, name: sum(getattr(f, name) for f in profile)
+    lines.append(head % ("total", total(after, "rows"), "%+d" % (total(after, "rows") - total(before, "rows")),
+                         total(after, "nnz"), "%+d" % (total(after, "nnz") - total(before, "nnz")),
+                         "%.2f" % total(after, "ms"), "%+.2f" % (total(after, "ms") - total(before, "ms")),
+                         "%d changed" % len(changed)))
+    return "\n".join(lines), changed
+
+
+def write_profile(profile, path, meta=None):
+    """Save a profile as JSON (``meta``: workbook, parameters, revision, ...)."""
+    with open(path, "w") as fp:
+        json.dump({"meta": meta or {}, "families": [asdict(family) for family in profile]}, fp, indent=1)
+
+
+def read_profile(path):
+    """``(profile, meta)`` of :func:`write_profile`."""
+    with open(path) as fp:
+        saved = json.load(fp)
+    return [FamilyProfile(**family) for family in saved["families"]], saved.get("meta", {})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m robust_bidding.profiling",
+                                     description="Rows, nonzeros, build time and memory per equation number.")
+    parser.add_argument("sources", nargs="+",
+                        help="Code_v00x.py scripts (docplex builder), workbooks (sparse builder) or saved profiles "
+                             "(.json); the first is compared with each other one")
+    parser.add_argument("--by", choices=GROUP_KEYS, default="equation")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="order")
+    parser.add_argument("--top", type=int, default=None, help="only the first N families of each table")
+    parser.add_argument("--memory", action="store_true", help="trace memory (tracemalloc; inflates the times)")
+    parser.add_argument("--repeat", type=int, default=1, help="builds per source; times are the per-family minimum")
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--hourly-bids", choices=("pairwise", "chain", "hourly"), default=None)
+    parser.add_argument("--big-m", choices=("constant", "derived"), default=None)
+    parser.add_argument("--symmetry", choices=("none", "order"), default=None)
+    parser.add_argument("--uncertainty", choices=("box", "budget"), default=None)
+    parser.add_argument("--save", default=None, metavar="JSON", help="write the profile of the last source")
+    parser.add_argument("--baseline", default=None, metavar="JSON", help="compare every source with a saved profile")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="relative build-time growth flagged as slower")
+    args = parser.parse_args(argv)
+
+    from .params import BiddingParameters
+
+    overrides = {name: getattr(args, name) for name in ("hourly_bids", "big_m", "symmetry", "uncertainty")
+                 if getattr(args, name) is not None}
+    params = BiddingParameters(interval=args.interval, **overrides)
+    loaded = {}
+
+    def run(source):
+        if source.endswith(".json"):
+            return read_profile(source)
+        builds = []
+        for _ in range(max(1, args.repeat)):
+            if source.endswith(".py"):
+                builds.append(profile_script(source, memory=args.memory)[1])
+                meta = {"source": os.path.abspath(source), "builder": "docplex"}
+            else:
+                if source not in loaded:
+                    from .data import load_market_data
+                    loaded[source] = load_market_data(source, params.time_dim, params.min_dim)
+                builds.append(profile_sparse(loaded[source], params, args.memory)[1])
+                meta = dict(asdict(params), source=os.path.abspath(source), builder="sparse")
+        profile = builds[0]
+        for family, *others in zip(*builds):   # 반복 중 최소 시간
+            family.ms = min([family.ms] + [other.ms for other in others])
+        return profile, meta
+
+    baseline = read_profile(args.baseline)[0] if args.baseline else None
+    profiles = []
+    for source in args.sources:
+        profile, meta = run(source)
+        profiles.append(profile)
+        print("== %s" % source)
+        print(profile_table(profile, args.by, args.sort, args.top))
+        if baseline is not None:
+            print("-- against %s" % args.baseline)
+            print(compare_profiles(baseline, profile, args.by, args.tolerance)[0])
+        print()
+    for source, profile in zip(args.sources[1:], profiles[1:]):
+        print("== %s -> %s" % (args.sources[0], source))
+        print(compare_profiles(profiles[0], profile, args.by, args.tolerance)[0])
+        print()
+    if args.save is not None:
+        write_profile(profiles[-1], args.save, meta)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Re-optimized real-time recourse of fixed bids over scenario batches.
+
+:func:`~robust_bidding.settlement.settle` follows regulation calls with a
+fixed pro-rata rule.  :class:`RecourseEvaluator` instead re-optimizes the
+real-time stage per scenario: the LP of :class:`~robust_bidding.ccg.Recourse`
+(``P_UR_DCH`` / ``P_DR_CH`` / ``P_UR_WPR`` / ``P_DR_WPR``, ``E_BESS_RT`` and
+the penalized shortfalls) with the day-ahead decisions fixed.
+
+* the LP is built once per worker process (``backend="cplex"`` through
+  :func:`~robust_bidding.sparse.to_cplex`, or ``"highs"``; ``"auto"`` picks
+  one with :func:`~robust_bidding.solvers.select_backend`);
+* between scenarios only the bounds of the rows that hold the realization
+  (식(10), (11) and the wind rows) change, so each solve restarts from the
+  previous basis;
+* scenarios are split into ``chunk``-sized batches over a process pool.
+
+Scenarios are ``P_UR`` / ``P_DR`` / ``P_RT_WPR`` arrays shaped
+``(n, time_dim, min_dim)`` as for :func:`~robust_bidding.settlement.settle`;
+prices are those of ``data`` (only the right-hand side is updated).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .ccg import Recourse, shortfall_penalty
+from .params import BiddingParameters
+from .settlement import settle
+from .solvers import highs_model, select_backend
+from .sparse import ColumnLayout, SparseModel, to_cplex
+
+### 실시간 단계에 고정되는 전일 결정 - ccg.Recourse 가 참조하는 변수
+FIRST_STAGE = ("P-DA-CH", "P-DA-DCH", "P-DA-WPR", "P-RS-CH", "P-RS-DCH", "P-RS-WPR", "E-BESS-DA", "D-Char", "D-DChar")
+
+### LP 백엔드
+RECOURSE_BACKENDS = ("auto", "cplex", "highs")
+
+
+@dataclass
+class RecourseResult:
+    """Per-scenario outcome of :meth:`RecourseEvaluator.evaluate`, ``(n,)`` arrays."""
+
+    revenue: np.ndarray          # day_ahead + recourse
+    recourse: np.ndarray         # optimal real-time value: regulation income - marginal cost - shortfall penalty
+    shortfall: np.ndarray        # MWh of calls / wind not delivered
+    optimal: np.ndarray          # bool, the LP was solved to optimality
+    day_ahead: float             # day-ahead energy and reserve income less marginal cost (same for all scenarios)
+
+
+class _CplexLP(object):
+    """Persistent ``cplex.Cplex`` LP with row bounds updated in place."""
+
+    def __init__(self, lp):
+        import cplex
+
+        self.cpx = to_cplex(lp, "Recourse")
+        self.cpx.set_problem_type(self.cpx.problem_type.LP)
+        for stream in (self.cpx.set_log_stream, self.cpx.set_results_stream,
+                       self.cpx.set_warning_stream, self.cpx.set_error_stream):
+            stream(None)
+        self.cpx.parameters.threads.set(1)
+        self.optimal = self.cpx.solution.status.optimal
+        self._inf = cplex.infinity
+
+    def solve(self, rows, lo, hi):
+        self.cpx.linear_constraints.set_rhs(list(zip(rows.tolist(), np.where(np.isfinite(lo), lo, hi).tolist())))
+        self.cpx.solve()
+        ok = self.cpx.solution.get_status() == self.optimal
+        return ok, (self.cpx.solution.get_objective_value() if ok else np.nan), (
+            np.asarray(self.cpx.solution.get_values()) if ok else None)
+
+
+class _HighsLP(object):
+    """Persistent ``highspy.Highs`` LP with row bounds updated in place."""
+
+    def __init__(self, lp):
+        import highspy
+
+        self.h = highs_model(lp, relax=True, threads=1)
+        self.optimal = highspy.HighsModelStatus.kOptimal
+        self._inf = highspy.kHighsInf
+
+    def solve(self, rows, lo, hi):
+        self.h.changeRowsBounds(len(rows), rows.astype(np.int32), np.maximum(lo, -self._inf), np.minimum(hi, self._inf))
+        self.h.run()
+        ok = self.h.getModelStatus() == self.optimal
+        return ok, (self.h.getInfo().objective_function_value if ok else np.nan), (
+            np.asarray(self.h.getSolution().col_value) if ok else None)
+
+
+_WORKER = {}   # 작업 프로세스별 LP 와 실현값 행 - initializer 로 한 번만 생성
+
+
+def _init_worker(recourse, x, backend):
+    lo, hi = recourse.rhs(x, np.zeros(recourse.U.shape[1]))
+    lp = SparseModel.from_arrays(BiddingParameters(), recourse.names, recourse.c, np.zeros(recourse.shape[1]),
+                                 np.full(recourse.shape[1], np.inf), np.zeros(recourse.shape[1], dtype=bool),
+                                 recourse.Y, lo, hi)
+    rows = np.flatnonzero(np.diff(recourse.U.indptr))   # 실현값이 들어가는 행
+    shortfall = np.concatenate([recourse.blocks[name].ravel() for name in ("S-UR", "S-DR", "S-WPR")])
+    _WORKER.update(lp=_CplexLP(lp) if backend == "cplex" else _HighsLP(lp), rows=rows, U=recourse.U[rows],
+                   lo=lo[rows], hi=hi[rows], shortfall=shortfall, del_S=recourse.del_S)
+
+
+def _solve_chunk(u):
+    """``(objective, shortfall, optimal)`` of every realization row of ``u``, ``(m, n_u)``."""
+    w = _WORKER
+    shift = (w["U"] @ u.T).T   # (m, rows)
+    objective, shortfall, optimal = np.full(len(u), np.nan), np.full(len(u), np.nan), np.zeros(len(u), dtype=bool)
+    for i in range(len(u)):
+        optimal[i], objective[i], y = w["lp"].solve(w["rows"], w["lo"] - shift[i], w["hi"] - shift[i])
+        if y is not None:
+            shortfall[i] = w["del_S"] * y[w["shortfall"]].sum()
+    return objective, shortfall, optimal
+
+
+class RecourseEvaluator(object):
+    """Evaluate fixed day-ahead bids by re-optimizing the real-time stage per scenario.
+
+    ::
+
+        evaluator = RecourseEvaluator(case, params, solution_arrays(mdl, s))
+        result = evaluator.evaluate(sample_scenarios(case, params, 5000), workers=8)
+        print(result.revenue.mean(), result.shortfall.max())
+
+    ``bids`` maps the :data:`FIRST_STAGE` families to arrays (hourly
+    ``(t, s|w)`` bids are broadcast; ``E-BESS-DA`` is always recomputed from
+    the schedule, so it may be missing).  ``shortfall_price=None`` is that of
+    :func:`~robust_bidding.ccg.shortfall_penalty`.  ``backend="auto"`` is
+    CPLEX when licensed for the LP, else HiGHS.
+    """
+
+    def __init__(self, data, params=None, bids=None, shortfall_price=None, backend="auto"):
+        if backend not in RECOURSE_BACKENDS:
+            raise ValueError("backend must be one of %s, got %r" % (", ".join(RECOURSE_BACKENDS), backend))
+        p = params if params is not None else BiddingParameters()
+        self.data, self.params = data, p
+        T, J, S = p.time_dim, p.min_dim, p.BESS_dim
+        bids = dict(bids)
+        ### 식(17)~(19) DA - 주어진 E-BESS-DA 의 솔버 오차만으로도 식(19) RT 가 불능이 되므로 항상 재계산
+        hourly = lambda name: np.broadcast_to(bids[name] if np.ndim(bids[name]) == 3 else np.asarray(bids[name])[:, None, :], (T, J, S))
+        flow = (hourly("P-DA-CH") - hourly("P-DA-DCH")).reshape(T * J, S)
+        bids["E-BESS-DA"] = (np.asarray(p.initial_energy) + p.del_S * np.cumsum(flow, axis=0)).reshape(T, J, S)
+        layout = ColumnLayout()
+        blocks = {name: layout.add(name, np.shape(bids[name])) for name in FIRST_STAGE}
+        self.x = np.concatenate([np.asarray(bids[name], dtype=float).ravel() for name in FIRST_STAGE])
+        self.recourse = Recourse(data, p, blocks, layout.size, shortfall_penalty(data, p, shortfall_price))
+        self.backend = select_backend(self.recourse) if backend == "auto" else backend
+        if self.backend not in RECOURSE_BACKENDS:   # CBC 는 기저 재사용 불가
+            raise RuntimeError("the recourse LP needs cplex or highspy, only %s is available" % self.backend)
+        nominal = {name: np.asarray(getattr(data, "Expected_" + name), dtype=float)[None, :T, :J]
+                   for name in ("P_UR", "P_DR", "P_RT_WPR")}
+        first = settle(bids, nominal, data, p)
+        self.day_ahead = float(first.day_ahead[0] + first.reserve[0])
+
+    def evaluate(self, scenarios, workers=None, chunk=256):
+        """Solve the recourse for every scenario; returns a :class:`RecourseResult`.
+
+        ``workers=None`` uses one process per core; ``workers=1`` solves in the
+        calling process.
+        """
+        p = self.params
+        T, J = p.time_dim, p.min_dim
+        n = len(scenarios["P_UR"])
+        u = np.concatenate([np.asarray(scenarios[name], dtype=float)[:, :T, :J].reshape(n, -1)
+                            for name in ("P_UR", "P_DR", "P_RT_WPR")], axis=1)
+        batches = [u[a:a + chunk] for a in range(0, n, chunk)]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            _init_worker(self.recourse, self.x, self.backend)
+            parts = [_solve_chunk(batch) for batch in batches]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.recourse, self.x, self.backend)) as pool:
+                parts = list(pool.map(_solve_chunk, batches))
+        objective, shortfall, optimal = (np.concatenate(values) for values in zip(*parts))
+        return RecourseResult(revenue=self.day_ahead + objective, recourse=objective, shortfall=shortfall,
+                              optimal=optimal, day_ahead=self.day_ahead)
@@ -0,0 +1,146 @@
+"""Solution export: variable table, result workbook and ``solution.json``.
+
+pandas and win32com are imported inside the functions that need them.
+"""
+import os
+
+import numpy as np
+
+
+def solution_frame(mdl, solution):
+    """One row per variable, name split on ``_`` into ``var, index1..3``.
+
+    As in the original scripts, for variables indexed by time only the value
+    ends up in ``index2``.
+    """
+    import pandas as pd
+
+    data = [v.name.split('_') + [solution.get_value(v)] for v in mdl.iter_variables()]   # 변수 데이터 저장
+    return pd.DataFrame(data, columns=['var', 'index1', 'index2', 'index3', 'value'])
+
+
+def sparse_solution_frame(sparse, x):
+    """:func:`solution_frame` of a :class:`~robust_bidding.sparse.SparseModel` solved by :func:`~robust_bidding.solvers.solve`."""
+    import pandas as pd
+
+    data = [name.split('_') + [value] for name, value in zip(sparse.names, np.asarray(x).tolist())]
+    return pd.DataFrame(data, columns=['var', 'index1', 'index2', 'index3', 'value'])
+
+
+def solution_arrays(mdl, solution):
+    """Solution values as ``{family: ndarray}``, e.g. ``P-DA-CH_3_5_2`` -> ``["P-DA-CH"][2, 4, 1]``.
+
+    Works for every builder (the variable names are the same); all values are
+    read with a single ``get_values`` call.
+    """
+    from .warmstart import name_arrays
+
+    variables = list(mdl.iter_variables())
+    return name_arrays([v.name for v in variables], solution.get_values(variables))
+
+
+def asset_revenue(arrays, data, params):
+    """Hourly income of every BESS and WPR from the solution arrays.
+
+    Returns ``{"BESS-DA": (T, S), "BESS-RT": (T, S), "WPR-DA": (T, W),
+    "WPR-RT": (T, W)}``: day-ahead energy + reserve income less the marginal
+    cost of the day-ahead schedule, and real-time regulation income less the
+    marginal cost of the deployed power.  Summed over the assets they are the
+    ``AV-RO-DA`` and ``AV-RO`` rows of the model.
+    """
+    p = params
+    T, J, del_S = p.time_dim, p.min_dim, p.del_S
+    MC_CH, MC_DCH, MC_WPR = p.Marginal_cost_CH, p.Marginal_cost_DCH, p.Marginal_cost_WPR
+    da = np.asarray(data.Price_DA, dtype=float)[:T, :1, None]   # (t, 1, 1)
+    rs = np.asarray(data.Price_RS, dtype=float)[:T, :1, None]
+    ur = np.asarray(data.Price_UR, dtype=float)[:T, :J, None]   # (t, j, 1)
+    dr = np.asarray(data.Price_DR, dtype=float)[:T, :J, None]
+
+    def x(name):   # (t, j, s|w); hourly 입찰 변수 (t, s|w) 는 j 축으로 broadcast
+        value = arrays[name]
+        return value if value.ndim == 3 else np.broadcast_to(value[:, None, :], (T, J, value.shape[1]))
+
+    return {
+        "BESS-DA": del_S * ((da - MC_DCH) * x("P-DA-DCH") - (da + MC_CH) * x("P-DA-CH")
+                            + rs * (x("P-RS-CH") + x("P-RS-DCH"))).sum(axis=1),
+        "WPR-DA": del_S * ((da - MC_WPR) * x("P-DA-WPR") + rs * x("P-RS-WPR")).sum(axis=1),
+        "BESS-RT": del_S * ((ur - MC_DCH) * x("P-UR-DCH") + (dr - MC_CH) * x("P-DR-CH")).sum(axis=1),
+        "WPR-RT": del_S * ((ur - MC_WPR) * x("P-UR-WPR") + dr * x("P-DR-WPR")).sum(axis=1),
+    }
+
+
+def revenue_frame(revenue):
+    """:func:`asset_revenue` as a long table ``var, asset, hour, value``."""
+    import pandas as pd
+
+    frames = []
+    for name, value in revenue.items():
+        hour, asset = np.indices(value.shape) + 1
+        frames.append(pd.DataFrame({'var': name, 'asset': asset.ravel(), 'hour': hour.ravel(), 'value': value.ravel()}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _asset_label(kind, k, n):
+    return kind if n == 1 and kind == "WPR" else "%s#%d" % (kind, k)
+
+
+### Write Result
+def write_result_workbook(mdl, frame, path, revenue, excel=None):
+    """Fill the "Optimization Result" sheet of ``path`` through Excel COM.
+
+    ``revenue`` is the output of :func:`asset_revenue`; one row per asset is
+    written in columns D:E (day-ahead block, then real-time block).
+    """
+    import win32com.client as win32
+
+    own_excel = excel is None
+    if own_excel:
+        excel = win32.Dispatch("Excel.Application")
+    wb_result = excel.Workbooks.Open(os.path.abspath(path))
+    ws1 = wb_result.Worksheets("Optimization Result")
+
+    ### Sheet 1
+    rows = [
+        ((2, 1), "Total Revenue [$]", float(mdl.objective_value)),
+        ((3, 1), "Income in day-ahead [$]", "AV-RO-DA"),
+        ((7, 1), "Income in real-time [$]", "AV-RO"),
+        ((11, 1), "Income of owner [$]", "B-t"),
+        ((12, 1), "Cost of owner [$]", "C-t"),
+    ]
+    ### 자원별 수익 - BESS#1..S, WPR(#1..W)
+    n_assets = revenue["BESS-DA"].shape[1] + revenue["WPR-DA"].shape[1]
+    for row, market, label in ((3, "DA", "day-ahead"), (4 + n_assets, "RT", "real-time")):
+        for kind in ("BESS", "WPR"):
+            totals = revenue["%s-%s" % (kind, market)].sum(axis=0)
+            for k, total in enumerate(totals, 1):
+                rows.append(((row, 4), "Income of %s in %s [$]" % (_asset_label(kind, k, totals.size), label), float(total)))
+                row += 1
+    ws1.Cells(1, 2).Value = "Optimization Result"
+    for (r, c), label, value in rows:
+        if isinstance(value, str):
+            value = frame.loc[frame['var'] == value]['index2'].sum()
+        ws1.Cells(r, c).Value = label
+        ws1.Cells(r, c + 1).Value = value
+
+    print("Optimization Result Calculation Done!")
+
+    wb_result.Save()
+    if own_excel:
+        excel.Quit()
+
+
+def export_solution_json(mdl, path):
+    with open(path, "w") as fp:   # json 형태로 solution 저장
+        mdl.solution.export(fp, "json")
+
+
+def export_result_json(result, sparse, path):
+    """``solution.json`` of a :class:`~robust_bidding.solvers.SolveResult`: header and ``name``/``value`` per variable."""
+    import json
+
+    header = {"backend": result.backend, "status": result.status, "solver_status": result.solver_status,
+              "objective": result.objective, "bound": result.bound, "gap": result.gap}
+    variables = [{"index": k, "name": name, "value": value}
+                 for k, (name, value) in enumerate(zip(sparse.names, np.asarray(result.x).tolist()))]
+    with open(path, "w") as fp:
+        json.dump({"header": header, "variables": variables}, fp)
@@ -0,0 +1,142 @@
+"""Multi-day rolling horizon with state-of-charge carry-over.
+
+``Code_v003.py`` solves one day in isolation: 식(17)+(19) start every BESS
+at ``Initial_BESS`` and 식(19) forces the day to end there again.
+:class:`RollingHorizon` walks over a multi-day
+:class:`~robust_bidding.data.MarketData` instead:
+
+* step ``d`` solves a window of ``step + lookahead`` hours starting at hour
+  ``d * step`` and commits the first ``step`` hours;
+* the realized energy ``E_BESS_RT`` at the end of the committed hours is the
+  next window's initial energy (``BiddingModelTemplate.set_initial_energy``);
+* the model is built once per window length and re-priced between steps
+  (:class:`~robust_bidding.template.BiddingModelTemplate`);
+* the previous incumbent, shifted by ``step`` hours, is passed to the solver
+  as a MIP start for the binaries;
+* with ``backend`` the windows are solved as sparse models through
+  :func:`robust_bidding.solvers.solve` (CPLEX, HiGHS or CBC) instead of docplex.
+
+Whether the window must end at its start level is ``params.terminal_soc``;
+with ``"free"`` the look-ahead hours are what keeps energy in the batteries.
+"""
+import time
+from dataclasses import dataclass, field
+
+from .params import BiddingParameters
+from .results import solution_arrays
+from .template import BiddingModelTemplate
+from .warmstart import start_arrays
+
+
+@dataclass
+class RollingStep:
+    """Outcome of one committed step of :meth:`RollingHorizon.run`."""
+
+    step: int                 # 0-based step number
+    start_hour: int           # first committed hour in the full horizon (0-based)
+    hours: int                # committed hours
+    status: str               # solver status of the window
+    objective: float          # window objective (committed + look-ahead hours)
+    revenue: float            # Σ (AV-RO-DA + AV-RO) over the committed hours
+    initial_energy: list      # E at the start of the step, per BESS (MWh)
+    terminal_energy: list     # realized E_BESS_RT at the end of the committed hours
+    seconds: float            # update + solve
+    arrays: dict = field(default_factory=dict, repr=False)   # solution_arrays of the committed hours
+
+
+class RollingHorizon(object):
+    """Solve ``data`` (``time_dim`` = all hours) ``step`` hours at a time.
+
+    ::
+
+        horizon = RollingHorizon(year, params.replace(terminal_soc="free"), step=24, lookahead=24)
+        for day in horizon.run():
+            print(day.step, day.revenue, day.terminal_energy)
+
+    ``params.time_dim`` is ignored; ``params.Initial_BESS`` is the energy at
+    hour 0.  The last windows are shortened when fewer than ``lookahead``
+    hours remain (one extra template per window length).  ``backend`` is
+    ``None`` (docplex) or one of :data:`~robust_bidding.solvers.SOLVER_BACKENDS`.
+    """
+
+    def __init__(self, data, params=None, step=24, lookahead=24, warm_start=True, backend=None):
+        if step < 1 or lookahead < 0:
+            raise ValueError("step must be >= 1 and lookahead >= 0, got %r / %r" % (step, lookahead))
+        self.data = data
+        self.params = params if params is not None else BiddingParameters()
+        self.step = step
+        self.lookahead = lookahead
+        self.warm_start = warm_start
+        self.backend = backend
+        self._templates = {}   # window hours -> (template, binaries)
+
+    def template(self, hours, window):
+        """Template for a ``hours``-long window (built on first use from ``window``)."""
+        if hours not in self._templates:
+            template = BiddingModelTemplate(window, self.params.replace(time_dim=hours), backend=self.backend)
+            binaries = [] if template.model is None else [
+                (v, tuple(int(i) - 1 for i in v.name.split('_')[1:]), v.name.split('_')[0])
+                for v in template.model.iter_binary_vars()]
+            self._templates[hours] = (template, binaries)
+        return self._templates[hours]
+
+    def run(self, steps=None, **solve_kwargs):
+        """Yield a :class:`RollingStep` per committed step.
+
+        ``solve_kwargs`` go to ``Model.solve``, or to
+        :func:`robust_bidding.solvers.solve` with ``backend``.
+
+        Raises ``RuntimeError`` when a window has no solution (the energy to
+        carry over is then unknown).
+        """
+        total = self.data.time_dim
+        count = -(-total // self.step)
+        count = count if steps is None else min(count, steps)
+        initial = self.params.initial_energy
+        previous = None   # solution_arrays of the previous window
+        for d in range(count):
+            start = d * self.step
+            committed = min(self.step, total - start)
+            hours = min(self.step + self.lookahead, total - start)
+            window = self.data.hours(start, start + hours)
+            begin = time.perf_counter()
+            template, binaries = self.template(hours, window)
+            template.update_from(window)
+            template.set_initial_energy(initial)
+            if self.backend is not None:
+                shifted = start_arrays(previous, shift=self.step) if self.warm_start and previous is not None else None
+                result = template.solve(start=shifted or None, **solve_kwargs)
+                status, objective, arrays = result.status, result.objective, result.arrays
+            else:
+                mdl = template.model
+                mdl.clear_mip_starts()
+                if self.warm_start and previous is not None:
+                    self._add_shifted_start(mdl, binaries, previous)
+                s = mdl.solve(**solve_kwargs)
+                status = mdl.solve_details.status
+                objective, arrays = (s.objective_value, solution_arrays(mdl, s)) if s else (None, None)
+            seconds = time.perf_counter() - begin
+            if not arrays:
+                raise RuntimeError("step %d (hours %d-%d): no solution (%s)" % (d, start, start + hours, status))
+            terminal = arrays["E-BESS-RT"][committed - 1, -1, :].tolist()
+            yield RollingStep(step=d, start_hour=start, hours=committed, status=status, objective=objective,
+                              revenue=float(arrays["AV-RO-DA"][:committed].sum() + arrays["AV-RO"][:committed].sum()),
+                              initial_energy=initial, terminal_energy=terminal, seconds=seconds,
+                              arrays={name: value[:committed] for name, value in arrays.items()})
+            initial, previous = terminal, arrays
+
+    def _add_shifted_start(self, mdl, binaries, previous):
+        """MIP start: binary ``X[t]`` of this window = ``X[t + step]`` of the previous one, where known."""
+        start = mdl.new_solution()
+        for v, index, name in binaries:
+            value = previous.get(name)
+            shifted = (index[0] + self.step,) + index[1:]
+            if value is not None and shifted[0] < value.shape[0]:
+                start.add_var_value(v, int(round(value[shifted])))
+        if start.number_of_var_values:
+            mdl.add_mip_start(start)
+
+
+def run_rolling_horizon(data, params=None, step=24, lookahead=24, steps=None, backend=None, **solve_kwargs):
+    """All :class:`RollingStep` of :meth:`RollingHorizon.run` as a list."""
+    return list(RollingHorizon(data, params, step, lookahead, backend=backend).run(steps, **solve_kwargs))
@@ -0,0 +1,186 @@
+"""Expected-value bidding by sample average approximation (SAA).
+
+Instead of a worst case over 식(61)~(63), :func:`solve_saa` maximizes the
+day-ahead value plus the probability-weighted real-time value over a set of
+scenarios (``P_UR`` / ``P_DR`` / ``P_RT_WPR`` arrays shaped
+``(n, time_dim, min_dim)``, e.g. :func:`~robust_bidding.settlement.sample_scenarios`)::
+
+    max_x  c'x + Σ_k p_k Q(x, u_k)
+
+The extensive form (:func:`build_saa_model`) shares one first stage - the
+bid, reserve, ``E_BESS_DA`` and binary rows of the v003 builder
+(:func:`~robust_bidding.ccg.first_stage`) - and replicates only the
+real-time block of :class:`~robust_bidding.ccg.Recourse` per scenario
+(deployments, ``E_BESS_RT``, shortfalls at ``params.shortfall_price``).
+
+Thousands of sampled scenarios are first shrunk to ``count`` by
+fast-forward selection (:func:`fast_forward`): scenarios are picked one at a
+time to minimize the probability-weighted distance of the others to the
+selected set, and every dropped scenario hands its probability to the
+closest one kept.
+"""
+import time
+from dataclasses import dataclass, field
+from math import inf
+
+import numpy as np
+
+from .ccg import SECOND_STAGE, Recourse, first_stage, shortfall_penalty
+from .params import BiddingParameters
+from .solvers import make_solver
+from .sparse import SparseModel, build_sparse_model
+
+### 시나리오 배열 - Recourse 의 U-UR / U-DR / U-WPR 순서
+SCENARIO_ARRAYS = ("P_UR", "P_DR", "P_RT_WPR")
+
+
+@dataclass
+class SAAResult:
+    """Outcome of :func:`solve_saa`."""
+
+    status: str                # solver status
+    objective: float           # day_ahead + Σ p_k recourse_k
+    day_ahead: float           # c'x of the first stage (Σ AV-RO-DA)
+    real_time: float           # expected real-time value Σ p_k recourse_k
+    seconds: float             # build + solve
+    reduction_seconds: float   # fast-forward selection
+    recourse: np.ndarray = field(repr=False, default=None)        # real-time value per kept scenario
+    probabilities: np.ndarray = field(repr=False, default=None)   # of the kept scenarios
+    scenarios: dict = field(default_factory=dict, repr=False)     # the kept scenarios
+    first_stage: dict = field(default_factory=dict, repr=False)   # family -> values of the bids
+
+
+def fast_forward(points, count, probabilities=None, chunk=1024):
+    """Fast-forward selection of ``count`` rows of ``points`` ``(n, d)``; returns ``(index, probabilities)``.
+
+    Distances are Euclidean, held as one ``(n, n)`` float32 matrix.  The
+    probability of every row not selected moves to its nearest selected row.
+    """
+    x = np.asarray(points, dtype=np.float32)
+    n = len(x)
+    p = np.full(n, 1.0 / n) if probabilities is None else np.asarray(probabilities, dtype=float) / np.sum(probabilities)
+    if count >= n:
+        return np.arange(n), p
+    sq = (x * x).sum(axis=1)
+    D = np.empty((n, n), dtype=np.float32)
+    for a in range(0, n, chunk):
+        D[a:a + chunk] = sq[a:a + chunk, None] + sq[None, :] - 2 * (x[a:a + chunk] @ x.T)
+    np.sqrt(np.maximum(D, 0, out=D), out=D)
+
+    selected, free = [], np.ones(n, dtype=bool)
+    nearest = np.full(n, np.inf, dtype=np.float32)   # 선택된 집합까지의 거리
+    z = np.empty(n)
+    for _ in range(count):
+        for a in range(0, n, chunk):   # z_u = Σ_i p_i min(D[i, u], nearest_i)
+            z[a:a + chunk] = p @ np.minimum(D[:, a:a + chunk], nearest[:, None])
+        z[~free] = inf
+        u = int(np.argmin(z))
+        selected.append(u)
+        free[u] = False
+        nearest = np.minimum(nearest, D[:, u])
+        nearest[u] = 0
+    index = np.array(selected)
+    owner = np.argmin(D[:, index], axis=1)
+    return index, np.bincount(owner, weights=p, minlength=count)
+
+
+def reduce_scenarios(scenarios, count, probabilities=None):
+    """Keep ``count`` scenarios of ``scenarios`` by :func:`fast_forward`; returns ``(scenarios, probabilities)``.
+
+    The distance is taken over ``P_UR`` / ``P_DR`` / ``P_RT_WPR`` (MW); any
+    other array (sampled prices) is subset alongside.
+    """
+    n = len(scenarios["P_UR"])
+    points = np.concatenate([np.asarray(scenarios[name]).reshape(n, -1) for name in SCENARIO_ARRAYS], axis=1)
+    index, q = fast_forward(points, count, probabilities)
+    return {name: np.asarray(value)[index] for name, value in scenarios.items()}, q
+
+
+def _realizations(scenarios, params):
+    """``u`` of every scenario in the U-UR / U-DR / U-WPR layout of :class:`Recourse`, ``(n, 3 * T * J)``."""
+    T, J = params.time_dim, params.min_dim
+    n = len(scenarios["P_UR"])
+    return np.concatenate([np.asarray(scenarios[name], dtype=float)[:, :T, :J].reshape(n, -1)
+                           for name in SCENARIO_ARRAYS], axis=1)
+
+
+### 최적화 파트
+def build_saa_model(data, params=None, scenarios=None, probabilities=None):
+    """Extensive form of the SAA as a :class:`~robust_bidding.sparse.SparseModel`.
+
+    Columns are the first stage (``blocks``) followed by one real-time
+    block per scenario, named ``K<k>-<family>_t_j_s``.
+    """
+    from scipy.sparse import bmat, csr_matrix
+
+    p = params if params is not None else BiddingParameters()
+    u = _realizations(scenarios, p)
+    K = len(u)
+    q = np.full(K, 1.0 / K) if probabilities is None else np.asarray(probabilities, dtype=float)
+    if q.shape != (K,):
+        raise ValueError("probabilities must have %d entries, got shape %s" % (K, q.shape))
+
+    base = build_sparse_model(data, p.replace(uncertainty="box", tighten_bounds=False))
+    cols, rows = first_stage(base)
+    nx = len(cols)
+    position = np.full(base.shape[1], -1)
+    position[cols] = np.arange(nx)
+    blocks = {name: position[index] for name, index in base.blocks.items() if name not in SECOND_STAGE}
+    recourse = Recourse(data, p, blocks, nx, shortfall_penalty(data, p))
+    m, ny = recourse.shape
+
+    A = base.matrix()[rows][:, cols]
+    grid = [[A] + [csr_matrix((A.shape[0], ny))] * K]
+    lo, hi = [base.row_lo[rows]], [base.row_hi[rows]]
+    for k in range(K):
+        grid.append([recourse.X] + [recourse.Y if i == k else None for i in range(K)])
+        rlo, rhi = recourse.rhs(np.zeros(nx), u[k])
+        lo.append(rlo)
+        hi.append(rhi)
+    names = [base.names[k] for k in cols]
+    for k in range(K):
+        names += ["K%d-%s" % (k + 1, name) for name in recourse.names]
+    kept = np.zeros(base.shape[0], dtype=bool)
+    kept[rows] = True
+    kept = np.concatenate(([0], np.cumsum(kept)))
+    families = [(label, int(kept[a]), int(kept[b])) for label, a, b in base.families if kept[b] > kept[a]]
+    families += [("K%d %s" % (k + 1, label), a + len(rows) + k * m, b + len(rows) + k * m)
+                 for k in range(K) for label, a, b in recourse.families]
+    return SparseModel.from_arrays(
+        p, names, np.concatenate([base.c[cols]] + [q[k] * recourse.c for k in range(K)]),
+        np.concatenate((base.col_lo[cols], np.zeros(K * ny))),
+        np.concatenate((base.col_hi[cols], np.full(K * ny, inf))),
+        np.concatenate((base.binary[cols], np.zeros(K * ny, dtype=bool))),
+        bmat(grid, format="csr"), np.concatenate(lo), np.concatenate(hi), blocks=blocks, families=families)
+
+
+def solve_saa(data, scenarios, params=None, count=None, probabilities=None, solver=None, time_limit=None):
+    """Reduce ``scenarios`` to ``count`` (all when ``None``) and solve the extensive form; returns a :class:`SAAResult`.
+
+    ``solver(sparse, time_limit)`` returns ``(status, objective, x)``
+    (:func:`~robust_bidding.solvers.make_solver` by default).  Raises
+    ``RuntimeError`` when the extensive form has no solution.
+    """
+    p = params if params is not None else BiddingParameters()
+    solver = solver if solver is not None else make_solver()
+    begin = time.perf_counter()
+    if count is not None and count < len(scenarios["P_UR"]):
+        scenarios, probabilities = reduce_scenarios(scenarios, count, probabilities)
+    elif probabilities is not None:
+        probabilities = np.asarray(probabilities, dtype=float) / np.sum(probabilities)
+    reduction = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    sparse = build_saa_model(data, p, scenarios, probabilities)
+    status, objective, x = solver(sparse, time_limit)
+    if x is None:
+        raise RuntimeError("SAA: the extensive form has no solution (%s)" % status)
+    K = len(scenarios["P_UR"])
+    q = np.full(K, 1.0 / K) if probabilities is None else probabilities
+    first = {name: x[index] for name, index in sparse.blocks.items()}
+    nx = sum(index.size for index in sparse.blocks.values())
+    day_ahead = float(sparse.c[:nx] @ x[:nx])
+    recourse = (x[nx:].reshape(K, -1) * (sparse.c[nx:].reshape(K, -1) / q[:, None])).sum(axis=1)
+    return SAAResult(status=status, objective=objective, day_ahead=day_ahead, real_time=float(q @ recourse),
+                     seconds=time.perf_counter() - begin, reduction_seconds=reduction, recourse=recourse,
+                     probabilities=q, scenarios=scenarios, first_stage=first)
@@ -0,0 +1,157 @@
+"""Out-of-sample settlement of committed bids over sampled realizations.
+
+The model is paid for the realization it plans with (``P_UR`` / ``P_DR`` /
+``P_RT_WPR`` of 식(61)~(63)).  :func:`settle` instead takes the committed
+day-ahead and reserve bids - the ``solution_arrays`` of a solved model, or
+``CCGResult.first_stage`` - and settles a batch of ``n`` scenarios at once:
+
+* regulation calls are followed pro rata to the reserve bids (식(27), (28),
+  (37), (38)), at most the full reserve; wind deploys up-regulation only
+  from what the realization leaves above its day-ahead schedule;
+* revenue is that of 식(1): day-ahead energy and reserve, plus deployed
+  regulation, less the marginal costs;
+* imbalance is the call the fleet could not follow and the wind missing
+  from the day-ahead schedule, charged at the price of the missing product
+  (``Price_UR`` / ``Price_DR`` / ``Price_DA``) or ``imbalance_price``;
+* ``E_BESS_RT`` follows 식(17)~(19) as a cumulative sum over the intervals
+  and is checked against 식(32).
+
+Scenario arrays are ``(n, time_dim, min_dim)`` (``Price_DA`` / ``Price_RS``
+may be ``(n, time_dim)``); prices that are not given come from ``data``.
+The scenarios are processed ``chunk`` at a time with array operations only.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .params import BiddingParameters
+from .uncertainty import UNCERTAIN, realization_band
+
+### 정산에 필요한 입찰 변수
+BIDS = ("P-DA-CH", "P-DA-DCH", "P-DA-WPR", "P-RS-CH", "P-RS-DCH", "P-RS-WPR", "D-Char", "D-DChar")
+
+
+@dataclass
+class Settlement:
+    """Per-scenario outcome of :func:`settle`, ``(n,)`` arrays."""
+
+    revenue: np.ndarray          # day_ahead + reserve + real_time - imbalance_cost
+    day_ahead: np.ndarray        # day-ahead energy income less its marginal cost
+    reserve: np.ndarray          # reserve capacity income
+    real_time: np.ndarray        # deployed regulation income less its marginal cost
+    imbalance: np.ndarray        # MWh not delivered (calls + wind)
+    imbalance_cost: np.ndarray
+    soc_violation: np.ndarray    # largest E_BESS_RT excursion outside 식(32) (MWh)
+
+    @property
+    def soc_feasible(self):
+        return self.soc_violation <= 1e-6
+
+    def summary(self, alpha=0.05):
+        """Mean / std / ``alpha`` quantile / CVaR of the revenue and the shares of imbalanced / SOC-infeasible scenarios."""
+        revenue = np.sort(self.revenue)
+        tail = revenue[:max(1, int(np.ceil(alpha * len(revenue))))]
+        return {"scenarios": len(revenue), "mean": float(revenue.mean()), "std": float(revenue.std()),
+                "quantile": float(tail[-1]), "cvar": float(tail.mean()),
+                "imbalance_mean": float(self.imbalance.mean()), "imbalanced": float((self.imbalance > 1e-6).mean()),
+                "soc_feasible": float(self.soc_feasible.mean())}
+
+
+def _scenario_price(scenarios, data, name, T, J, rows):
+    """Price of the scenarios ``rows`` as ``(m, T*J)``, or ``(1, T*J)`` from ``data`` when not sampled."""
+    value = scenarios.get(name)
+    if value is None:
+        return np.asarray(getattr(data, name), dtype=float)[:T, :J].reshape(1, -1)
+    value = np.asarray(value[rows], dtype=float)
+    value = np.broadcast_to(value[:, :T, None], (len(value), T, J)) if value.ndim == 2 else value[:, :T, :J]
+    return value.reshape(len(value), -1)
+
+
+def settle(bids, scenarios, data, params=None, chunk=4096, imbalance_price=None):
+    """Settle ``bids`` (family -> array, see :data:`BIDS`) for every scenario; returns a :class:`Settlement`.
+
+    ``scenarios`` maps ``P_UR`` / ``P_DR`` / ``P_RT_WPR`` and optionally
+    ``Price_DA`` / ``Price_RS`` / ``Price_UR`` / ``Price_DR`` to arrays with
+    the scenarios on the first axis.
+    """
+    p = params if params is not None else BiddingParameters()
+    T, J, del_S = p.time_dim, p.min_dim, p.del_S
+    K = T * J
+    MC_CH, MC_DCH, MC_WPR = p.Marginal_cost_CH, p.Marginal_cost_DCH, p.Marginal_cost_WPR
+
+    def x(name):   # (k, s|w); hourly 입찰 변수 (t, s|w) 는 j 축으로 broadcast
+        value = np.asarray(bids[name], dtype=float)
+        value = value if value.ndim == 3 else np.broadcast_to(value[:, None, :], (T, J, value.shape[1]))
+        return value.reshape(K, -1)
+
+    CH, DCH, DA_WPR = x("P-DA-CH"), x("P-DA-DCH"), x("P-DA-WPR")
+    RS_CH, RS_DCH, RS_WPR = x("P-RS-CH"), x("P-RS-DCH"), x("P-RS-WPR")
+    on = np.clip(np.round(x("D-Char") + x("D-DChar")), 0, 1)
+    E_lo, E_hi = np.asarray(p.E_min_BESS, dtype=float) * on, np.asarray(p.E_max_BESS, dtype=float) * on
+    E_DA = np.asarray(p.initial_energy) + del_S * np.cumsum(CH - DCH, axis=0)   # 식(17)~(18) DA, (k, s)
+    up_cap = RS_DCH.sum(axis=1) + RS_WPR.sum(axis=1)                              # (k,)
+    down_cap = RS_CH.sum(axis=1) + RS_WPR.sum(axis=1)
+    share = lambda call, cap: np.divide(np.minimum(call, cap), cap, out=np.zeros_like(call), where=cap > 0)
+
+    n = len(scenarios["P_UR"])
+    out = {name: np.empty(n) for name in Settlement.__dataclass_fields__}
+    for a in range(0, n, chunk):
+        rows = slice(a, min(a + chunk, n))
+        m = rows.stop - a
+        call_up = np.asarray(scenarios["P_UR"][rows], dtype=float)[:, :T, :J].reshape(m, K)
+        call_down = np.asarray(scenarios["P_DR"][rows], dtype=float)[:, :T, :J].reshape(m, K)
+        wind = np.asarray(scenarios["P_RT_WPR"][rows], dtype=float)[:, :T, :J].reshape(m, K, 1)
+        price = {name: _scenario_price(scenarios, data, name, T, J, rows)
+                 for name in ("Price_DA", "Price_RS", "Price_UR", "Price_DR")}
+
+        ### 예비력 비례 배분 - 식(27), (28), (37), (38); BESS 는 합계만 (SOC 제외)
+        up, down = share(call_up, up_cap), share(call_down, down_cap)             # (m, k)
+        UR_DCH, DR_CH = up * RS_DCH.sum(axis=1), down * RS_CH.sum(axis=1)
+        UR_WPR = np.minimum(up[:, :, None] * RS_WPR, np.maximum(wind - DA_WPR, 0)).sum(axis=2)
+        DR_WPR = np.minimum(down[:, :, None] * RS_WPR, np.minimum(wind, DA_WPR)).sum(axis=2)
+        wind_short = np.maximum(DA_WPR - wind, 0).sum(axis=2)
+        short_up, short_down = call_up - UR_DCH - UR_WPR, call_down - DR_CH - DR_WPR
+
+        ### 식(17)~(19) RT, 식(32) - (m, k, s)
+        E_RT = np.cumsum(down[:, :, None] * (del_S * RS_CH) - up[:, :, None] * (del_S * RS_DCH), axis=1)
+        E_RT += E_DA
+        out["soc_violation"][rows] = np.maximum((E_RT - E_hi).max(axis=(1, 2)), (E_lo - E_RT).max(axis=(1, 2))).clip(0)
+
+        ### 식(1) 수익
+        da = price["Price_DA"]
+        out["day_ahead"][rows] = del_S * ((da - MC_DCH) * DCH.sum(axis=1) - (da + MC_CH) * CH.sum(axis=1)
+                                          + (da - MC_WPR) * DA_WPR.sum(axis=1)).sum(axis=1)
+        out["reserve"][rows] = del_S * (price["Price_RS"] * (RS_CH.sum(axis=1) + RS_DCH.sum(axis=1)
+                                                             + RS_WPR.sum(axis=1))).sum(axis=1)
+        out["real_time"][rows] = del_S * ((price["Price_UR"] - MC_DCH) * UR_DCH + (price["Price_UR"] - MC_WPR) * UR_WPR
+                                          + (price["Price_DR"] - MC_CH) * DR_CH + price["Price_DR"] * DR_WPR).sum(axis=1)
+        out["imbalance"][rows] = del_S * (short_up + short_down + wind_short).sum(axis=1)
+        if imbalance_price is None:
+            cost = price["Price_UR"] * short_up + price["Price_DR"] * short_down + da * wind_short
+        else:
+            cost = imbalance_price * (short_up + short_down + wind_short)
+        out["imbalance_cost"][rows] = del_S * cost.sum(axis=1)
+    out["revenue"] = out["day_ahead"] + out["reserve"] + out["real_time"] - out["imbalance_cost"]
+    return Settlement(**out)
+
+
+def sample_scenarios(data, params=None, n=1000, seed=None, price_sigma=0.0, dtype=np.float32):
+    """``n`` realizations drawn uniformly within the 식(61)~(63) box, ``(n, time_dim, min_dim)`` arrays.
+
+    With ``price_sigma > 0`` the regulation prices are scaled by a
+    lognormal factor per scenario and interval as well.
+    """
+    p = params if params is not None else BiddingParameters()
+    T, J = p.time_dim, p.min_dim
+    rng = np.random.default_rng(seed)
+    expected = {name: np.asarray(getattr(data, arrays[0]), dtype=float)[:T, :J] for name, arrays in UNCERTAIN.items()}
+    band = realization_band(expected, None, p.replace(uncertainty="box"))
+    out = {}
+    for name, (lo, hi) in band.items():
+        lo, hi = np.maximum(lo, 0).astype(dtype), np.maximum(hi, 0).astype(dtype)
+        out[name.replace("-", "_")] = lo + (hi - lo) * rng.random((n, T, J), dtype=dtype)
+    if price_sigma > 0:
+        for name in ("Price_UR", "Price_DR"):
+            grid = np.asarray(getattr(data, name), dtype=dtype)[:T, :J]
+            out[name] = grid * rng.lognormal(0, price_sigma, (n, T, J)).astype(dtype)
+    return out
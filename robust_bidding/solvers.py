@@ -0,0 +1,417 @@
+"""Solver backends for a :class:`~robust_bidding.sparse.SparseModel`.
+
+The scripts solve through docplex (``Model``, ``mdl.solve``); the CPLEX
+Community Edition stops at :data:`CE_LIMIT` variables or constraints.
+:func:`solve` hands the same model to
+
+* ``"cplex"`` - the CPLEX callable library (:func:`~robust_bidding.sparse.to_cplex`);
+* ``"highs"`` - HiGHS through ``highspy`` (:func:`highs_model`;
+  ``pip install robust-bidding[highs]``);
+* ``"cbc"`` - the ``cbc`` executable on a free MPS file (:func:`write_mps`);
+
+and returns a :class:`SolveResult` with a normalized :data:`STATUSES`
+status, objective, bound, gap and the values per variable family.
+``start`` submits a MIP start (:mod:`~robust_bidding.warmstart`); the
+result then tells whether it became the first incumbent and, with or
+without a start, how long the first incumbent took.  ``telemetry``
+(:class:`~robust_bidding.telemetry.Telemetry`) receives the incumbent, best
+bound, gap and node count from the CPLEX and HiGHS callbacks.
+``backend="auto"`` (:func:`select_backend`) keeps CPLEX when it is
+licensed for the model's size and otherwise falls back to HiGHS, then CBC.
+:func:`make_solver` wraps :func:`solve` as the ``solver(sparse, time_limit)``
+callable of :mod:`~robust_bidding.ccg` and :mod:`~robust_bidding.saa`.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+### 솔버 백엔드
+SOLVER_BACKENDS = ("auto", "cplex", "highs", "cbc")
+
+### 정규화된 풀이 상태
+STATUSES = (
+    "optimal",      # proven optimal within the gap tolerance
+    "feasible",     # stopped (time limit, ...) with a solution
+    "infeasible",
+    "unbounded",
+    "unknown",      # stopped without a solution, or a solver error
+)
+
+CE_LIMIT = 1000   # CPLEX Community Edition - 변수, 제약 각각의 최대 개수
+
+
+@dataclass
+class SolveResult:
+    """Outcome of :func:`solve`, the same for every backend."""
+
+    backend: str
+    status: str                  # one of STATUSES
+    solver_status: str           # the backend's own status text
+    objective: float             # None without a solution
+    bound: float                 # best bound (= objective for a solved LP), None if unknown
+    gap: float                   # relative gap, None if unknown
+    seconds: float
+    x: np.ndarray = field(default=None, repr=False)               # values in column order
+    arrays: dict = field(default_factory=dict, repr=False)        # family -> values shaped like sparse.blocks
+    start: str = None            # warmstart.START_STATUSES of the MIP start, None without one
+    first_incumbent: float = None   # seconds to the first feasible solution, None if unknown
+
+    @property
+    def solved(self):
+        return self.x is not None
+
+
+@lru_cache(maxsize=None)
+def cplex_edition():
+    """``"full"``, ``"community"`` (:data:`CE_LIMIT`) or ``None`` without the ``cplex`` module."""
+    try:
+        import cplex
+        from cplex.exceptions import CplexSolverError
+    except ImportError:
+        return None
+    cpx = cplex.Cplex()
+    for stream in (cpx.set_log_stream, cpx.set_results_stream, cpx.set_warning_stream, cpx.set_error_stream):
+        stream(None)
+    cpx.variables.add(lb=[0] * (CE_LIMIT + 1))
+    try:
+        cpx.solve()
+    except CplexSolverError:   # 1016: Community Edition 한도 초과
+        return "community"
+    return "full"
+
+
+def _has_highs():
+    try:
+        import highspy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_backends():
+    """Backends usable on this machine, in :func:`select_backend` order."""
+    out = ["cplex"] if cplex_edition() is not None else []
+    if _has_highs():
+        out.append("highs")
+    if shutil.which("cbc"):
+        out.append("cbc")
+    return out
+
+
+def select_backend(sparse):
+    """CPLEX when licensed for ``sparse``, else HiGHS, else CBC, else the size-limited CPLEX."""
+    edition = cplex_edition()
+    if edition == "full" or (edition == "community" and max(sparse.shape) <= CE_LIMIT):
+        return "cplex"
+    if _has_highs():
+        return "highs"
+    if shutil.which("cbc"):
+        return "cbc"
+    if edition == "community":
+        return "cplex"
+    raise RuntimeError("no MILP solver available: install cplex, highspy or cbc")
+
+
+def solve(sparse, backend="auto", time_limit=None, mipgap=None, threads=None, start=None, effort="auto",
+          telemetry=None, on_incumbent=None, stop=None):
+    """Solve ``sparse`` (maximize) with ``backend``; returns a :class:`SolveResult`.
+
+    ``mipgap`` defaults to ``sparse.params.mipgap``.  ``start`` is any source
+    of :func:`~robust_bidding.warmstart.start_arrays` and ``effort`` one of
+    :data:`~robust_bidding.warmstart.START_EFFORTS` (CPLEX only).
+    ``telemetry`` records the solve progress (not for CBC).
+    During a MIP search (not for CBC) ``on_incumbent(objective, x)`` is called
+    with every improving incumbent and ``stop(objective, bound)`` with the
+    progress (``objective`` ``None`` before the first incumbent); a true
+    return of ``stop`` ends the search with the incumbent so far.
+    """
+    from .warmstart import START_EFFORTS, start_arrays, start_columns
+
+    if backend not in SOLVER_BACKENDS:
+        raise ValueError("backend must be one of %s, got %r" % (", ".join(SOLVER_BACKENDS), backend))
+    if effort not in START_EFFORTS:
+        raise ValueError("effort must be one of %s, got %r" % (", ".join(START_EFFORTS), effort))
+    if backend == "auto":
+        backend = select_backend(sparse)
+    mipgap = sparse.params.mipgap if mipgap is None else mipgap
+    if start is not None:
+        start = start_columns(sparse, start_arrays(start))
+        start = start if len(start[0]) and sparse.binary.any() else None
+    begin = time.perf_counter()
+    result = {"cplex": _solve_cplex, "highs": _solve_highs, "cbc": _solve_cbc}[backend](
+        sparse, time_limit, mipgap, threads, start, effort, telemetry, on_incumbent, stop)
+    result.seconds = time.perf_counter() - begin
+    if telemetry is not None:   # 최종 상태
+        telemetry.progress(result.objective, result.bound, result.gap, force=True)
+    if result.x is not None and result.first_incumbent is None:   # 콜백 전에 끝난 풀이
+        result.first_incumbent = result.seconds
+    if result.x is not None:
+        result.arrays = {name: result.x[index] for name, index in sparse.blocks.items()}
+    return result
+
+
+def make_solver(backend="auto", **options):
+    """``solver(sparse, time_limit) -> (status, objective, x)`` through :func:`solve` (``options`` as its keywords)."""
+    def solver(sparse, time_limit=None):
+        result = solve(sparse, backend, time_limit, **options)
+        return result.status, result.objective, result.x
+    return solver
+
+
+### CPLEX
+class _Progress(object):
+    """Global-progress callback: time and values of the first incumbent, telemetry, ``on_incumbent`` and ``stop``.
+
+    Only the global-progress context is registered - a candidate callback
+    would make CPLEX treat the model as having lazy constraints and turn
+    off dual presolve reductions, so warm and cold runs would differ in more
+    than the start.  A new incumbent shows as a change of the best objective.
+    """
+
+    def __init__(self, telemetry=None, on_incumbent=None, stop=None):
+        self.begin, self.first, self.incumbent = time.perf_counter(), None, None
+        self.telemetry, self.on_incumbent, self.stop = telemetry, on_incumbent, stop
+        self.best = None
+
+    def invoke(self, context):
+        from cplex.callbacks import Context
+
+        feasible = context.get_int_info(Context.info.feasible)
+        objective = context.get_double_info(Context.info.best_solution) if feasible else None
+        bound = context.get_double_info(Context.info.best_bound)
+        if self.first is None and feasible:
+            self.first = time.perf_counter() - self.begin
+            self.incumbent = np.asarray(context.get_incumbent())
+        if self.on_incumbent is not None and feasible and objective != self.best:
+            self.best = objective
+            self.on_incumbent(objective, np.asarray(context.get_incumbent()))
+        if self.telemetry is not None:
+            self.telemetry.progress(objective, bound, nodes=context.get_long_info(Context.info.node_count))
+        if self.stop is not None and self.stop(objective, bound):
+            context.abort()
+
+
+def _solve_cplex(sparse, time_limit, mipgap, threads, start=None, effort="auto", telemetry=None, on_incumbent=None,
+                 stop=None):
+    import cplex
+    from cplex.callbacks import Context
+
+    from .sparse import to_cplex
+
+    cpx = to_cplex(sparse)
+    for stream in (cpx.set_log_stream, cpx.set_results_stream, cpx.set_warning_stream, cpx.set_error_stream):
+        stream(None)
+    cpx.parameters.mip.tolerances.mipgap.set(mipgap)
+    if time_limit is not None:
+        cpx.parameters.timelimit.set(max(time_limit, 0))
+    if threads is not None:
+        cpx.parameters.threads.set(threads)
+    incumbents = None
+    if not sparse.binary.any():
+        cpx.set_problem_type(cpx.problem_type.LP)
+    else:
+        if start is not None:
+            level = {"auto": "auto", "check": "check_feasibility", "fixed": "solve_fixed", "mip": "solve_MIP",
+                     "repair": "repair", "none": "no_check"}[effort]
+            cpx.MIP_starts.add(cplex.SparsePair(ind=start[0].tolist(), val=start[1].tolist()),
+                               getattr(cpx.MIP_starts.effort_level, level))
+        incumbents = _Progress(telemetry, on_incumbent, stop)
+        cpx.set_callback(incumbents, Context.id.global_progress)
+    cpx.solve()
+    s = cpx.solution
+    code, text = s.get_status(), s.get_status_string()
+    if code in (s.status.optimal, s.status.MIP_optimal, s.status.optimal_tolerance):
+        status = "optimal"
+    elif code in (s.status.infeasible, s.status.MIP_infeasible, s.status.infeasible_or_unbounded,
+                  s.status.MIP_infeasible_or_unbounded):
+        status = "infeasible"
+    elif code in (s.status.unbounded, s.status.MIP_unbounded):
+        status = "unbounded"
+    else:
+        status = "feasible" if s.is_primal_feasible() else "unknown"
+    out = SolveResult("cplex", status, text, None, None, None, 0.0)
+    if incumbents is not None:
+        out.first_incumbent = incumbents.first
+        if start is not None:   # 첫 해가 시작해의 정수 값을 그대로 가지면 채택 (HiGHS 와 같은 판정)
+            first = incumbents.incumbent
+            out.start = "accepted" if first is not None and np.allclose(first[start[0]], start[1], atol=1e-6) else "rejected"
+    if s.is_primal_feasible():
+        out.objective, out.x = s.get_objective_value(), np.asarray(s.get_values())
+        if sparse.binary.any():
+            out.bound, out.gap = s.MIP.get_best_objective(), s.MIP.get_mip_relative_gap()
+        elif status == "optimal":
+            out.bound, out.gap = out.objective, 0.0
+    return out
+
+
+### HiGHS
+def highs_model(sparse, time_limit=None, relax=False, threads=None):
+    """A ``highspy.Highs`` loaded with ``sparse`` (``relax=True`` drops integrality)."""
+    import highspy
+
+    A = sparse.matrix().tocsc()
+    lp = highspy.HighsLp()
+    lp.num_col_, lp.num_row_ = sparse.shape[1], sparse.shape[0]
+    lp.sense_ = highspy.ObjSense.kMaximize
+    lp.col_cost_ = sparse.c
+    lp.col_lower_, lp.col_upper_ = np.maximum(sparse.col_lo, -highspy.kHighsInf), np.minimum(sparse.col_hi, highspy.kHighsInf)
+    lp.row_lower_ = np.maximum(sparse.row_lo, -highspy.kHighsInf)
+    lp.row_upper_ = np.minimum(sparse.row_hi, highspy.kHighsInf)
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_, lp.a_matrix_.index_, lp.a_matrix_.value_ = A.indptr, A.indices, A.data
+    if not relax and sparse.binary.any():
+        lp.integrality_ = [highspy.HighsVarType.kInteger if b else highspy.HighsVarType.kContinuous
+                           for b in sparse.binary]
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    if time_limit is not None:
+        h.setOptionValue("time_limit", float(time_limit))
+    if threads is not None:
+        h.setOptionValue("threads", int(threads))
+    h.setOptionValue("mip_rel_gap", sparse.params.mipgap)
+    h.passModel(lp)
+    return h
+
+
+def _solve_highs(sparse, time_limit, mipgap, threads, start=None, effort="auto", telemetry=None, on_incumbent=None,
+                 stop=None):
+    import highspy
+
+    h = highs_model(sparse, None if time_limit is None else max(time_limit, 0), threads=threads)
+    h.setOptionValue("mip_rel_gap", mipgap)
+    incumbents = []   # (seconds, solution) - 개선된 해마다
+    if sparse.binary.any():
+        if start is not None:   # 부분 해: HiGHS 가 나머지 변수를 채움
+            h.setSolution(len(start[0]), start[0].astype(np.int32), start[1].astype(float))
+        begin = time.perf_counter()
+
+        def improved(event):
+            incumbents.append((time.perf_counter() - begin, np.array(event.data_out.mip_solution)))
+            if on_incumbent is not None:
+                on_incumbent(event.data_out.objective_function_value, incumbents[-1][1])
+
+        h.cbMipImprovingSolution.subscribe(improved)
+        if telemetry is not None:   # 주기적으로 불리는 인터럽트 콜백에서 상태 기록
+            h.cbMipInterrupt.subscribe(lambda event: telemetry.progress(
+                event.data_out.mip_primal_bound, event.data_out.mip_dual_bound, nodes=event.data_out.mip_node_count))
+        if stop is not None:   # 해가 없을 때 primal bound 는 -inf
+            h.cbMipInterrupt.subscribe(lambda event: setattr(event.data_in, "user_interrupt", bool(stop(
+                event.data_out.mip_primal_bound if incumbents else None, event.data_out.mip_dual_bound))))
+    h.run()
+    model_status, info = h.getModelStatus(), h.getInfo()
+    feasible = info.primal_solution_status == 2   # kSolutionStatusFeasible
+    status = {highspy.HighsModelStatus.kOptimal: "optimal",
+              highspy.HighsModelStatus.kInfeasible: "infeasible",
+              highspy.HighsModelStatus.kUnboundedOrInfeasible: "infeasible",
+              highspy.HighsModelStatus.kUnbounded: "unbounded"}.get(model_status, "feasible" if feasible else "unknown")
+    out = SolveResult("highs", status, h.modelStatusToString(model_status), None, None, None, 0.0)
+    if incumbents:
+        out.first_incumbent = incumbents[0][0]
+    if start is not None:   # 첫 해가 시작해의 정수 값을 그대로 가지면 채택
+        first = incumbents[0][1] if incumbents else None
+        out.start = "accepted" if first is not None and np.allclose(first[start[0]], start[1], atol=1e-6) else "rejected"
+    if feasible:
+        out.objective, out.x = info.objective_function_value, np.asarray(h.getSolution().col_value)
+        if sparse.binary.any():
+            out.bound, out.gap = info.mip_dual_bound, info.mip_gap
+        elif status == "optimal":
+            out.bound, out.gap = out.objective, 0.0
+    return out
+
+
+### CBC (MPS 파일)
+def write_mps(sparse, path, name="ROBUST"):
+    """Write ``sparse`` as free MPS, minimizing ``-c'x``; columns ``C<k>``, rows ``R<i>`` (0-based)."""
+    A = sparse.matrix().tocsc()
+    lo, hi = sparse.row_lo, sparse.row_hi
+    finite_lo, finite_hi = np.isfinite(lo), np.isfinite(hi)
+    free = ~finite_lo & ~finite_hi   # 제약 없는 행은 생략
+    kind = np.where(finite_lo & finite_hi, np.where(lo == hi, "E", "G"), np.where(finite_hi, "L", "G"))
+    lines = ["NAME %s" % name, "ROWS", " N OBJ"]
+    lines += [" %s R%d" % (kind[i], i) for i in np.flatnonzero(~free)]
+    lines.append("COLUMNS")
+    integer = False
+    for k in range(sparse.shape[1]):
+        if sparse.binary[k] != integer:
+            integer = bool(sparse.binary[k])
+            lines.append(" MARKER 'MARKER' %s" % ("'INTORG'" if integer else "'INTEND'"))
+        if sparse.c[k]:
+            lines.append(" C%d OBJ %.17g" % (k, -sparse.c[k]))
+        for i, value in zip(A.indices[A.indptr[k]:A.indptr[k + 1]], A.data[A.indptr[k]:A.indptr[k + 1]]):
+            if not free[i]:
+                lines.append(" C%d R%d %.17g" % (k, i, value))
+    if integer:
+        lines.append(" MARKER 'MARKER' 'INTEND'")
+    lines.append("RHS")
+    rhs = np.where(finite_lo, lo, hi)
+    lines += [" RHS R%d %.17g" % (i, rhs[i]) for i in np.flatnonzero(~free & (rhs != 0))]
+    ranged = np.flatnonzero(finite_lo & finite_hi & (lo != hi))
+    if len(ranged):
+        lines.append("RANGES")
+        lines += [" RNG R%d %.17g" % (i, hi[i] - lo[i]) for i in ranged]
+    lines.append("BOUNDS")
+    for k in range(sparse.shape[1]):
+        a, b = sparse.col_lo[k], sparse.col_hi[k]
+        if sparse.binary[k]:
+            lines.append(" BV BND C%d" % k)
+        elif np.isinf(a) and np.isinf(b):
+            lines.append(" FR BND C%d" % k)
+        else:
+            if np.isinf(a):
+                lines.append(" MI BND C%d" % k)
+            elif a != 0:
+                lines.append(" LO BND C%d %.17g" % (k, a))
+            if np.isfinite(b):
+                lines.append(" UP BND C%d %.17g" % (k, b))
+    lines.append("ENDATA")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def _solve_cbc(sparse, time_limit, mipgap, threads, start=None, effort="auto", telemetry=None, on_incumbent=None,
+               stop=None):
+    executable = shutil.which("cbc")
+    if executable is None:
+        raise RuntimeError("backend='cbc' needs the cbc executable on PATH")
+    with tempfile.TemporaryDirectory() as tmp:
+        model, solution = os.path.join(tmp, "model.mps"), os.path.join(tmp, "solution.txt")
+        write_mps(sparse, model)
+        command = [executable, model, "-ratioGap", str(mipgap)]
+        if time_limit is not None:
+            command += ["-seconds", str(max(time_limit, 0))]
+        if threads is not None:
+            command += ["-threads", str(threads)]
+        if start is not None:   # 해 파일 형식의 MIP start
+            mipstart = os.path.join(tmp, "start.txt")
+            with open(mipstart, "w") as f:
+                f.write("Stopped on iterations - objective value 0\n")
+                f.writelines("%d C%d %.17g\n" % (k, k, value) for k, value in zip(*start))
+            command += ["-mipstart", mipstart]
+        subprocess.run(command + ["-solve", "-solution", solution], check=True, capture_output=True)
+        with open(solution) as f:
+            header, *rows = f.read().splitlines()
+    text = header.split(" - ")[0].strip()
+    lowered = header.lower()
+    x = np.zeros(sparse.shape[1])
+    for row in rows:   # [**] index name value reduced_cost
+        tokens = row.replace("**", " ").split()
+        if len(tokens) >= 3 and tokens[1].startswith("C"):
+            x[int(tokens[1][1:])] = float(tokens[2])
+    if lowered.startswith("optimal"):
+        status = "optimal"
+    elif "infeasible" in lowered:
+        status = "infeasible"
+    elif "unbounded" in lowered:
+        status = "unbounded"
+    else:
+        status = "feasible" if "objective value" in lowered and rows else "unknown"
+    out = SolveResult("cbc", status, text, None, None, None, 0.0, start=None if start is None else "unknown")
+    if status in ("optimal", "feasible"):
+        out.objective, out.x = -float(header.split()[-1]), x   # 한계와 갭은 해 파일에 없음
+    return out
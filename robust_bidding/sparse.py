@@ -0,0 +1,564 @@
+"""Vectorized (sparse-matrix) builder for the robust bidding model.
+
+:func:`~robust_bidding.model.build_optimization_model` creates one docplex
+expression per row through nested generator expressions.  Here every variable
+family is a contiguous block of columns (an index array shaped like its
+``(t, j, s)`` / ``(t, j, w)`` / ``(t, j)`` / ``(t,)`` domain) and every
+constraint family is emitted as NumPy COO triplets in a handful of array
+operations.  The result, a :class:`SparseModel`, is solver neutral;
+:func:`to_docplex` hands it to docplex with one ``matrix_constraints`` call
+per constraint sense and :func:`to_cplex` loads it into the CPLEX callable
+library with a single ``linear_constraints.add``.
+
+The rows are those of ``build_optimization_model`` (same variables, names,
+bounds, objective and coefficients) so both builders produce the same MILP.
+Within the SOC recursion and ramp families the ``t >= 1, j >= 2`` and
+``t >= 2, j = 1`` cases are emitted together over the flattened interval
+axis ``k = (t-1)*min_dim + (j-1)``, so the row *order* differs.  In the
+``hourly`` bid mode (see :data:`~robust_bidding.params.HOURLY_BID_MODES`) the
+rows that become duplicates or constants are removed by
+:meth:`SparseModel.compact`.
+"""
+import time
+import tracemalloc
+from math import inf
+
+import numpy as np
+
+from .bounds import variable_bounds, wpr_big_m
+from .params import HOURLY_BID_MODES, TERMINAL_SOC_MODES, BiddingParameters
+from .symmetry import ordered_pairs
+from .uncertainty import (UNCERTAIN, budget_groups, budget_weights, check_uncertainty, deviation_arrays,
+                          realization_band, relative_deviation, reserve_cover)
+
+
+class ColumnLayout(object):
+    """Variable blocks laid out as contiguous column ranges."""
+
+    def __init__(self):
+        self.size = 0
+        self.blocks = {}                 # name -> index array shaped like the domain
+        self._names, self._lb, self._ub, self._binary = [], [], [], []
+
+    def add(self, name, shape, lb=0, ub=inf, binary=False):
+        """Allocate ``prod(shape)`` columns named ``name_t_j_s`` (1-based).
+
+        ``lb`` / ``ub`` broadcast against ``shape``.
+        """
+        shape = tuple(shape)
+        count = int(np.prod(shape))
+        index = np.arange(self.size, self.size + count).reshape(shape)
+        self.size += count
+        self.blocks[name] = index
+        self._names += ["_".join([name] + [str(k + 1) for k in key]) for key in np.ndindex(*shape)]
+        self._lb.append(np.broadcast_to(np.asarray(0 if binary else lb, dtype=float), shape).ravel())
+        self._ub.append(np.broadcast_to(np.asarray(1 if binary else ub, dtype=float), shape).ravel())
+        self._binary.append(np.full(count, binary))
+        return index
+
+    @property
+    def names(self):
+        return self._names
+
+    @property
+    def lb(self):
+        return np.concatenate(self._lb)
+
+    @property
+    def ub(self):
+        return np.concatenate(self._ub)
+
+    @property
+    def binary(self):
+        return np.concatenate(self._binary)
+
+
+class RowBuilder(object):
+    """Accumulates constraint families as COO triplets ``lo <= A x <= hi``.
+
+    With ``profile=True`` every :meth:`add` also appends
+    ``(label, rows, nnz, seconds, bytes, peak bytes)`` to ``profile``:
+    ``seconds`` runs from the end of the previous family, so it includes the
+    index and coefficient arrays built for the call; ``bytes`` are the
+    triplets and bounds kept; ``peak bytes`` is the ``tracemalloc`` peak
+    above the memory held before the family (``None`` unless tracing).
+    """
+
+    def __init__(self, profile=False):
+        self.size = 0
+        self.families = []               # (label, first row, end row)
+        self.profile = [] if profile else None
+        self._rows, self._cols, self._vals, self._lo, self._hi = [], [], [], [], []
+        self._mark()
+
+    def add(self, label, terms, lo=-inf, hi=inf, shape=None):
+        """Add one family of rows.
+
+        ``terms`` is a sequence of ``(coef, cols)`` pairs.  All ``cols`` arrays
+        share the leading (row) shape - that of the first ``cols`` unless
+        ``shape`` is given; any trailing axes are summed within the row.
+        ``coef`` broadcasts against ``cols``; ``lo``/``hi`` against the row
+        shape.
+        """
+        row_shape = tuple(shape) if shape is not None else np.shape(terms[0][1])
+        for coef, cols in terms:
+            row_shape = np.broadcast_shapes(row_shape, np.shape(cols)[:len(row_shape)])
+        n = int(np.prod(row_shape))
+        first = len(self._rows)
+        row_ids = np.arange(self.size, self.size + n).reshape(row_shape)
+        for coef, cols in terms:
+            cols = np.asarray(cols)
+            cols = np.broadcast_to(cols, row_shape + cols.shape[len(row_shape):])
+            vals = np.broadcast_to(np.asarray(coef, dtype=float), cols.shape)
+            rows = np.broadcast_to(row_ids.reshape(row_shape + (1,) * (cols.ndim - len(row_shape))), cols.shape)
+            self._rows.append(rows.ravel())
+            self._cols.append(cols.ravel())
+            self._vals.append(vals.ravel())
+        self._lo.append(np.broadcast_to(np.asarray(lo, dtype=float), row_shape).ravel())
+        self._hi.append(np.broadcast_to(np.asarray(hi, dtype=float), row_shape).ravel())
+        self.families.append((label, self.size, self.size + n))
+        self.size += n
+        if self.profile is not None:
+            seconds = time.perf_counter() - self._time
+            nnz = sum(a.size for a in self._vals[first:])
+            kept = sum(a.nbytes for a in self._rows[first:] + self._cols[first:] + self._vals[first:])
+            peak = tracemalloc.get_traced_memory()[1] - self._held if tracemalloc.is_tracing() else None
+            self.profile.append((label, n, nnz, seconds, kept + self._lo[-1].nbytes + self._hi[-1].nbytes, peak))
+            self._mark()
+
+    def _mark(self):
+        """Start the time / memory window of the next family."""
+        if self.profile is None:
+            return
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._held = tracemalloc.get_traced_memory()[0]
+        self._time = time.perf_counter()
+
+    def triplets(self):
+        return (np.concatenate(self._rows), np.concatenate(self._cols),
+                np.concatenate(self._vals), np.concatenate(self._lo), np.concatenate(self._hi))
+
+
+class SparseModel(object):
+    """``max c'x  s.t.  row_lo <= A x <= row_hi,  col_lo <= x <= col_hi``.
+
+    ``A`` is kept as COO triplets (``rows``, ``cols``, ``vals``); duplicate
+    entries are summed by :meth:`matrix`.  ``blocks`` maps variable family
+    names to their column index arrays and ``families`` lists
+    ``(label, first row, end row)`` per constraint family.  ``profile`` is
+    :attr:`RowBuilder.profile` of the build (before :meth:`compact`), or
+    ``None``.
+    """
+
+    def __init__(self, layout, rows, c, params):
+        self.params = params
+        self.names = layout.names
+        self.blocks = layout.blocks
+        self.col_lo, self.col_hi, self.binary = layout.lb, layout.ub, layout.binary
+        self.c = c
+        self.rows, self.cols, self.vals, self.row_lo, self.row_hi = rows.triplets()
+        self.families = rows.families
+        self.profile = rows.profile
+        self.shape = (rows.size, layout.size)
+
+    @classmethod
+    def from_arrays(cls, params, names, c, col_lo, col_hi, binary, A, row_lo, row_hi, blocks=None, families=None):
+        """A model of explicit arrays; ``A`` is any ``scipy.sparse`` matrix (see :mod:`robust_bidding.ccg`)."""
+        self = cls.__new__(cls)
+        A = A.tocoo()
+        self.params = params
+        self.names = list(names)
+        self.blocks = blocks if blocks is not None else {}
+        self.col_lo, self.col_hi = np.asarray(col_lo, dtype=float), np.asarray(col_hi, dtype=float)
+        self.binary = np.asarray(binary, dtype=bool)
+        self.c = np.asarray(c, dtype=float)
+        self.rows, self.cols, self.vals = A.row, A.col, A.data
+        self.row_lo, self.row_hi = np.asarray(row_lo, dtype=float), np.asarray(row_hi, dtype=float)
+        self.families = families if families is not None else []
+        self.profile = None
+        self.shape = A.shape
+        return self
+
+    def matrix(self):
+        """``A`` as ``scipy.sparse.csr_matrix`` (explicit zeros removed)."""
+        from scipy.sparse import coo_matrix
+
+        A = coo_matrix((self.vals, (self.rows, self.cols)), shape=self.shape).tocsr()
+        A.eliminate_zeros()
+        return A
+
+    def compact(self):
+        """Drop constant rows that always hold and merge duplicate rows.
+
+        With per-hour columns (``hourly_bids="hourly"``) many (t, j, s) rows
+        become identical within an hour or lose all their terms.  Duplicates
+        keep the first row with the intersection of the bounds.  Returns the
+        number of rows removed.
+        """
+        A = self.matrix()
+        A.sort_indices()
+        lo, hi = self.row_lo.copy(), self.row_hi.copy()
+        keep = np.ones(self.shape[0], dtype=bool)
+        first = {}
+        for i in range(self.shape[0]):
+            a, b = A.indptr[i], A.indptr[i + 1]
+            if a == b:
+                keep[i] = not (lo[i] <= 0 <= hi[i])
+                continue
+            k = first.setdefault((A.indices[a:b].tobytes(), A.data[a:b].tobytes()), i)
+            if k != i:
+                lo[k], hi[k] = max(lo[k], lo[i]), min(hi[k], hi[i])
+                keep[i] = False
+        kept = np.concatenate(([0], np.cumsum(keep)))
+        A = A[keep].tocoo()
+        self.rows, self.cols, self.vals = A.row, A.col, A.data
+        self.row_lo, self.row_hi = lo[keep], hi[keep]
+        self.families = [(label, int(kept[a]), int(kept[b])) for label, a, b in self.families]
+        removed = self.shape[0] - int(keep.sum())
+        self.shape = (int(keep.sum()), self.shape[1])
+        return removed
+
+    def __repr__(self):
+        return "SparseModel(rows=%d, cols=%d, nnz=%d, binary=%d)" % (
+            self.shape[0], self.shape[1], len(self.vals), int(self.binary.sum()))
+
+
+def _hourly_equal(rows, label, x, mode):
+    """x[t,j,k] constant within hour t (식(4)~(6), (12)~(14), (39)~(41))."""
+    T, J, K = x.shape
+    if mode == "pairwise":
+        rows.add(label, [(1, np.broadcast_to(x[:, :, None, :], (T, J, J, K))),
+                         (-1, np.broadcast_to(x[:, None, :, :], (T, J, J, K)))], lo=0, hi=0)
+    elif mode == "chain":
+        rows.add(label, [(1, x[:, 1:]), (-1, x[:, :-1])], lo=0, hi=0)
+
+
+def _flat(x):
+    """(t, j, ...) -> (k, ...) with k = (t-1)*min_dim + (j-1)."""
+    return x.reshape((-1,) + x.shape[2:])
+
+
+### 최적화 파트
+def build_sparse_model(data, params=None, profile=False):
+    """Assemble the v003 formulation as a :class:`SparseModel`.
+
+    ``profile=True`` records rows, nonzeros, time and memory per constraint
+    family in ``sparse.profile`` (see :mod:`robust_bidding.profiling`).
+    """
+    p = params if params is not None else BiddingParameters()
+    T, J, S, W = p.time_dim, p.min_dim, p.BESS_dim, p.WPR_dim
+    del_S = p.del_S
+    MC_CH, MC_DCH, MC_WPR = p.Marginal_cost_CH, p.Marginal_cost_DCH, p.Marginal_cost_WPR
+    P_max = np.asarray(p.P_max_BESS, dtype=float)
+    P_min = np.asarray(p.P_min_BESS, dtype=float)
+    E_min = np.asarray(p.E_min_BESS, dtype=float)
+    E_max = np.asarray(p.E_max_BESS, dtype=float)
+    R_BESS = np.asarray(p.Ramp_rate_BESS, dtype=float) * del_S
+    R_WPR = p.Ramp_rate_WPR * del_S
+    mode = p.hourly_bids
+    if mode not in HOURLY_BID_MODES:
+        raise ValueError("hourly_bids must be one of %s, got %r" % (", ".join(HOURLY_BID_MODES), mode))
+    if p.terminal_soc not in TERMINAL_SOC_MODES:
+        raise ValueError("terminal_soc must be one of %s, got %r" % (", ".join(TERMINAL_SOC_MODES), p.terminal_soc))
+    if p.big_m == "indicator":
+        raise ValueError("big_m='indicator' needs the docplex builder (build_optimization_model)")
+    check_uncertainty(p)
+    if p.uncertainty == "affine":   # 실시간 단계의 아핀 결정 규칙 - affine.py
+        from .affine import build_affine_model
+        return build_affine_model(data, p)
+    budget = p.uncertainty == "budget"
+
+    Price_DA = np.asarray(data.Price_DA, dtype=float)[:T, 0]   # (t,)
+    Price_RS = np.asarray(data.Price_RS, dtype=float)[:T, 0]   # (t,)
+    Price_UR = np.asarray(data.Price_UR, dtype=float)[:T, :J]  # (t, j)
+    Price_DR = np.asarray(data.Price_DR, dtype=float)[:T, :J]
+    expected = {name: np.asarray(getattr(data, arrays[0]), dtype=float)[:T, :J] for name, arrays in UNCERTAIN.items()}
+    deviation = deviation_arrays(data, p) if budget else None   # 식(61)~(63) 편차 Δ
+
+    ### Variables - same families, order and names as build_optimization_model
+    v = ColumnLayout()
+    tjs, tjw = (T, J, S), (T, J, W)
+
+    bounds = variable_bounds(data, p) if p.tighten_bounds else {}
+
+    def bnd(name, hourly=False):
+        """``lb``/``ub`` keywords from :func:`~robust_bidding.bounds.variable_bounds` (j = 1 entry if ``hourly``)."""
+        if name not in bounds:
+            return {}
+        lb, ub = bounds[name]
+        return {"lb": lb[:, 0], "ub": ub[:, 0]} if hourly else {"lb": lb, "ub": ub}
+
+    def bid(name, shape, binary=False):
+        """Hourly-constant family; per (t, k) columns seen as (t, j, k) in ``hourly`` mode."""
+        if mode != "hourly":
+            return v.add(name, shape, binary=binary, **bnd(name))
+        return np.broadcast_to(v.add(name, (T, shape[2]), binary=binary, **bnd(name, hourly=True))[:, None, :], shape)
+
+    P_DA_S, P_DA_B, P_RS = v.add("P-DA-S", (T,), **bnd("P-DA-S")), v.add("P-DA-B", (T,), **bnd("P-DA-B")), v.add("P-RS", (T,), **bnd("P-RS"))
+    P_UR, P_DR = v.add("P-UR", (T, J), **bnd("P-UR")), v.add("P-DR", (T, J), **bnd("P-DR"))
+    P_DA_CH, P_DA_DCH, P_DA_WPR = bid("P-DA-CH", tjs), bid("P-DA-DCH", tjs), bid("P-DA-WPR", tjw)
+    P_UR_DCH, P_UR_WPR = v.add("P-UR-DCH", tjs, **bnd("P-UR-DCH")), v.add("P-UR-WPR", tjw, **bnd("P-UR-WPR"))
+    P_DR_CH, P_DR_WPR = v.add("P-DR-CH", tjs, **bnd("P-DR-CH")), v.add("P-DR-WPR", tjw, **bnd("P-DR-WPR"))
+    P_RS_CH, P_RS_DCH, P_RS_WPR = bid("P-RS-CH", tjs), bid("P-RS-DCH", tjs), bid("P-RS-WPR", tjw)
+    P_SP_WPR = v.add("P-SP-WPR", tjw, **bnd("P-SP-WPR"))   # no constraint uses it (as in the docplex builder)
+    E_BESS_DA, E_BESS_RT = v.add("E-BESS-DA", tjs, **bnd("E-BESS-DA")), v.add("E-BESS-RT", tjs, **bnd("E-BESS-RT"))
+    P_RT_WPR = v.add("P-RT-WPR", tjw, **bnd("P-RT-WPR"))
+    AV_WPR = v.add("AV-WPR", tjw, **bnd("AV-WPR"))
+    AV_RO, AV_RO_DA = v.add("AV-RO", (T,), **bnd("AV-RO")), v.add("AV-RO-DA", (T,), **bnd("AV-RO-DA"))
+    B_t, C_t = v.add("B-t", (T,), **bnd("B-t")), v.add("C-t", (T,), **bnd("C-t"))
+    if budget:   # 식(64) 내부 문제의 쌍대 변수 (uncertainty.py)
+        weights, daily = budget_weights(p)
+        RO_Z = v.add("RO-Z", (int(budget_groups(p).max()),))
+        RO_Q_UR, RO_Q_DR = v.add("RO-Q-UR", (T, J)), v.add("RO-Q-DR", (T, J))
+    D_Char, D_Dchar, D_WPR = bid("D-Char", tjs, binary=True), bid("D-DChar", tjs, binary=True), bid("D-WPR", tjw, binary=True)
+
+    ### Hourly revenue coefficients, shaped to broadcast over (t, j, s|w)
+    da = (Price_DA * del_S)[:, None, None]
+    rs = (Price_RS * del_S)[:, None, None]
+    ur = (Price_UR * del_S)[:, :, None]
+    dr = (Price_DR * del_S)[:, :, None]
+    da_terms = [(da - MC_DCH * del_S, P_DA_DCH), (-da - MC_CH * del_S, P_DA_CH), (da - MC_WPR * del_S, P_DA_WPR),
+                (rs, P_RS_CH), (rs, P_RS_DCH), (rs, P_RS_WPR)]
+    rt_terms = [(ur - MC_DCH * del_S, P_UR_DCH), (ur - MC_WPR * del_S, P_UR_WPR),
+                (dr - MC_CH * del_S, P_DR_CH), (dr, P_DR_WPR)]
+
+    def hourly(terms, sign=1):
+        """Per-hour sums over (j, s|w) as row terms of an hourly family."""
+        return [(sign * np.broadcast_to(coef, cols.shape).reshape(T, -1), cols.reshape(T, -1))
+                for coef, cols in terms]
+
+    ### Objective function - 식(1) / 식(65)
+    c = np.zeros(v.size)
+    for coef, cols in da_terms:
+        np.add.at(c, cols.ravel(), np.broadcast_to(coef, cols.shape).ravel())
+    c[AV_RO] += 1
+    if budget:   # budget_scope="day" - Γ * RO_Z
+        c[RO_Z] -= daily
+
+    r = RowBuilder(profile)
+    ### Robust Optizimation을 위한 변수 (BESS + WPR) - 식(65)
+    if budget:   # 보호항 w[t] * RO_Z[g(t)] + Σ_j (RO_Q_UR + RO_Q_DR)
+        Z = RO_Z[budget_groups(p) - 1]   # (t,)
+        r.add("(65) AV-RO", [(1, AV_RO)] + hourly(rt_terms, -1) + [(weights, Z), (1, RO_Q_UR), (1, RO_Q_DR)], hi=0)
+    else:
+        r.add("(65) AV-RO", [(1, AV_RO)] + hourly(rt_terms, -1), hi=0)
+
+    ### Equality constraints - 식(4) ~ 식(6) + 식(12) ~ 식(14)
+    _hourly_equal(r, "(4)", P_DA_DCH, mode)
+    _hourly_equal(r, "(5)", P_DA_CH, mode)
+    _hourly_equal(r, "(6)", P_DA_WPR, mode)
+    _hourly_equal(r, "(12)", P_RS_CH, mode)
+    _hourly_equal(r, "(13)", P_RS_DCH, mode)
+    _hourly_equal(r, "(14)", P_RS_WPR, mode)
+
+    ### 식(7) ~ 식(11)
+    rows_t = lambda x: x.reshape(T, -1)
+    r.add("(7)", [(1, P_DA_S), (-del_S, rows_t(P_DA_DCH)), (-del_S, rows_t(P_DA_WPR))], lo=0, hi=0)
+    r.add("(8)", [(1, P_DA_B), (-del_S, rows_t(P_DA_CH))], lo=0, hi=0)
+    r.add("(9)", [(1, P_RS), (-del_S, rows_t(P_RS_CH)), (-del_S, rows_t(P_RS_DCH)), (-del_S, rows_t(P_RS_WPR))], lo=0, hi=0)
+    r.add("(10)", [(1, P_UR), (-1, P_UR_DCH), (-1, P_UR_WPR)], lo=0, hi=0)
+    r.add("(11)", [(1, P_DR), (-1, P_DR_CH), (-1, P_DR_WPR)], lo=0, hi=0)
+
+    ### 식(15) ~ 식(16)
+    cover = reserve_cover(expected, deviation, p) if budget else {"P-UR": 0, "P-DR": 0}   # (1 + γρ) * P_UR <= P_RS
+    r.add("(15)", [(1 + cover["P-UR"], P_UR), (-1, np.broadcast_to(P_RS[:, None], (T, J)))], hi=0)
+    r.add("(16)", [(1 + cover["P-DR"], P_DR), (-1, np.broadcast_to(P_RS[:, None], (T, J)))], hi=0)
+
+    ### Constarints of stored energy of BES - 식(17) ~ 식(19), k = 인터벌 순번
+    E_DA, E_RT = _flat(E_BESS_DA), _flat(E_BESS_RT)
+    CH, DCH, DR_CH, UR_DCH = _flat(P_DA_CH), _flat(P_DA_DCH), _flat(P_DR_CH), _flat(P_UR_DCH)
+    r.add("(17)-(18) DA", [(1, E_DA[1:]), (-1, E_DA[:-1]), (-del_S, CH[1:]), (del_S, DCH[1:])], lo=0, hi=0)
+    initial = np.asarray(p.initial_energy)   # (s,)
+    r.add("(17)+(19) DA", [(1, E_DA[0]), (-del_S, CH[0]), (del_S, DCH[0])], lo=initial, hi=initial)
+    if p.terminal_soc == "initial":
+        r.add("(19) DA", [(1, E_DA[-1])], lo=initial, hi=initial)
+    r.add("(17)-(18) RT", [(1, E_RT[1:]), (-1, E_RT[:-1]), (-del_S, CH[1:]), (del_S, DCH[1:]),
+                           (-del_S, DR_CH[1:]), (del_S, UR_DCH[1:])], lo=0, hi=0)
+    r.add("(19) RT", [(1, E_RT[-1]), (-1, E_DA[-1])], lo=0, hi=0)
+    r.add("(17)+(19) RT", [(1, E_RT[0]), (-1, E_DA[0]), (-del_S, DR_CH[0]), (del_S, UR_DCH[0])], lo=0, hi=0)
+
+    ### Constarints of capacity - 식(20) ~ 식(32)
+    r.add("(20)", [(1, P_DA_CH), (-P_max, D_Char)], hi=0)
+    r.add("(20)", [(P_min, D_Char), (-1, P_DA_CH)], hi=0)
+    r.add("(21)", [(1, P_RS_CH), (-P_max, D_Char), (1, P_DA_CH)], hi=0)
+    r.add("(21)", [(1, P_RS_CH)], lo=np.broadcast_to(P_min, tjs))
+    r.add("(22)", [(1, P_DA_CH), (1, P_RS_CH), (-P_max, D_Char)], hi=0)
+    r.add("(23)", [(P_min, D_Char), (-1, P_DA_CH), (1, P_RS_CH)], hi=0)
+    r.add("(24)", [(1, P_DA_DCH), (-P_max, D_Dchar)], hi=0)
+    r.add("(24)", [(P_min, D_Dchar), (-1, P_DA_DCH)], hi=0)
+    r.add("(25)", [(1, P_RS_DCH), (-P_max, D_Dchar), (1, P_DA_DCH)], hi=0)
+    r.add("(25)", [(1, P_RS_DCH)], lo=np.broadcast_to(P_min, tjs))
+    r.add("(27)", [(1, P_DR_CH), (-1, P_RS_CH)], hi=0)
+    r.add("(28)", [(1, P_UR_DCH), (-1, P_RS_DCH)], hi=0)
+    r.add("(30)", [(1, P_DA_DCH), (1, P_RS_DCH), (-P_max, D_Dchar)], hi=0)
+    r.add("(31)", [(P_min, D_Dchar), (-1, P_DA_DCH), (1, P_RS_DCH)], hi=0)
+    r.add("(32) RT", [(E_min, D_Char), (E_min, D_Dchar), (-1, E_BESS_RT)], hi=0)
+    r.add("(32) RT", [(1, E_BESS_RT), (-E_max, D_Char), (-E_max, D_Dchar)], hi=0)
+    r.add("(32) DA", [(E_min, D_Char), (E_min, D_Dchar), (-1, E_BESS_DA)], hi=0)
+    r.add("(32) DA", [(1, E_BESS_DA), (-E_max, D_Char), (-E_max, D_Dchar)], hi=0)
+
+    # Capacity of WPR in the day-ahead planning - 식(33) ~ 식(36)
+    M = wpr_big_m(expected["P-RT-WPR"], p)   # (t, j, w)
+    r.add("(33)", [(1, P_DA_WPR), (-1, P_RT_WPR), (M, D_WPR)], hi=M)
+    r.add("(33)", [(1, P_DA_WPR), (-M, D_WPR)], hi=0)
+    r.add("(33)", [(-M, D_WPR), (-1, P_DA_WPR)], hi=0)
+    r.add("(34)", [(1, P_RS_WPR), (-1, P_RT_WPR), (1, P_DA_WPR), (M, D_WPR)], hi=M)
+    r.add("(34)", [(1, P_RS_WPR), (-M, D_WPR)], hi=0)
+    r.add("(34)", [(-M, D_WPR), (-1, P_RS_WPR)], hi=0)
+    r.add("(35)", [(1, P_DA_WPR), (1, P_RS_WPR), (-1, P_RT_WPR), (M, D_WPR)], hi=M)
+    r.add("(35)", [(1, P_DA_WPR), (1, P_RS_WPR), (-M, D_WPR)], hi=0)
+    r.add("(35)", [(1, P_DA_WPR), (1, P_RS_WPR), (M, D_WPR)], lo=0)
+    r.add("(36)", [(1, P_DA_WPR), (-1, P_RS_WPR)], lo=0)
+
+    # Deployed power of WPR in the regulation service - 식(37) ~ 식(38)
+    r.add("(37)", [(1, P_UR_WPR)], lo=0)
+    r.add("(37)", [(1, P_UR_WPR), (-1, P_RS_WPR)], hi=0)
+    r.add("(38)", [(1, P_DR_WPR)], lo=0)
+    r.add("(38)", [(1, P_DR_WPR), (-1, P_RS_WPR)], hi=0)
+
+    ### Constarints of binary decision Variables - 식(39) ~ 식(42)
+    _hourly_equal(r, "(39)", D_WPR, mode)
+    _hourly_equal(r, "(40)", D_Char, mode)
+    _hourly_equal(r, "(41)", D_Dchar, mode)
+    r.add("(42)", [(1, D_Char), (1, D_Dchar)], lo=0)
+    r.add("(42)", [(1, D_Char), (1, D_Dchar)], hi=1)
+
+    ### 동일 정격 BESS 의 대칭 제거 - 행 (쌍), (t, j) 에 대한 합
+    pairs = ordered_pairs(p)
+    if pairs:
+        a, b = (np.array(units) for units in zip(*pairs))
+        unit = lambda x, units: np.moveaxis(x[:, :, units], 2, 0)   # (pair, t, j)
+        scheduled = (P_DA_CH, P_DA_DCH, P_RS_CH, P_RS_DCH)
+        r.add("symmetry", [(1, unit(x, a)) for x in scheduled] + [(-1, unit(x, b)) for x in scheduled],
+              lo=0, shape=(len(pairs),))
+
+    ### Constarints of ramp-rate - 식(43) ~ 식(57), k >= 2 (t>=1, j>=2 와 t>=2, j=1)
+    RS_CH, RS_DCH = _flat(P_RS_CH), _flat(P_RS_DCH)
+    DA_WPR, RS_WPR = _flat(P_DA_WPR), _flat(P_RS_WPR)
+    for label, terms, R in (("(43)/(53)", [(1, CH[1:]), (-1, CH[:-1])], R_BESS),
+                            ("(44)/(52)", [(1, DCH[1:]), (-1, DCH[:-1])], R_BESS),
+                            ("(47)", [(1, CH[1:]), (1, RS_CH[1:]), (-1, CH[:-1]), (1, RS_CH[:-1])], R_BESS),
+                            ("(48)", [(1, DCH[1:]), (1, RS_DCH[1:]), (-1, DCH[:-1]), (1, RS_DCH[:-1])], R_BESS),
+                            ("(49)/(54)", [(1, DA_WPR[1:]), (-1, DA_WPR[:-1])], R_WPR),
+                            ("(51)", [(1, DA_WPR[1:]), (1, RS_WPR[1:]), (-1, DA_WPR[:-1]), (1, RS_WPR[:-1])], R_WPR)):
+        r.add(label, terms, lo=-R)
+        r.add(label, terms, hi=R)
+    r.add("(45)/(55)", [(1, RS_CH[1:]), (1, RS_CH[:-1])], hi=R_BESS)
+    r.add("(46)/(56)", [(1, RS_DCH[1:]), (1, RS_DCH[:-1])], hi=R_BESS)
+    r.add("(50)/(57)", [(1, RS_WPR[1:]), (1, RS_WPR[:-1])], hi=R_WPR)
+
+    ### Constraints of uncertain parameters-  식(61) ~ 식(63) (uncertainty.realization_band)
+    band = realization_band(expected, deviation, p)
+    r.add("(61)", [(1, P_UR)], lo=band["P-UR"][0])
+    r.add("(61)", [(1, P_UR)], hi=band["P-UR"][1])
+    r.add("(62)", [(1, P_DR)], lo=band["P-DR"][0])
+    r.add("(62)", [(1, P_DR)], hi=band["P-DR"][1])
+    r.add("(63)", [(1, P_RT_WPR)], lo=band["P-RT-WPR"][0][:, :, None])
+    r.add("(63)", [(1, P_RT_WPR)], hi=band["P-RT-WPR"][1][:, :, None])
+
+    ### data for excel - 식(2), 식(3), 전일 수익
+    cost_terms = [(MC_DCH * del_S, P_DA_DCH), (MC_CH * del_S, P_DA_CH), (MC_WPR * del_S, P_DA_WPR),
+                  (MC_DCH * del_S, P_UR_DCH), (MC_CH * del_S, P_DR_CH), (MC_WPR * del_S, P_UR_WPR)]
+    income_terms = [(da, P_DA_DCH), (-da, P_DA_CH), (da, P_DA_WPR), (rs, P_RS_CH), (rs, P_RS_DCH), (rs, P_RS_WPR),
+                    (ur, P_UR_DCH), (ur, P_UR_WPR), (dr, P_DR_CH), (dr, P_DR_WPR)]
+    r.add("AV-RO-DA", [(1, AV_RO_DA)] + hourly(da_terms, -1), lo=0, hi=0)
+    r.add("(2) B-t", [(1, B_t)] + hourly(income_terms, -1), lo=0, hi=0)
+    r.add("(3) C-t", [(1, C_t)] + hourly(cost_terms, -1), lo=0, hi=0)
+
+    ### 식(64) 쌍대 제약 - RO_Q + RO_Z >= ±ρ * 구간 실시간 수익, 행 (t, j)
+    if budget:
+        rho = relative_deviation(expected, deviation)
+        Z = np.broadcast_to(RO_Z[budget_groups(p) - 1][:, None], (T, J))
+        margins = (("RO-UR", RO_Q_UR, rho["P-UR"][:, :, None], rt_terms[:2]), ("RO-DR", RO_Q_DR, rho["P-DR"][:, :, None], rt_terms[2:]))
+        for label, Q, scale, terms in margins:
+            for sign, suffix in ((-1, ""), (1, "-")):
+                r.add(label + suffix, [(1, Q), (1, Z)] + [(sign * scale * coef, cols) for coef, cols in terms], lo=0)
+
+    ### 자원별 수익 >= 0 - 행 (t, s) / (t, w), j 에 대한 합
+    if p.nonnegative_asset_income:
+        per_asset = lambda terms: [(np.broadcast_to(coef, cols.shape).transpose(0, 2, 1), cols.transpose(0, 2, 1))
+                                   for coef, cols in terms]
+        r.add("BESS-DA", per_asset(da_terms[:2] + da_terms[3:5]), lo=0, shape=(T, S))
+        r.add("WPR-DA", per_asset([da_terms[2], da_terms[5]]), lo=0, shape=(T, W))
+        r.add("BESS-RT", per_asset([rt_terms[0], rt_terms[2]]), lo=0, shape=(T, S))
+        r.add("WPR-RT", per_asset([rt_terms[1], rt_terms[3]]), lo=0, shape=(T, W))
+
+    sparse = SparseModel(v, r, c, p)
+    if mode == "hourly":
+        sparse.compact()
+    return sparse
+
+
+def to_docplex(sparse, name='Robust_Optimization_Model'):
+    """Create a docplex model from a :class:`SparseModel`.
+
+    Columns are created with one ``var_list`` call per variable type and the
+    rows with one ``matrix_constraints`` call per sense (``le``, ``ge``,
+    ``eq``; ``matrix_ranges`` for two-sided rows).
+    """
+    from docplex.mp.advmodel import AdvModel
+
+    mdl = AdvModel(name=name, checker='off')
+    mdl.parameters.mip.tolerances.mipgap = sparse.params.mipgap
+
+    names = np.asarray(sparse.names, dtype=object)
+    dvars = np.empty(sparse.shape[1], dtype=object)
+    for is_binary, vartype in ((False, mdl.continuous_vartype), (True, mdl.binary_vartype)):
+        idx = np.flatnonzero(sparse.binary == is_binary)
+        if len(idx):
+            dvars[idx] = mdl.var_list(len(idx), vartype, lb=sparse.col_lo[idx].tolist(),
+                                      ub=sparse.col_hi[idx].tolist(), name=names[idx].tolist())
+    dvars = dvars.tolist()
+
+    nz = np.flatnonzero(sparse.c)
+    mdl.maximize(mdl.scal_prod([dvars[k] for k in nz], sparse.c[nz]))
+
+    A = sparse.matrix()
+    lo, hi = sparse.row_lo, sparse.row_hi
+    finite_lo, finite_hi = np.isfinite(lo), np.isfinite(hi)
+    for sense, mask, rhs in (("eq", finite_lo & finite_hi & (lo == hi), lo),
+                             ("le", ~finite_lo & finite_hi, hi),
+                             ("ge", finite_lo & ~finite_hi, lo)):
+        idx = np.flatnonzero(mask)
+        if len(idx):
+            mdl.add_constraints(mdl.matrix_constraints(A[idx], dvars, rhs[idx].tolist(), sense))
+    idx = np.flatnonzero(finite_lo & finite_hi & (lo != hi))
+    if len(idx):
+        mdl.add_constraints(mdl.matrix_ranges(A[idx], dvars, lo[idx].tolist(), hi[idx].tolist()))
+    return mdl
+
+
+def to_cplex(sparse, name='Robust_Optimization_Model'):
+    """Load a :class:`SparseModel` into a ``cplex.Cplex`` problem.
+
+    This is the fastest path: one ``variables.add`` and one
+    ``linear_constraints.add`` call carry the whole model.  Row senses are
+    ``E``/``L``/``G``/``R`` (CPLEX ranged rows are ``rhs <= a'x <= rhs + range``).
+    """
+    import cplex
+
+    cpx = cplex.Cplex()
+    cpx.set_problem_name(name)
+    cpx.parameters.mip.tolerances.mipgap.set(sparse.params.mipgap)
+    cpx.objective.set_sense(cpx.objective.sense.maximize)
+    cpx.variables.add(obj=sparse.c.tolist(), lb=sparse.col_lo.tolist(),
+                      ub=np.minimum(sparse.col_hi, cplex.infinity).tolist(),
+                      types="".join(np.where(sparse.binary, "B", "C")), names=sparse.names)
+
+    A = sparse.matrix()
+    lo, hi = sparse.row_lo, sparse.row_hi
+    finite_lo, finite_hi = np.isfinite(lo), np.isfinite(hi)
+    senses = np.where(finite_lo & finite_hi, np.where(lo == hi, "E", "R"), np.where(finite_hi, "L", "G"))
+    rhs = np.where(finite_lo, lo, hi)
+    ranges = np.where(finite_lo & finite_hi, hi - lo, 0.0)
+    start, index, value = A.indptr.tolist(), A.indices.tolist(), A.data.tolist()
+    lin_expr = [[index[a:b], value[a:b]] for a, b in zip(start[:-1], start[1:])]
+    cpx.linear_constraints.add(lin_expr=lin_expr, senses="".join(senses), rhs=rhs.tolist(),
+                               range_values=ranges.tolist())
+    return cpx
+
+
+def build_optimization_model_sparse(data, params=None, name='Robust_Optimization_Model'):
+    """Drop-in replacement for :func:`~robust_bidding.model.build_optimization_model`."""
+    return to_docplex(build_sparse_model(data, params), name)
@@ -0,0 +1,232 @@
+"""Parallel sweep over the uncertainty interval and the budget Γ.
+
+The repository hard-codes three interval widths: ``예제/None`` (no
+uncertainty, ``Expected_P_RT_WPR == P_RT_WPR``: ``interval=0``), the top-level
+script (±10 %) and ``Code_v003.py`` (±50 %).  :func:`run_sweep` solves any
+grid of them - and of ``gamma`` for ``uncertainty="budget"`` - in a process
+pool and returns one :class:`SweepPoint` per grid point:
+
+* every worker solves the sparse model through
+  :func:`robust_bidding.solvers.solve` (``backend="auto"``: CPLEX when
+  licensed for it, else HiGHS or CBC; ``backend=None`` keeps the docplex
+  model) with ``threads`` threads, so ``workers * threads`` should not
+  exceed the cores;
+* the first ``cold`` points (spread farthest-first over the grid, the least
+  protected one first) are solved without a start; every other point is
+  submitted only once a grid neighbour is solved, in the serpentine order of
+  :func:`visit_order`, and starts from the binaries of the nearest solved
+  point (a MIP start).  Workers beyond the solved frontier wait, so
+  ``cold`` trades warm starts for parallelism;
+* :func:`frontier_table` prints objective, day-ahead / real-time revenue,
+  the price of robustness against the least protected point and where each
+  start came from (``cold`` for the first wave).
+
+``workers=1`` solves in the calling process.
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .params import BiddingParameters
+from .solvers import SOLVER_BACKENDS
+from .warmstart import BINARIES
+
+
+@dataclass
+class SweepPoint:
+    """Outcome of one grid point of :func:`run_sweep`."""
+
+    interval: float
+    gamma: float                 # None for uncertainty="box"
+    status: str                  # solver status
+    objective: float             # None without a solution
+    day_ahead: float             # Σ AV-RO-DA
+    real_time: float             # Σ AV-RO
+    price_of_robustness: float   # objective lost against the least protected point (%)
+    seconds: float               # build + solve in the worker
+    warm_start: tuple            # (interval, gamma) the MIP start came from, None for a cold start
+    binaries: dict = field(default_factory=dict, repr=False)
+
+
+def sweep_grid(intervals=None, gammas=None, params=None):
+    """``[(interval, gamma)]`` of the sweep, least protected first; ``gamma`` is ``None`` for a box sweep.
+
+    Repeated values are dropped - every point needs a distinct lattice position.
+    """
+    p = params if params is not None else BiddingParameters()
+    intervals = sorted(set(intervals)) if intervals else [p.interval]
+    gammas = sorted(set(gammas)) if gammas else [None]
+    return [(interval, gamma) for interval in intervals for gamma in gammas]
+
+
+def point_params(params, interval, gamma):
+    """``params`` of one grid point (``uncertainty="budget"`` when ``gamma`` is given)."""
+    if gamma is None:
+        return params.replace(interval=interval)
+    return params.replace(interval=interval, uncertainty="budget", gamma=gamma)
+
+
+def _coordinates(grid):
+    """``(interval, gamma)`` of every point scaled to [0, 1]."""
+    x = np.array([[interval, -1 if gamma is None else gamma] for interval, gamma in grid], dtype=float)
+    span = x.max(axis=0) - x.min(axis=0)
+    return (x - x.min(axis=0)) / np.where(span > 0, span, 1)
+
+
+def _lattice(grid):
+    """``(interval rank, gamma rank)`` of every point of :func:`sweep_grid`."""
+    intervals = sorted({interval for interval, gamma in grid})
+    gammas = sorted({gamma for interval, gamma in grid}, key=lambda g: -1 if g is None else g)
+    return [(intervals.index(interval), gammas.index(gamma)) for interval, gamma in grid]
+
+
+def visit_order(grid):
+    """Serpentine order of ``grid``: along gamma within an interval, reversed every other interval."""
+    lattice = _lattice(grid)
+    return sorted(range(len(grid)), key=lambda k: (lattice[k][0], lattice[k][1] * (-1) ** lattice[k][0]))
+
+
+def neighbours(grid):
+    """Indices of the points next to each point of ``grid`` (one interval or one gamma step)."""
+    lattice = _lattice(grid)
+    return [[i for i, (a, b) in enumerate(lattice) if abs(a - u) + abs(b - v) == 1] for u, v in lattice]
+
+
+def spread(grid, count):
+    """``count`` points of ``grid`` chosen farthest-first, starting at its first point."""
+    x = _coordinates(grid)
+    order, distance = [0], np.linalg.norm(x - x[0], axis=1)
+    while len(order) < min(count, len(grid)):
+        k = int(np.argmax(distance))
+        order.append(k)
+        distance = np.minimum(distance, np.linalg.norm(x - x[k], axis=1))
+    return order
+
+
+def nearest(grid, k, solved):
+    """Index of the solved point closest to ``grid[k]`` (``None`` if nothing is solved)."""
+    if not solved:
+        return None
+    x = _coordinates(grid)
+    candidates = sorted(solved)
+    return candidates[int(np.argmin(np.linalg.norm(x[candidates] - x[k], axis=1)))]
+
+
+_DATA = {}   # 작업 프로세스별 MarketData (initializer 로 한 번만 전달)
+
+
+def _init_worker(data):
+    _DATA["data"] = data
+
+
+def _solve_point(params, start, threads, time_limit, sparse, backend, data=None):
+    """Build and solve one point; returns the fields of :class:`SweepPoint` the worker knows."""
+    from .model import build_optimization_model
+    from .results import solution_arrays
+    from .solvers import solve
+    from .sparse import build_optimization_model_sparse, build_sparse_model
+    from .warmstart import add_mip_start
+
+    begin = time.perf_counter()
+    data = data if data is not None else _DATA["data"]
+    if backend is not None:
+        result = solve(build_sparse_model(data, params), backend, time_limit, threads=threads, start=start)
+        arrays = result.arrays
+        out = {"status": result.status, "objective": result.objective, "day_ahead": None, "real_time": None,
+               "binaries": {}}
+        if result.solved:
+            out.update(day_ahead=float(arrays["AV-RO-DA"].sum()), real_time=float(arrays["AV-RO"].sum()),
+                       binaries={name: arrays[name] for name in BINARIES if name in arrays})
+        out["seconds"] = time.perf_counter() - begin
+        return out
+    mdl = (build_optimization_model_sparse if sparse else build_optimization_model)(data, params)
+    mdl.parameters.threads = threads
+    if time_limit is not None:
+        mdl.parameters.timelimit = time_limit
+    if start:
+        add_mip_start(mdl, start)
+    s = mdl.solve()
+    out = {"status": mdl.solve_details.status, "objective": None, "day_ahead": None, "real_time": None, "binaries": {}}
+    if s:
+        arrays = solution_arrays(mdl, s)
+        out.update(objective=s.objective_value, day_ahead=float(arrays["AV-RO-DA"].sum()),
+                   real_time=float(arrays["AV-RO"].sum()),
+                   binaries={name: arrays[name] for name in BINARIES if name in arrays})
+    out["seconds"] = time.perf_counter() - begin
+    return out
+
+
+def run_sweep(data, params=None, intervals=None, gammas=None, workers=None, threads=1, time_limit=None, sparse=False,
+              cold=1, backend="auto"):
+    """Solve every point of :func:`sweep_grid`; returns :class:`SweepPoint` in grid order.
+
+    ``workers=None`` uses one process per core divided by ``threads``;
+    ``backend`` is one of :data:`~robust_bidding.solvers.SOLVER_BACKENDS`, or
+    ``None`` for the docplex model (``sparse=True`` builds that through
+    :func:`~robust_bidding.sparse.build_optimization_model_sparse`).
+    ``cold`` points (:func:`spread`) start without a MIP start; the others
+    wait for a solved neighbour (see the module docstring).
+    """
+    if backend is not None and backend not in SOLVER_BACKENDS:
+        raise ValueError("backend must be one of %s, got %r" % (", ".join(SOLVER_BACKENDS), backend))
+    p = params if params is not None else BiddingParameters()
+    grid = sweep_grid(intervals, gammas, p)
+    workers = workers or max(1, (os.cpu_count() or 1) // threads)
+    order, adjacent, seeds = visit_order(grid), neighbours(grid), set(spread(grid, max(1, cold)))
+    solved, source, submitted = {}, {}, set()
+
+    def ready():
+        """Next point in visit order that is a seed or has a solved neighbour."""
+        return next((k for k in order if k not in submitted
+                     and (k in seeds or any(n in solved for n in adjacent[k]))), None)
+
+    def task(k):
+        submitted.add(k)
+        source[k] = None if k in seeds else nearest(grid, k, [i for i in solved if solved[i]["binaries"]])
+        start = solved[source[k]]["binaries"] if source[k] is not None else None
+        return point_params(p, *grid[k]), start, threads, time_limit, sparse, backend
+
+    if workers == 1:
+        for k in iter(ready, None):
+            solved[k] = _solve_point(*task(k), data=data)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+            pending = {}
+            while len(solved) < len(grid):
+                k = ready()
+                while k is not None and len(pending) < workers:   # 이웃이 풀린 점만 제출
+                    pending[pool.submit(_solve_point, *task(k))] = k
+                    k = ready()
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    solved[pending.pop(future)] = future.result()
+
+    reference = next((solved[k]["objective"] for k in range(len(grid)) if solved[k]["objective"] is not None), None)
+    points = []
+    for k, (interval, gamma) in enumerate(grid):
+        r = solved[k]
+        por = None
+        if r["objective"] is not None and reference:
+            por = 100 * (reference - r["objective"]) / abs(reference)
+        points.append(SweepPoint(interval=interval, gamma=gamma, status=r["status"], objective=r["objective"],
+                                 day_ahead=r["day_ahead"], real_time=r["real_time"], price_of_robustness=por,
+                                 seconds=r["seconds"], warm_start=grid[source[k]] if source[k] is not None else None,
+                                 binaries=r["binaries"]))
+    return points
+
+
+def frontier_table(points):
+    """Revenue-versus-robustness table of :func:`run_sweep` as text."""
+    row = "%8s %6s %14s %12s %12s %8s %9s %-14s %s"
+    fmt = lambda value, spec: spec % value if value is not None else "-"
+    lines = [row % ("interval", "gamma", "objective", "day-ahead", "real-time", "PoR %", "seconds", "warm start", "status")]
+    for pt in points:
+        lines.append(row % (pt.interval, fmt(pt.gamma, "%g"), fmt(pt.objective, "%.4f"), fmt(pt.day_ahead, "%.2f"),
+                            fmt(pt.real_time, "%.2f"), fmt(pt.price_of_robustness, "%.2f"), "%.2f" % pt.seconds,
+                            "cold" if pt.warm_start is None else "%g/%s" % (pt.warm_start[0], fmt(pt.warm_start[1], "%g")),
+                            pt.status))
+    lines.append("cold starts: %d of %d points" % (sum(pt.warm_start is None for pt in points), len(points)))
+    return "\n".join(lines)
@@ -0,0 +1,37 @@
+"""Interchangeable BESS units and the rows that order them.
+
+Units with the same ratings in every :data:`~robust_bidding.params.BESS_ARRAYS`
+field and the same ``Initial_BESS`` enter the model in exactly the same way
+(the marginal costs and the prices are shared), so permuting them maps every solution to
+another solution with the same objective.  With ``symmetry="order"`` the
+builders add, for consecutive units ``a < b`` of a group, the row
+
+    Σ_t Σ_j (P_DA_CH + P_DA_DCH + P_RS_CH + P_RS_DCH)[t, j, a]  >=  (same)[t, j, b]
+
+i.e. the units of a group are ranked by their scheduled day-ahead and reserve
+power.  Any solution can be permuted into this order, so the optimum is
+unchanged, while branch-and-bound no longer explores the permuted copies.
+The commitment binaries make a poor key: 식(32) forces ``D_Char + D_Dchar = 1``
+whenever a unit holds energy, so most units tie on it.
+"""
+from .params import BESS_ARRAYS, SYMMETRY_MODES, BiddingParameters
+
+
+def identical_bess_groups(params=None):
+    """Groups (tuples of 0-based unit indices, ascending) of two or more identical units."""
+    p = params if params is not None else BiddingParameters()
+    groups = {}
+    for s in range(p.BESS_dim):
+        rating = tuple(float(getattr(p, name)[s]) for name in BESS_ARRAYS) + (p.initial_energy[s],)
+        groups.setdefault(rating, []).append(s)
+    return [tuple(units) for units in groups.values() if len(units) > 1]
+
+
+def ordered_pairs(params=None):
+    """``(a, b)`` pairs (0-based) that get an ordering row; empty unless ``symmetry="order"``."""
+    p = params if params is not None else BiddingParameters()
+    if p.symmetry not in SYMMETRY_MODES:
+        raise ValueError("symmetry must be one of %s, got %r" % (", ".join(SYMMETRY_MODES), p.symmetry))
+    if p.symmetry == "none":
+        return []
+    return [(a, b) for units in identical_bess_groups(p) for a, b in zip(units, units[1:])]
@@ -0,0 +1,183 @@
+"""Structured solve telemetry: JSON-lines events and a report over runs.
+
+A :class:`Telemetry` appends one JSON object per line to its file, every
+line tagged with the ``run`` id:
+
+* ``{"event": "start", "time": <POSIX>, "meta": {...}}``;
+* ``{"event": "phase", "phase": "load" | "build" | "solve" | "extract", "seconds": ...}``;
+* ``{"event": "progress", "t": ..., "incumbent": ..., "bound": ..., "gap": ..., "nodes": ...}``
+  from the solver callbacks of :func:`~robust_bidding.solvers.solve`
+  (``telemetry=``) or a docplex model (:func:`add_progress_listener`), at
+  most one per ``interval`` seconds plus every new incumbent;
+* ``{"event": "end", "seconds": ..., "status": ..., "objective": ...}``.
+
+Lines are written with a single ``os.write`` on an ``O_APPEND`` descriptor,
+so the workers of :func:`~robust_bidding.batch.run_batch` can share one
+file.  :func:`read_runs` folds a file back into one summary per run and
+``python -m robust_bidding.telemetry FILE... [--group-by KEY]`` prints the
+comparison (:func:`report`).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from math import inf, isfinite
+
+### 실행 단계 - 보고서 열 순서
+PHASES = ("load", "build", "solve", "extract")
+
+
+def _number(value):
+    """JSON-safe float: ``None`` for missing or infinite values (CPLEX reports "no bound" as 1e+75)."""
+    return float(value) if value is not None and isfinite(value) and abs(value) < 1e75 else None
+
+
+class Telemetry(object):
+    """Event writer of one run; ``meta`` (workbook, backend, parameters, ...) goes into the start event."""
+
+    def __init__(self, path, run=None, interval=1.0, meta=None):
+        self.path = path
+        self.run = run or uuid.uuid4().hex[:12]
+        self.interval = interval
+        self.begin = time.perf_counter()
+        self._last, self._incumbent = -inf, None
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.write("start", time=time.time(), meta=meta or {})
+
+    def write(self, event, **fields):
+        line = json.dumps(dict({"run": self.run, "event": event}, **fields)) + "\n"
+        os.write(self._fd, line.encode())
+
+    def elapsed(self):
+        return time.perf_counter() - self.begin
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.write("phase", phase=name, seconds=time.perf_counter() - start)
+
+    def progress(self, incumbent=None, bound=None, gap=None, nodes=None, force=False):
+        """Record the solver state; dropped within ``interval`` unless forced or a new incumbent."""
+        t = self.elapsed()
+        incumbent, bound = _number(incumbent), _number(bound)
+        if not force and incumbent == self._incumbent and t - self._last < self.interval:
+            return
+        if gap is None and incumbent is not None and bound is not None:
+            gap = abs(bound - incumbent) / (1e-10 + abs(incumbent))
+        self._last, self._incumbent = t, incumbent
+        self.write("progress", t=t, incumbent=incumbent, bound=bound, gap=_number(gap),
+                   nodes=None if nodes is None else int(nodes))
+
+    def finish(self, status=None, objective=None, **fields):
+        self.write("end", seconds=self.elapsed(), status=status, objective=_number(objective), **fields)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, error, tb):
+        if self._fd is not None:
+            self.finish(status="error" if error is not None else None,
+                        error=None if error is None else "%s: %s" % (kind.__name__, error))
+
+
+def add_progress_listener(mdl, telemetry):
+    """Feed the progress of ``mdl.solve`` (docplex) to ``telemetry``; returns the listener."""
+    from docplex.mp.progress import ProgressListener
+
+    class _Listener(ProgressListener):
+        def notify_progress(self, data):
+            telemetry.progress(data.current_objective if data.has_incumbent else None, data.best_bound,
+                               data.mip_gap if data.has_incumbent else None, data.current_nb_nodes)
+
+    listener = _Listener()
+    mdl.add_progress_listener(listener)
+    return listener
+
+
+def read_runs(*paths):
+    """One summary dict per run of the telemetry files, in order of first appearance.
+
+    Keys: ``run``, ``meta``, one per phase (seconds, summed), ``seconds``,
+    ``status``, ``objective``, ``bound``, ``gap``, ``nodes``, ``first_incumbent``
+    (``t`` of the first progress with an incumbent) and ``progress`` (events).
+    """
+    runs = {}
+    for path in paths:
+        with open(path) as fp:
+            for line in fp:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue   # 중단된 쓰기
+                run = runs.setdefault(event["run"], {"run": event["run"], "meta": {}, "progress": [],
+                                                     "first_incumbent": None, "status": None, "seconds": None})
+                kind = event["event"]
+                if kind == "start":
+                    run["meta"] = event.get("meta", {})
+                elif kind == "phase":
+                    run[event["phase"]] = run.get(event["phase"], 0.0) + event["seconds"]
+                elif kind == "progress":
+                    run["progress"].append(event)
+                    if run["first_incumbent"] is None and event["incumbent"] is not None:
+                        run["first_incumbent"] = event["t"]
+                elif kind == "end":
+                    run.update({key: value for key, value in event.items() if key not in ("run", "event")})
+    for run in runs.values():   # 마지막으로 보고된 값
+        for key in ("bound", "gap", "nodes", "incumbent"):
+            run[key] = next((event[key] for event in reversed(run["progress"]) if event[key] is not None), None)
+        if run.get("objective") is None:
+            run["objective"] = run.pop("incumbent")
+        else:
+            del run["incumbent"]
+    return list(runs.values())
+
+
+def report(runs, group_by=None):
+    """Comparison table of :func:`read_runs`: one row per run, or per ``meta[group_by]`` with means."""
+    fmt = lambda value, spec: "-" if value is None else spec % value
+    columns = list(PHASES) + ["seconds", "first_incumbent"]
+    head = "%-24s %6s" + " %9s" * len(columns) + " %14s %10s %8s %s"
+    lines = [head % (("run" if group_by is None else group_by, "runs") + tuple(
+        c if c != "first_incumbent" else "first inc" for c in columns) + ("objective", "gap", "nodes", "status"))]
+    groups = {}
+    for run in runs:
+        key = run["run"] if group_by is None else str(run["meta"].get(group_by))
+        groups.setdefault(key, []).append(run)
+    total = {phase: 0.0 for phase in PHASES}
+    for key, members in groups.items():
+        mean = lambda name: (sum(m[name] for m in members if m.get(name) is not None)
+                             / max(1, sum(m.get(name) is not None for m in members))
+                             if any(m.get(name) is not None for m in members) else None)
+        statuses = sorted({str(m["status"]) for m in members})
+        lines.append(head % ((key[:24], len(members)) + tuple(fmt(mean(c), "%.3f") for c in columns)
+                             + (fmt(mean("objective"), "%.4f"), fmt(mean("gap"), "%.2e"), fmt(mean("nodes"), "%.0f"),
+                                "/".join(statuses))))
+        for phase in PHASES:
+            total[phase] += sum(m.get(phase) or 0.0 for m in members)
+    overall = sum(total.values())
+    if overall > 0:   # 전체 시간이 어느 단계에 쓰였는지
+        lines.append("time share: " + ", ".join("%s %.1f%%" % (phase, 100 * total[phase] / overall) for phase in PHASES))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m robust_bidding.telemetry",
+                                     description="Compare solve runs recorded in telemetry JSON-lines files.")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--group-by", default=None, help="meta key to aggregate runs by (e.g. backend, workbook)")
+    args = parser.parse_args(argv)
+    print(report(read_runs(*args.files), args.group_by))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""Reusable model structure for day-by-day runs.
+
+Between trading days only the prices and the expected deployments change.
+:class:`BiddingModelTemplate` builds the docplex model once with
+:func:`~robust_bidding.model.build_optimization_model` and afterwards
+rewrites only what depends on those inputs:
+
+* the objective (day-ahead / reserve prices),
+* the per-hour rows of 식(65) (``AV-RO``), ``AV-RO-DA`` and 식(2) (``B-t``)
+  and the per-asset income rows,
+* the lower/upper bounds of 식(61)~(63),
+* with ``uncertainty="budget"``, the dual rows of the budget counterpart and
+  the reserve cover of 식(15)/(16); :meth:`BiddingModelTemplate.set_budget`
+  changes Γ and the deviations ``Δ`` in place,
+* with ``big_m="derived"``, the big-M rows 식(33)~(35) (M follows the
+  expected wind power),
+* with ``tighten_bounds``, the variable bounds of
+  :func:`~robust_bidding.bounds.variable_bounds`,
+* on :meth:`BiddingModelTemplate.set_initial_energy`, the initial-energy rows
+  식(17)+(19) / 식(19) (state of charge carried over from the previous day);
+  the symmetry rows of units whose initial energies now differ are emptied.
+
+The price-dependent expressions come from the same function the builder
+uses, so an updated template and a freshly built model are the same MILP.
+The hourly sums they are made of are cached by the builder
+(:class:`~robust_bidding.expressions.HourlyExpressions`); an update only
+re-weights them.
+``C-t`` (식(3)) only contains marginal costs and is left untouched.
+
+With ``backend`` (one of :data:`~robust_bidding.solvers.SOLVER_BACKENDS`)
+no docplex model is kept: the template holds the day and the initial
+energy, :meth:`BiddingModelTemplate.sparse_model` assembles them with
+:func:`~robust_bidding.sparse.build_sparse_model` (again after every change)
+and :meth:`BiddingModelTemplate.solve` goes through
+:func:`robust_bidding.solvers.solve`.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from .bounds import variable_bounds, wpr_big_m
+from .data import MarketData
+from .model import _build_model, _var_bounds
+from .params import BiddingParameters
+from .solvers import SOLVER_BACKENDS, solve
+from .sparse import build_sparse_model
+from .uncertainty import (UNCERTAIN, budget_weights, check_uncertainty, deviation_arrays, realization_band,
+                          relative_deviation, reserve_cover)
+
+
+def _as_grid(values, time_dim, min_dim, name, hourly=False):
+    """``values`` as a float ``(time_dim, min_dim)`` array (``(time_dim, 1)`` allowed if ``hourly``)."""
+    grid = np.asarray(values, dtype=float)
+    if hourly and grid.ndim == 1:
+        grid = grid[:, None]
+    widths = (1, min_dim) if hourly else (min_dim,)
+    if grid.ndim != 2 or grid.shape[0] != time_dim or grid.shape[1] not in widths:
+        raise ValueError("%s: expected shape (%d, %s), got %s"
+                         % (name, time_dim, " or ".join(str(w) for w in widths), grid.shape))
+    return grid
+
+
+def _data_deviations(data):
+    """``Deviation_*`` arrays of ``data`` by family (absent ones left out)."""
+    return {name: getattr(data, arrays[1]) for name, arrays in UNCERTAIN.items() if getattr(data, arrays[1], None) is not None}
+
+
+class BiddingModelTemplate(object):
+    """Build the model structure once, then re-price it for every day.
+
+    ::
+
+        template = BiddingModelTemplate(first_day, params)
+        for day in days:
+            template.update_from(day)
+            s = template.solve()
+
+    ``backend="auto"`` (or ``"cplex"`` / ``"highs"`` / ``"cbc"``) solves the
+    sparse model instead; :meth:`solve` then returns a
+    :class:`~robust_bidding.solvers.SolveResult` and ``model`` is ``None``.
+    """
+
+    def __init__(self, data, params=None, name='Robust_Optimization_Model', backend=None):
+        if backend is not None and backend not in SOLVER_BACKENDS:
+            raise ValueError("backend must be one of %s, got %r" % (", ".join(SOLVER_BACKENDS), backend))
+        self.params = params if params is not None else BiddingParameters()
+        self.backend = backend
+        self.initial_energy = self.params.initial_energy
+        self._sparse = None
+        self._day = self._read(data.Price_DA, data.Price_RS, data.Price_UR, data.Price_DR, data.Expected_P_UR,
+                               data.Expected_P_DR, data.Expected_P_RT_WPR, _data_deviations(data))
+        if backend is not None:
+            self.model = None
+            return
+        self.model, parts = _build_model(data, self.params, name)
+        self._price_terms = parts["price_terms"]
+        self._price_rows = parts["price_rows"]
+        self._income_rows = parts["income_rows"]
+        self._bound_rows = parts["bound_rows"]
+        self._big_m_rows = parts["big_m_rows"]
+        self._commitment_rows = parts["commitment_rows"]
+        self._soc_rows = parts["soc_rows"]
+        self._soc_constraints = parts["soc_constraints"]
+        self._symmetry_rows = {pair: (ct, ct.left_expr, ct.right_expr) for pair, ct in parts["symmetry_rows"].items()}
+        self._reserve_rows = parts["reserve_rows"]
+        self._reserve_constraints = parts["reserve_constraints"]
+        self._variables = {}   # family -> (vars, keys) - 변수 상/하한 갱신용
+        if self.params.tighten_bounds:
+            for v in self.model.iter_continuous_vars():
+                name, *index = v.name.split('_')
+                dvars, keys = self._variables.setdefault(name, ([], []))
+                dvars.append(v)
+                keys.append(tuple(int(i) for i in index))
+
+    def _read(self, prices_da, prices_rs, prices_ur, prices_dr, expected_ur, expected_dr, expected_wind, deviations):
+        """Checked ``(prices, expected, deviations)`` of one day."""
+        T, J = self.params.time_dim, self.params.min_dim
+        prices = (_as_grid(prices_da, T, J, "prices_da", hourly=True), _as_grid(prices_rs, T, J, "prices_rs", hourly=True),
+                  _as_grid(prices_ur, T, J, "prices_ur"), _as_grid(prices_dr, T, J, "prices_dr"))
+        expected = {"P-UR": _as_grid(expected_ur, T, J, "expected_ur"),
+                    "P-DR": _as_grid(expected_dr, T, J, "expected_dr"),
+                    "P-RT-WPR": _as_grid(expected_wind, T, J, "expected_wind")}
+        day = SimpleNamespace(**{arrays[0]: expected[name] for name, arrays in UNCERTAIN.items()})
+        return prices, expected, deviation_arrays(day, self.params, deviations) if self.params.uncertainty == "budget" else None
+
+    def update(self, prices_da, prices_rs, prices_ur, prices_dr, expected_ur, expected_dr, expected_wind, deviations=None):
+        """Rewrite the objective, the price-dependent rows and 식(61)~(63).
+
+        ``prices_da`` / ``prices_rs`` are hourly, ``(time_dim,)`` or shaped
+        like the interval arrays; all others are ``(time_dim, min_dim)``.
+        ``deviations`` maps ``"P-UR"`` / ``"P-DR"`` / ``"P-RT-WPR"`` to the
+        ``Δ`` of ``uncertainty="budget"`` (default ``interval * |Expected|``).
+        """
+        self._day = self._read(prices_da, prices_rs, prices_ur, prices_dr, expected_ur, expected_dr, expected_wind, deviations)
+        self._apply()
+
+    def set_budget(self, gamma, deviations=None):
+        """Change Γ (``params.gamma``) and optionally the deviations of an ``uncertainty="budget"`` model.
+
+        ``deviations`` is as in :meth:`update`; families not given keep their
+        current ``Δ``.
+        """
+        if self.params.uncertainty != "budget":
+            raise ValueError("set_budget needs uncertainty='budget', got %r" % self.params.uncertainty)
+        params = self.params.replace(gamma=gamma)
+        check_uncertainty(params)
+        self.params = params
+        prices, expected, current = self._day
+        self._day = prices, expected, deviation_arrays(None, params, dict(current, **(deviations or {})))
+        self._apply()
+
+    def _apply(self):
+        """Write the current day (``self._day``) and ``self.params`` into the model."""
+        if self.model is None:   # backend - 다음 sparse_model() 에서 다시 조립
+            self._sparse = None
+            return
+        p = self.params
+        (Price_DA, Price_RS, Price_UR, Price_DR), expected, deviation = self._day
+        budget = p.uncertainty == "budget"
+
+        terms = self._price_terms(Price_DA, Price_RS, Price_UR, Price_DR,
+                                  (budget_weights(p), relative_deviation(expected, deviation)) if budget else None)
+        self.model.maximize(terms["objective"])
+        for key, rows in self._price_rows.items():
+            for ct, expr in zip(rows, terms[key]):
+                ct.right_expr = expr
+        for key, rows in self._income_rows.items():
+            for ct, expr in zip(rows, terms[key]):
+                ct.left_expr = expr
+
+        ### 식(61)~(63) - 행 순서 (t, j[, w]); docplex 는 하한 행도 'x >= c' 로 저장하므로 우변만 바꾼다
+        band = realization_band(expected, deviation, p)
+        for key, (lo_rows, hi_rows) in self._bound_rows.items():
+            for rows, values in zip((lo_rows, hi_rows), band[key]):
+                for ct, value in zip(rows, np.repeat(values.ravel(), len(rows) // values.size).tolist()):
+                    ct.right_expr = value
+
+        ### 식(15)/(16) - budget 모드의 예비력 여유 (1 + γρ)
+        if budget:
+            for rows, new_rows in zip(self._reserve_constraints, self._reserve_rows(reserve_cover(expected, deviation, p))):
+                for ct, new in zip(rows, new_rows):
+                    ct.left_expr, ct.right_expr = new.left_expr, new.right_expr
+
+        ### 식(33)~(35) - derived big-M
+        if self._big_m_rows is not None:
+            for rows, new_rows in zip(self._commitment_rows, self._big_m_rows(wpr_big_m(expected["P-RT-WPR"], p))):
+                for ct, new in zip(rows, new_rows):
+                    ct.left_expr, ct.right_expr = new.left_expr, new.right_expr
+
+        ### 변수 상/하한 - 식(61)~(63) 의 예측값에 따라 바뀜
+        if self._variables:
+            day = {arrays[0]: expected[name] for name, arrays in UNCERTAIN.items()}
+            day.update({arrays[1]: deviation[name] for name, arrays in UNCERTAIN.items()} if budget else {})
+            bounds = variable_bounds(SimpleNamespace(**day), p)
+            for name, (dvars, keys) in self._variables.items():
+                if name in bounds:
+                    new = _var_bounds(bounds, name, keys)
+                    self.model.change_var_upper_bounds(dvars, new["ub"])
+                    self.model.change_var_lower_bounds(dvars, new["lb"])
+
+    def set_initial_energy(self, initial):
+        """Start the day from ``initial`` (MWh, scalar or one value per BESS) - 식(17)+(19) / 식(19)."""
+        initial = np.broadcast_to(np.asarray(initial, dtype=float), (self.params.BESS_dim,)).tolist()
+        if self.model is None:
+            self.initial_energy, self._sparse = initial, None
+            return
+        for rows, new_rows in zip(self._soc_constraints, self._soc_rows(initial)):
+            for ct, new in zip(rows, new_rows):
+                ct.left_expr, ct.right_expr = new.left_expr, new.right_expr
+        ### 동일 정격 BESS 의 순서 제약은 초기 에너지도 같을 때만 유효 - 다르면 빈 행 (0 >= 0)
+        for (a, b), (ct, left, right) in self._symmetry_rows.items():
+            ct.left_expr, ct.right_expr = (left, right) if initial[a] == initial[b] else (0, 0)
+        self.initial_energy = initial
+
+    def update_from(self, data):
+        """:meth:`update` from a :class:`~robust_bidding.data.MarketData` (``Deviation_*`` arrays if it has them)."""
+        self.update(data.Price_DA, data.Price_RS, data.Price_UR, data.Price_DR,
+                    data.Expected_P_UR, data.Expected_P_DR, data.Expected_P_RT_WPR, _data_deviations(data))
+
+    def sparse_model(self):
+        """The current day as a :class:`~robust_bidding.sparse.SparseModel` (built once per change)."""
+        if self._sparse is None:
+            p = self.params
+            (Price_DA, Price_RS, Price_UR, Price_DR), expected, deviation = self._day
+            arrays = {"Price_DA": Price_DA, "Price_RS": Price_RS, "Price_UR": Price_UR, "Price_DR": Price_DR}
+            for name, (expected_name, deviation_name) in UNCERTAIN.items():
+                arrays[expected_name] = expected[name]
+                if deviation is not None:
+                    arrays[deviation_name] = deviation[name]
+            ### 초기 에너지는 Initial_BESS 로 - 동일 정격 BESS 의 대칭 행도 이에 따름
+            self._sparse = build_sparse_model(MarketData(p.time_dim, p.min_dim, arrays),
+                                              p.replace(Initial_BESS=list(self.initial_energy)))
+        return self._sparse
+
+    def solve(self, **kwargs):
+        """``self.model.solve(**kwargs)``, or :func:`robust_bidding.solvers.solve` of :meth:`sparse_model` with ``backend``."""
+        if self.backend is not None:
+            return solve(self.sparse_model(), self.backend, **kwargs)
+        return self.model.solve(**kwargs)
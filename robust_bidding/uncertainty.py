@@ -0,0 +1,144 @@
+"""Uncertainty sets of 식(61)~(63): the v003 box and a budgeted (Γ) set.
+
+With ``uncertainty="box"`` (``Code_v003.py``) the deployed regulation
+``P_UR`` / ``P_DR`` and the wind realization ``P_RT_WPR`` are decision
+variables within ``Expected * (1 ± interval)``: the plan picks the
+realization it is paid for.  ``uncertainty="budget"`` keeps that plan and
+protects it against a Bertsimas-Sim set of deviations from it,
+
+    u[t, j] = plan[t, j] * (1 + ρ[t, j] * ζ[t, j]),   |ζ| <= 1,   Σ_(t, j) ∈ g |ζ| <= Γ_g
+
+over the groups ``g`` of ``budget_scope`` (every hour, or the whole day),
+with ``ρ = Δ / Expected``.  Deviations ``Δ`` (MW) are ``Deviation_P_UR`` /
+``Deviation_P_DR`` / ``Deviation_P_RT_WPR`` of the market data when present
+and ``interval * |Expected|`` otherwise.  The fleet follows a deviating
+regulation call pro rata, so the real-time revenue of interval ``(t, j)``
+moves by ``ρ * ζ`` times its planned margin.  The worst case of the hourly
+revenue 식(65) over the budget is the inner problem of 식(64); its LP dual
+gives, per group, one ``RO-Z`` and per interval ``RO-Q-UR`` / ``RO-Q-DR``::
+
+    AV_RO[t] <= (식(65) 우변) - w[t] * RO_Z[g(t)] - Σ_j (RO_Q_UR + RO_Q_DR)[t, j]
+    RO_Q_UR[t, j] + RO_Z[g(t)] >= ± ρ_UR[t, j] * (up-regulation margin)[t, j]     (DR likewise)
+
+with ``w[t] = Γ_t`` per hour.  A daily budget has a single ``RO-Z`` whose
+``Γ * RO_Z`` is subtracted in the objective instead (``w = 0``), since v003
+keeps every hour's ``AV_RO >= 0``.  Rows with a
+single uncertain term are protected by ``γ = min(Γ, 1)``: the reserve of
+식(15)/(16) covers ``(1 + γ ρ) * P_UR`` (``P_DR``), and the wind that caps the
+bids in 식(33)~(35) is at most ``(1 - γ ρ) * (1 + interval) * Expected``.
+``Γ = 0`` is the box.  The energy rows 식(17)~(19) follow the plan.
+"""
+import numpy as np
+
+from .params import BUDGET_SCOPES, UNCERTAINTY_MODES, BiddingParameters
+
+### 식(61)~(63) 불확실 파라미터 - 변수 이름: (예측값, 편차) 배열 이름
+UNCERTAIN = {
+    "P-UR": ("Expected_P_UR", "Deviation_P_UR"),
+    "P-DR": ("Expected_P_DR", "Deviation_P_DR"),
+    "P-RT-WPR": ("Expected_P_RT_WPR", "Deviation_P_RT_WPR"),
+}
+
+
+def check_uncertainty(params=None):
+    """Validate ``uncertainty`` / ``budget_scope`` / ``gamma`` of ``params``."""
+    p = params if params is not None else BiddingParameters()
+    if p.uncertainty not in UNCERTAINTY_MODES:
+        raise ValueError("uncertainty must be one of %s, got %r" % (", ".join(UNCERTAINTY_MODES), p.uncertainty))
+    if p.budget_scope not in BUDGET_SCOPES:
+        raise ValueError("budget_scope must be one of %s, got %r" % (", ".join(BUDGET_SCOPES), p.budget_scope))
+    if p.gamma is not None:
+        gamma = np.asarray(p.gamma, dtype=float)
+        if gamma.ndim and (p.budget_scope != "hour" or gamma.shape != (p.time_dim,)):
+            raise ValueError("gamma must be a scalar or, with budget_scope='hour', %d values; got shape %s"
+                             % (p.time_dim, gamma.shape))
+        if (gamma < 0).any():
+            raise ValueError("gamma must be >= 0, got %r" % (p.gamma,))
+
+
+def deviation_arrays(data, params=None, deviations=None):
+    """``Δ`` per uncertain family, ``(time_dim, min_dim)`` arrays.
+
+    ``deviations[name]`` if given, else ``data.Deviation_*``, else
+    ``interval * |Expected|``.  ``data`` needs the ``Expected_*`` arrays.
+    """
+    p = params if params is not None else BiddingParameters()
+    deviations = deviations or {}
+    out = {}
+    for name, (expected, deviation) in UNCERTAIN.items():
+        value = deviations.get(name)
+        if value is None:
+            value = getattr(data, deviation, None)
+        if value is None:
+            value = p.interval * np.abs(np.asarray(getattr(data, expected), dtype=float))
+        value = np.asarray(value, dtype=float)[:p.time_dim, :p.min_dim]
+        if value.shape != (p.time_dim, p.min_dim) or (value < 0).any():
+            raise ValueError("%s deviation must be >= 0 with shape (%d, %d), got %s"
+                             % (name, p.time_dim, p.min_dim, value.shape))
+        out[name] = value
+    return out
+
+
+def budget_weights(params=None):
+    """``(w, objective)``: weight of ``RO-Z`` in each hour's 식(65) row, ``(time_dim,)``, and in the objective.
+
+    Per hour ``(Γ_t, 0)``, per day ``(0, Γ)``.  ``gamma=None`` is the largest
+    useful budget, ``2 * min_dim`` uncertain terms per hour (every deviation
+    at its bound).
+    """
+    p = params if params is not None else BiddingParameters()
+    check_uncertainty(p)
+    T = p.time_dim
+    if p.budget_scope == "hour":
+        gamma = 2 * p.min_dim if p.gamma is None else p.gamma
+        return np.broadcast_to(np.asarray(gamma, dtype=float), (T,)).copy(), 0.0
+    return np.zeros(T), 2 * p.min_dim * T if p.gamma is None else float(p.gamma)
+
+
+def budget_groups(params=None):
+    """1-based ``RO-Z`` index of every hour, ``(time_dim,)``."""
+    p = params if params is not None else BiddingParameters()
+    return np.arange(1, p.time_dim + 1) if p.budget_scope == "hour" else np.ones(p.time_dim, dtype=int)
+
+
+def single_term_cover(params=None):
+    """``min(Γ, 1)`` per hour - protection of rows with one uncertain term."""
+    p = params if params is not None else BiddingParameters()
+    w, objective = budget_weights(p)
+    return np.minimum(w if p.budget_scope == "hour" else np.full(p.time_dim, objective), 1)
+
+
+def realization_band(expected, deviation, params=None):
+    """``(lo, hi)`` of 식(61)~(63) per family, ``(time_dim, min_dim)``.
+
+    ``expected`` / ``deviation`` map the :data:`UNCERTAIN` names to arrays.
+    Box: ``Expected * (1 ± interval)``.  Budget: the same, with the wind
+    upper bound scaled by ``1 - min(Γ, 1) * ρ`` (the lower bound kept below
+    it).
+    """
+    p = params if params is not None else BiddingParameters()
+    check_uncertainty(p)
+    T, J = p.time_dim, p.min_dim
+    grid = {name: np.asarray(expected[name], dtype=float)[:T, :J] for name in UNCERTAIN}
+    band = {name: ((1 - p.interval) * value, (1 + p.interval) * value) for name, value in grid.items()}
+    if p.uncertainty == "budget":
+        lo, hi = band["P-RT-WPR"]
+        hi = hi * np.maximum(1 - single_term_cover(p)[:, None] * relative_deviation(grid, deviation)["P-RT-WPR"], 0)
+        band["P-RT-WPR"] = (np.minimum(lo, hi), hi)
+    return band
+
+
+def reserve_cover(expected, deviation, params=None):
+    """``min(Γ, 1) * ρ`` of 식(15)/(16): ``(1 + cover) * P_UR <= P_RS``, ``{"P-UR": (T, J), "P-DR": (T, J)}``."""
+    p = params if params is not None else BiddingParameters()
+    cover, rho = single_term_cover(p)[:, None], relative_deviation(expected, deviation)
+    return {name: cover * rho[name] for name in ("P-UR", "P-DR")}
+
+
+def relative_deviation(expected, deviation):
+    """``ρ = Δ / Expected`` per family (0 where nothing is expected)."""
+    out = {}
+    for name, value in deviation.items():
+        nominal = np.asarray(expected[name], dtype=float)[:value.shape[0], :value.shape[1]]
+        out[name] = np.divide(value, nominal, out=np.zeros_like(value), where=nominal > 0)
+    return out
@@ -0,0 +1,165 @@
+"""MIP starts from a previous solution or a heuristic schedule.
+
+Consecutive trading days commit the BESS and WPR almost the same way, yet
+every ``mdl.solve`` starts branch-and-bound without an incumbent.  A start
+is a set of :data:`BINARIES` arrays (``D-Char`` / ``D-DChar`` / ``D-WPR``,
+shaped ``(t, j, s|w)`` like :func:`~robust_bidding.results.solution_arrays`)
+obtained by :func:`start_arrays` from
+
+* a ``solution.json`` (docplex ``mdl.solution.export`` or
+  :func:`~robust_bidding.results.export_result_json`);
+* a :class:`~robust_bidding.solvers.SolveResult`, a
+  :class:`~robust_bidding.rolling.RollingStep`, a
+  :class:`~robust_bidding.ccg.CCGResult` / :class:`~robust_bidding.saa.SAAResult`
+  or a docplex ``SolveSolution``;
+* ``{family: ndarray}``, e.g. :func:`heuristic_start`.
+
+:func:`start_columns` maps it onto the columns of a
+:class:`~robust_bidding.sparse.SparseModel` (``solvers.solve(start=...)``)
+and :func:`add_mip_start` onto a docplex model.  The hourly / per-interval
+layouts of :data:`~robust_bidding.params.HOURLY_BID_MODES` are converted
+either way, ``shift`` drops leading hours (the day before seen from a
+rolling window) and hours the start does not cover are left to the solver.
+"""
+import json
+import os
+
+import numpy as np
+
+### 웜 스타트로 넘기는 이진 변수
+BINARIES = ("D-Char", "D-DChar", "D-WPR")
+
+### MIP start 의 검사 수준 - CPLEX MIPStartEffort (HiGHS 는 항상 고정된 정수로 LP 를 풀어 해를 완성)
+START_EFFORTS = (
+    "auto",     # CPLEX decides (repair for a partial start)
+    "check",    # accept only a complete, feasible start
+    "fixed",    # solve the LP with the start's integers fixed
+    "mip",      # solve a sub-MIP over the unspecified integers
+    "repair",   # fix an infeasible start by relaxing its values
+    "none",     # no check: the start is trusted as feasible
+)
+
+### 시작해가 첫 해가 되었는지 - SolveResult.start
+START_STATUSES = ("accepted", "rejected", "unknown")
+
+
+def name_arrays(names, values):
+    """``{family: ndarray}`` from ``family_t_j_s`` names (1-based) and their values; missing entries are 0."""
+    families = {}
+    for name, value in zip(names, values):
+        family, *index = name.split('_')
+        families.setdefault(family, ([], []))
+        families[family][0].append([int(i) - 1 for i in index])
+        families[family][1].append(float(value))
+    arrays = {}
+    for family, (index, vals) in families.items():
+        index = np.array(index, dtype=int).reshape(len(vals), -1)
+        arrays[family] = np.zeros(tuple(index.max(axis=0) + 1))
+        arrays[family][tuple(index.T)] = vals
+    return arrays
+
+
+def load_solution(path):
+    """``{family: ndarray}`` of every variable in a ``solution.json`` (either writer)."""
+    with open(path) as fp:
+        document = json.load(fp)
+    variables = document.get("CPLEXSolution", document).get("variables", [])
+    return name_arrays([v["name"] for v in variables], [v["value"] for v in variables])
+
+
+def start_arrays(source, families=BINARIES, shift=0):
+    """``{family: ndarray}`` of ``families`` in ``source`` with the first ``shift`` hours dropped.
+
+    ``source`` is a ``solution.json`` path, a mapping of arrays, an object
+    with ``arrays`` / ``first_stage`` mappings, or a docplex ``SolveSolution``.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        arrays = load_solution(source)
+    elif isinstance(source, dict):
+        arrays = source
+    elif getattr(source, "arrays", None):
+        arrays = source.arrays
+    elif getattr(source, "first_stage", None):
+        arrays = source.first_stage
+    elif hasattr(source, "get_values") and hasattr(source, "model"):   # docplex SolveSolution
+        variables = [v for v in source.model.iter_variables() if v.name.split('_')[0] in families]
+        arrays = name_arrays([v.name for v in variables], source.get_values(variables))
+    else:
+        raise TypeError("cannot read a MIP start from %r" % type(source).__name__)
+    return {name: np.asarray(arrays[name], dtype=float)[shift:] for name in families if name in arrays}
+
+
+def heuristic_start(data, params=None):
+    """Price rule: charge below the day's median day-ahead price, discharge above, WPR always committed.
+
+    Exactly one of ``D-Char`` / ``D-DChar`` is 1 in every interval - with
+    both 0 the energy of 식(32) is forced to 0.
+    """
+    from .params import BiddingParameters
+
+    p = params if params is not None else BiddingParameters()
+    T, J = p.time_dim, p.min_dim
+    price = np.asarray(data.Price_DA, dtype=float)[:T, :J]
+    charge = (price < np.median(price)).astype(float)[:, :, None]
+    return {"D-Char": np.repeat(charge, p.BESS_dim, axis=2),
+            "D-DChar": np.repeat(1 - charge, p.BESS_dim, axis=2),
+            "D-WPR": np.ones((T, J, p.WPR_dim))}
+
+
+def fit_array(value, shape):
+    """``value`` laid out as ``shape``; the intra-hour axis is added or dropped, missing cells are NaN."""
+    value = np.asarray(value, dtype=float)
+    if value.ndim == len(shape) + 1:     # (t, j, k) -> hourly (t, k): 첫 구간 값
+        value = value[:, 0]
+    elif value.ndim == len(shape) - 1:   # hourly (t, k) -> (t, j, k)
+        value = np.repeat(value[:, None], shape[1], axis=1)
+    if value.ndim != len(shape):
+        raise ValueError("cannot lay out an array shaped %s as %s" % (value.shape, tuple(shape)))
+    out = np.full(shape, np.nan)
+    overlap = tuple(slice(0, min(a, b)) for a, b in zip(value.shape, shape))
+    out[overlap] = value[overlap]
+    return out
+
+
+def start_columns(sparse, arrays):
+    """``(columns, values)`` of ``arrays`` in ``sparse``; binaries are rounded."""
+    cols, vals = [], []
+    for name, value in arrays.items():
+        if name not in sparse.blocks:
+            continue
+        index = np.asarray(sparse.blocks[name])
+        fitted = fit_array(value, index.shape)
+        known = np.isfinite(fitted)
+        cols.append(index[known])
+        vals.append(fitted[known])
+    if not cols:
+        return np.zeros(0, dtype=int), np.zeros(0)
+    cols, vals = np.concatenate(cols), np.concatenate(vals)
+    vals = np.where(sparse.binary[cols], np.round(vals), vals)
+    return cols, vals
+
+
+def add_mip_start(mdl, source, effort="auto", families=BINARIES, shift=0):
+    """Add ``source`` (see :func:`start_arrays`) as a docplex MIP start; returns the number of values set."""
+    from docplex.mp.constants import EffortLevel
+
+    if effort not in START_EFFORTS:
+        raise ValueError("effort must be one of %s, got %r" % (", ".join(START_EFFORTS), effort))
+    arrays = start_arrays(source, families, shift)
+    variables = {}
+    for v in mdl.iter_variables():
+        name, *index = v.name.split('_')
+        if name in arrays:
+            variables.setdefault(name, []).append((v, tuple(int(i) - 1 for i in index)))
+    start = mdl.new_solution()
+    for name, pairs in variables.items():
+        shape = tuple(np.max([index for _, index in pairs], axis=0) + 1)
+        fitted = fit_array(arrays[name], shape)
+        for v, index in pairs:
+            if np.isfinite(fitted[index]):
+                start.add_var_value(v, int(round(fitted[index])) if v.is_binary() else fitted[index])
+    if start.number_of_var_values:
+        level = {"auto": EffortLevel.Auto, "check": EffortLevel.CheckFeas, "fixed": EffortLevel.SolveFixed,
+                 "mip": EffortLevel.SolveMIP, "repair": EffortLevel.Repair, "none": EffortLevel.NoCheck}[effort]
+        mdl.add_mip_start(start, effort_level=level)
+    return start.number_of_var_values
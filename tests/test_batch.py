@@ -0,0 +1,74 @@
+"""Core split, retries and resumption of :func:`robust_bidding.batch.run_batch`.
+
+The solver is replaced by :func:`fake_solve`, which fails or kills its
+worker for chosen ids, so only the bookkeeping of the batch is exercised.
+"""
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from robust_bidding import batch
+from robust_bidding.batch import BatchRecord, read_results, run_batch
+
+
+def fake_solve(instance, attempt, backend, time_limit, mipgap, threads, solution_dir, telemetry=None):
+    """``"fail"`` always raises, ``"crash"`` kills its worker on the first attempt, the rest are optimal."""
+    if instance["id"] == "fail":
+        raise ValueError("bad instance")
+    if instance["id"] == "crash" and attempt == 1:
+        os._exit(1)
+    return BatchRecord(id=instance["id"], attempt=attempt, status="optimal", objective=1.0, threads=threads)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(batch, "_solve_instance", fake_solve)
+
+
+def instances(*ids):
+    return [{"id": k, "workbook": "unused.xlsx"} for k in ids]
+
+
+def attempts(path):
+    return [(record.id, record.attempt, record.status) for record in read_results(path)]
+
+
+@pytest.mark.parametrize("workers, threads, split", [(None, None, (16, 1)), (None, 4, (4, 4)), (4, None, (4, 4)),
+                                                     (2, 16, (2, 8)), (64, 8, (64, 1))])
+def test_split_cores_stays_within_the_cores(workers, threads, split):
+    with mock.patch("os.cpu_count", return_value=16):
+        assert batch._split_cores(workers, threads) == split
+
+
+def test_retries_are_counted_across_runs(tmp_path, fake):
+    path = str(tmp_path / "results.jsonl")
+    records = run_batch(instances("a", "fail"), path, workers=1, retries=2)
+    assert [(record.id, record.status) for record in records] == [("a", "optimal"), ("fail", "error")]
+    assert attempts(path) == [("a", 1, "optimal"), ("fail", 1, "error"), ("fail", 2, "error"), ("fail", 3, "error")]
+    run_batch(instances("a", "fail"), path, workers=1, retries=2)   # 모두 끝남 - 다시 풀지 않음
+    assert len(read_results(path)) == 4
+    run_batch(instances("a", "fail"), path, workers=1, retries=3)   # 재시도 한도를 늘리면 한 번 더
+    assert attempts(path)[-1] == ("fail", 4, "error")
+
+
+def test_resume_after_a_torn_last_line(tmp_path, fake):
+    path = str(tmp_path / "results.jsonl")
+    with open(path, "w") as fp:
+        fp.write(json.dumps({"id": "a", "attempt": 1, "status": "optimal", "objective": 2.0}) + "\n")
+        fp.write('{"id": "b", "attempt": 1, "sta')   # 기록 도중 중단
+    records = run_batch(instances("a", "b"), path, workers=1)
+    assert [(record.id, record.objective) for record in records] == [("a", 2.0), ("b", 1.0)]
+    with open(path) as fp:
+        lines = fp.read().splitlines()
+    assert len(lines) == 3 and json.loads(lines[2])["id"] == "b"
+
+
+def test_pool_is_rebuilt_after_a_worker_dies(tmp_path, fake):
+    path = str(tmp_path / "results.jsonl")
+    records = run_batch(instances("crash", "a", "b"), path, workers=2, threads=1, retries=1)
+    assert [(record.id, record.status) for record in records] == [("crash", "optimal"), ("a", "optimal"),
+                                                                  ("b", "optimal")]
+    history = attempts(path)
+    assert ("crash", 1, "error") in history and ("crash", 2, "optimal") in history
@@ -0,0 +1,124 @@
+"""docplex builder vs. sparse builder, and the re-priced template vs. a fresh build.
+
+A 4-hour, 3-interval slice of the bundled workbook (``interval=1.0``) is
+solved with HiGHS: the docplex model through its LP export, the sparse
+model through :func:`robust_bidding.solvers.solve`.
+"""
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("docplex")
+highspy = pytest.importorskip("highspy")
+
+from robust_bidding.data import MarketData, load_market_data
+from robust_bidding.model import build_optimization_model
+from robust_bidding.params import BiddingParameters
+from robust_bidding.solvers import highs_model, solve
+from robust_bidding.sparse import build_sparse_model
+from robust_bidding.template import BiddingModelTemplate
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "v002", "robust model_data.xlsx")
+GAP = 1e-9
+
+MODES = [
+    {"hourly_bids": "pairwise"},
+    {"hourly_bids": "chain"},
+    {"hourly_bids": "hourly"},
+    {"big_m": "constant"},
+    {"big_m": "derived", "tighten_bounds": True},
+    {"symmetry": "none"},
+    {"uncertainty": "budget", "gamma": 0.5},
+    {"uncertainty": "budget", "gamma": 0.5, "budget_scope": "day", "hourly_bids": "hourly"},
+]
+
+
+@pytest.fixture(scope="module")
+def data():
+    return load_market_data(WORKBOOK, time_dim=4, min_dim=3)
+
+
+def make_params(**fields):
+    return BiddingParameters(time_dim=4, min_dim=3, interval=1.0, mipgap=GAP, **fields)
+
+
+def docplex_objective(mdl, tmp_path, relax=False):
+    """Objective of a docplex model solved by HiGHS from its LP export."""
+    path = str(tmp_path / "model.lp")
+    mdl.export_as_lp(path)
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    h.setOptionValue("mip_rel_gap", GAP)
+    h.readModel(path)
+    if relax:
+        lp = h.getLp()
+        lp.integrality_ = []
+        h.passModel(lp)
+    h.run()
+    assert h.getModelStatus() == highspy.HighsModelStatus.kOptimal
+    return h.getInfo().objective_function_value
+
+
+def sparse_objective(sparse, relax=False):
+    if relax:
+        h = highs_model(sparse, relax=True)
+        h.run()
+        assert h.getModelStatus() == highspy.HighsModelStatus.kOptimal
+        return h.getInfo().objective_function_value
+    result = solve(sparse, "highs", mipgap=GAP)
+    assert result.status == "optimal"
+    return result.objective
+
+
+def perturbed(data, seed):
+    """``data`` with prices and expected deployments scaled by random factors (per hour for the hourly prices)."""
+    rng = np.random.default_rng(seed)
+    arrays = dict(data.arrays)
+    for name in ("Price_DA", "Price_RS"):   # 시간별 가격 - 구간 축으로 같은 값
+        arrays[name] = arrays[name] * rng.uniform(0.8, 1.2, (data.time_dim, 1))
+    for name in ("Price_UR", "Price_DR", "Expected_P_UR", "Expected_P_DR", "Expected_P_RT_WPR"):
+        arrays[name] = arrays[name] * rng.uniform(0.8, 1.2, arrays[name].shape)
+    return MarketData(data.time_dim, data.min_dim, arrays)
+
+
+@pytest.mark.parametrize("relax", [False, True], ids=["mip", "lp"])
+@pytest.mark.parametrize("fields", MODES, ids=lambda fields: "-".join("%s=%s" % item for item in fields.items()))
+def test_sparse_matches_docplex(data, tmp_path, fields, relax):
+    params = make_params(**fields)
+    expected = docplex_objective(build_optimization_model(data, params), tmp_path, relax)
+    assert sparse_objective(build_sparse_model(data, params), relax) == pytest.approx(expected, rel=1e-6, abs=1e-6)
+
+
+@pytest.mark.parametrize("fields", [{}, {"hourly_bids": "hourly", "tighten_bounds": True},
+                                    {"uncertainty": "budget", "gamma": 0.5}],
+                         ids=["pairwise", "hourly-bounds", "budget"])
+def test_template_update_matches_fresh_build(data, tmp_path, fields):
+    params = make_params(**fields)
+    day = perturbed(data, 1)
+    template = BiddingModelTemplate(data, params)
+    template.update_from(day)
+    template.set_initial_energy([10, 20])
+    fresh = build_optimization_model(day, params.replace(Initial_BESS=[10, 20]))
+    assert docplex_objective(template.model, tmp_path) == pytest.approx(docplex_objective(fresh, tmp_path), rel=1e-6)
+
+
+def test_template_set_budget_matches_fresh_build(data, tmp_path):
+    params = make_params(uncertainty="budget", gamma=0.25)
+    template = BiddingModelTemplate(data, params)
+    template.set_budget(0.5)
+    fresh = build_optimization_model(data, params.replace(gamma=0.5))
+    assert docplex_objective(template.model, tmp_path) == pytest.approx(docplex_objective(fresh, tmp_path), rel=1e-6)
+
+
+def test_template_backend_matches_docplex_template(data, tmp_path):
+    params = make_params(uncertainty="budget", gamma=0.5)
+    day = perturbed(data, 2)
+    docplex_template = BiddingModelTemplate(data, params)
+    sparse_template = BiddingModelTemplate(data, params, backend="highs")
+    for template in (docplex_template, sparse_template):
+        template.update_from(day)
+        template.set_initial_energy([10, 20])
+    result = sparse_template.solve(mipgap=GAP)
+    assert result.status == "optimal"
+    assert result.objective == pytest.approx(docplex_objective(docplex_template.model, tmp_path), rel=1e-6, abs=1e-6)
@@ -0,0 +1,92 @@
+"""Hits, misses and eviction of :func:`robust_bidding.cache.load_market_data_cached`."""
+import glob
+import os
+import shutil
+import zipfile
+
+import numpy as np
+import pytest
+
+from robust_bidding import cache
+from robust_bidding.data import load_market_data
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "v002", "robust model_data.xlsx")
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / "model data.xlsx")
+    shutil.copy(WORKBOOK, path)
+    return path
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Workbook parses done behind the cache."""
+    calls = []
+
+    def counted(*args, **kwargs):
+        calls.append(args[1:3])
+        return load_market_data(*args, **kwargs)
+
+    monkeypatch.setattr(cache, "load_market_data", counted)
+    return calls
+
+
+def entries(workbook):
+    """File names of the cache entries next to ``workbook``."""
+    pattern = os.path.join(os.path.dirname(workbook), cache.DEFAULT_CACHE_DIR, "*.npz")
+    return sorted(os.path.basename(path) for path in glob.glob(pattern))
+
+
+def assert_same(data, reference):
+    assert set(data.arrays) == set(reference.arrays)
+    for name, value in reference.arrays.items():
+        if value is not None:
+            np.testing.assert_array_equal(data.arrays[name], value)
+
+
+def test_hit_and_slices_keep_their_entries(workbook, parses):
+    first = cache.load_market_data_cached(workbook, 4, 3)
+    again = cache.load_market_data_cached(workbook, 4, 3)
+    assert parses == [(4, 3)]
+    assert_same(again, first)
+    cache.load_market_data_cached(workbook, 2, 3)
+    assert parses == [(4, 3), (2, 3)]
+    names = entries(workbook)
+    assert len(names) == 2 and {name.split("-")[1] for name in names} == {"4x3", "2x3"}
+    assert all(name.startswith("model%20data.xlsx-") for name in names)
+    cache.load_market_data_cached(workbook, 4, 3)   # 다른 구간의 항목이 지워지지 않았음
+    assert parses == [(4, 3), (2, 3)]
+
+
+def test_edited_workbook_misses_and_evicts_only_its_slice(workbook, parses):
+    cache.load_market_data_cached(workbook, 4, 3)
+    cache.load_market_data_cached(workbook, 2, 3)
+    before = entries(workbook)
+    ### 내용은 같고 바이트만 다른 통합문서 - 압축 방식을 바꿔 다시 씀
+    with zipfile.ZipFile(workbook) as src:
+        members = [(info, src.read(info)) for info in src.infolist()]
+    with zipfile.ZipFile(workbook, "w", zipfile.ZIP_STORED) as dst:
+        for info, payload in members:
+            dst.writestr(info.filename, payload)
+    data = cache.load_market_data_cached(workbook, 4, 3)
+    assert parses == [(4, 3), (2, 3), (4, 3)]
+    assert_same(data, load_market_data(workbook, 4, 3))
+    after = entries(workbook)
+    assert len(after) == 2
+    assert [name for name in before if "-2x3-" in name] == [name for name in after if "-2x3-" in name]
+    assert [name for name in before if "-4x3-" in name] != [name for name in after if "-4x3-" in name]
+
+
+def test_corrupt_entry_is_rebuilt(workbook, parses):
+    reference = cache.load_market_data_cached(workbook, 4, 3)
+    (name,) = entries(workbook)
+    path = os.path.join(os.path.dirname(workbook), cache.DEFAULT_CACHE_DIR, name)
+    with open(path, "wb") as fp:
+        fp.write(b"not an npz")
+    assert_same(cache.load_market_data_cached(workbook, 4, 3), reference)
+    assert parses == [(4, 3), (4, 3)]
+    assert entries(workbook) == [name]
+    cache.load_market_data_cached(workbook, 4, 3)   # 다시 쓴 항목은 정상
+    assert parses == [(4, 3), (4, 3)]
@@ -0,0 +1,74 @@
+"""Adversarial subproblem of C&CG against brute force over the vertices of ``U``.
+
+For one hour of two intervals (``n = 6`` uncertain entries) the recourse
+``Q(x, u)`` is solved at every vertex ``ζ ∈ {-1, 0, 1}^n`` (within the budget
+for ``uncertainty="budget"``); the McCormick-linearized dual of
+:meth:`ColumnConstraintGeneration._adversary` must reach the same minimum.
+"""
+import itertools
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("highspy")
+pytest.importorskip("scipy")
+
+from robust_bidding.ccg import (SECOND_STAGE, ColumnConstraintGeneration, Recourse, first_stage, shortfall_penalty,
+                                uncertainty_range)
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding.solvers import make_solver, solve
+from robust_bidding.sparse import SparseModel, build_sparse_model
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "v002", "robust model_data.xlsx")
+
+
+@pytest.fixture(scope="module")
+def data():
+    return load_market_data(WORKBOOK, time_dim=1, min_dim=2)
+
+
+def adversary_case(data, params):
+    """``(ccg, recourse, x, nominal, up, down)`` with ``x`` the first stage of the single-stage optimum."""
+    ccg = ColumnConstraintGeneration(params, solver=make_solver("highs"))
+    sparse = build_sparse_model(data, params.replace(uncertainty="box", tighten_bounds=False))
+    cols, _ = first_stage(sparse)
+    position = np.full(sparse.shape[1], -1)
+    position[cols] = np.arange(len(cols))
+    blocks = {name: position[index] for name, index in sparse.blocks.items() if name not in SECOND_STAGE}
+    recourse = Recourse(data, params, blocks, len(cols), shortfall_penalty(data, params))
+    result = solve(sparse, "highs")
+    assert result.solved
+    return (ccg, recourse, result.x[cols]) + uncertainty_range(data, params)
+
+
+def recourse_value(recourse, params, x, u):
+    """``Q(x, u)``: the real-time LP at realization ``u``."""
+    lo, hi = recourse.rhs(x, u)
+    m, ny = recourse.shape
+    lp = SparseModel.from_arrays(params, recourse.names, recourse.c, np.zeros(ny), np.full(ny, np.inf),
+                                 np.zeros(ny, dtype=bool), recourse.Y, lo, hi)
+    result = solve(lp, "highs")
+    assert result.status == "optimal"
+    return result.objective
+
+
+@pytest.mark.parametrize("fields", [{"uncertainty": "box"}, {"uncertainty": "budget", "gamma": 1},
+                                    {"uncertainty": "budget", "gamma": 2, "budget_scope": "day"}],
+                         ids=["box", "budget-hour", "budget-day"])
+def test_adversary_matches_vertex_enumeration(data, fields):
+    params = BiddingParameters(time_dim=1, min_dim=2, interval=1.0, **fields)
+    ccg, recourse, x, nominal, up, down = adversary_case(data, params)
+    limit = params.gamma if params.uncertainty == "budget" else len(nominal)   # T=1: 시간별, 일별 묶음이 같음
+    values = {}
+    for zeta in itertools.product((-1, 0, 1), repeat=len(nominal)):
+        if sum(map(abs, zeta)) <= limit:
+            z = np.array(zeta)
+            values[zeta] = recourse_value(recourse, params, x, nominal + up * (z > 0) - down * (z < 0))
+    worst = min(values.values())
+    assert worst < max(values.values())   # 실현값에 따라 Q 가 달라지는 경우
+
+    value, zeta = ccg._adversary(recourse, x, nominal, up, down, None)
+    assert value == pytest.approx(worst, rel=1e-6, abs=1e-6)
+    assert values[tuple(zeta.tolist())] == pytest.approx(worst, rel=1e-6, abs=1e-6)
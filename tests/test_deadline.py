@@ -0,0 +1,40 @@
+"""Time keeping of :func:`robust_bidding.deadline.solve_by_deadline` and its fallback."""
+import os
+import time
+
+import pytest
+
+pytest.importorskip("highspy")
+
+from robust_bidding.data import load_market_data
+from robust_bidding.deadline import MIN_SLICE, _fallback, solve_by_deadline
+from robust_bidding.params import BiddingParameters
+from robust_bidding.sparse import build_sparse_model
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "v002", "robust model_data.xlsx")
+
+
+@pytest.fixture(scope="module")
+def sparse():
+    data = load_market_data(WORKBOOK, time_dim=4, min_dim=3)
+    return build_sparse_model(data, BiddingParameters(time_dim=4, min_dim=3, interval=1.0, hourly_bids="hourly"))
+
+
+def test_fallback_skips_short_slices(sparse):
+    begin = time.time()
+    assert _fallback(sparse, [], "highs", begin + MIN_SLICE / 2, None) == (None, None)
+    assert time.time() - begin < MIN_SLICE / 2 + 0.05
+
+
+def test_fallback_rounds_the_relaxation(sparse):
+    label, result = _fallback(sparse, [], "highs", time.time() + 30, None)
+    assert label == "rounding" and result.solved
+
+
+@pytest.mark.parametrize("budget", [0.5, 1.0, 3.0])
+def test_returns_by_the_deadline(sparse, budget):
+    deadline = time.time() + budget
+    result = solve_by_deadline(sparse, deadline, "highs")
+    assert time.time() <= deadline + 0.1   # 모델 구성 시간만큼의 여유
+    if budget >= 3.0:
+        assert result.status == "optimal" and result.fallback is None
@@ -0,0 +1,75 @@
+"""Settlement rules of :func:`robust_bidding.settlement.settle`.
+
+One hour of one interval (``del_S = 1``) is settled by hand: calls shared
+pro rata to the reserve bids, wind up-regulation capped by its headroom
+above the day-ahead schedule, and the missing product charged as
+imbalance.  At the nominal realization the day-ahead and reserve income of
+a solved model must equal its ``AV-RO-DA``.
+"""
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from robust_bidding.params import BiddingParameters
+from robust_bidding.settlement import settle
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "v002", "robust model_data.xlsx")
+
+PRICES = SimpleNamespace(Price_DA=np.array([[50.0]]), Price_RS=np.array([[10.0]]), Price_UR=np.array([[80.0]]),
+                         Price_DR=np.array([[20.0]]))
+
+
+def one_interval(**rates):
+    """Bids of one interval, BESS 2 기 / WPR 1 기; ``rates`` overrides the families by name."""
+    bids = {"P-DA-CH": [0, 0], "P-DA-DCH": [2, 0], "P-DA-WPR": [5], "P-RS-CH": [0, 0], "P-RS-DCH": [0, 0],
+            "P-RS-WPR": [0], "D-Char": [0, 0], "D-DChar": [1, 0]}
+    bids.update(rates)
+    return {name: np.array(value, dtype=float).reshape(1, 1, -1) for name, value in bids.items()}
+
+
+def scenarios(up, down, wind):
+    return {"P_UR": np.reshape(up, (-1, 1, 1)), "P_DR": np.reshape(down, (-1, 1, 1)),
+            "P_RT_WPR": np.reshape(wind, (-1, 1, 1))}
+
+
+@pytest.fixture
+def params():
+    return BiddingParameters(time_dim=1, min_dim=1, interval=1.0)
+
+
+def test_zero_reserve_leaves_the_call_as_imbalance(params):
+    result = settle(one_interval(), scenarios([3.0], [1.0], [5.0]), PRICES, params)
+    assert result.imbalance[0] == pytest.approx(3.0 + 1.0)
+    assert result.real_time[0] == 0
+    assert result.reserve[0] == 0
+    assert result.imbalance_cost[0] == pytest.approx(80 * 3.0 + 20 * 1.0)
+    assert result.day_ahead[0] == pytest.approx((50 - 1) * 2 + (50 - 3) * 5)   # 방전 2, 풍력 5 - 한계비용
+    assert result.revenue[0] == pytest.approx(result.day_ahead[0] - result.imbalance_cost[0])
+
+
+def test_calls_are_shared_pro_rata_and_wind_follows_its_headroom(params):
+    bids = one_interval(**{"P-RS-DCH": [1, 1], "P-RS-WPR": [2]})   # 상향 예비력 4 = BESS 2 + 풍력 2
+    result = settle(bids, scenarios([2.0, 2.0], [0.0, 0.0], [5.4, 4.0]), PRICES, params)
+    ### 호출 2 / 예비력 4 -> BESS 1, 풍력 1 배분; 풍력 여유는 0.4 와 0 뿐
+    assert result.reserve == pytest.approx([10 * 4, 10 * 4])
+    assert result.real_time == pytest.approx([(80 - 1) * 1 + (80 - 3) * 0.4, (80 - 1) * 1])
+    assert result.imbalance == pytest.approx([2 - 1 - 0.4, (2 - 1) + (5 - 4.0)])
+    assert result.imbalance_cost == pytest.approx([80 * 0.6, 80 * 1 + 50 * 1])   # 풍력 부족분은 Price_DA
+
+
+def test_nominal_realization_settles_to_the_model_day_ahead():
+    pytest.importorskip("highspy")
+    pytest.importorskip("scipy")
+    from robust_bidding.data import load_market_data
+    from robust_bidding.solvers import solve
+    from robust_bidding.sparse import build_sparse_model
+
+    data = load_market_data(WORKBOOK, time_dim=4, min_dim=3)
+    params = BiddingParameters(time_dim=4, min_dim=3, interval=1.0)
+    result = solve(build_sparse_model(data, params), "highs")
+    assert result.solved
+    nominal = {name: np.asarray(getattr(data, "Expected_" + name))[None] for name in ("P_UR", "P_DR", "P_RT_WPR")}
+    outcome = settle(result.arrays, nominal, data, params)
+    assert outcome.day_ahead[0] + outcome.reserve[0] == pytest.approx(result.arrays["AV-RO-DA"].sum(), rel=1e-6)
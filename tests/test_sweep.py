@@ -0,0 +1,27 @@
+"""Grid, visiting order and warm starts of :func:`robust_bidding.sweep.run_sweep`."""
+import os
+
+import pytest
+
+from robust_bidding.data import load_market_data
+from robust_bidding.params import BiddingParameters
+from robust_bidding.sweep import neighbours, run_sweep, sweep_grid, visit_order
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "v002", "robust model_data.xlsx")
+
+
+def test_grid_drops_repeated_values():
+    grid = sweep_grid([1.0, 0.5, 1.0], [2, 0, 2])
+    assert grid == [(0.5, 0), (0.5, 2), (1.0, 0), (1.0, 2)]
+    assert sorted(visit_order(grid)) == list(range(len(grid)))
+    assert all(adjacent for adjacent in neighbours(grid))
+
+
+def test_repeated_interval_is_solved_once():
+    pytest.importorskip("highspy")
+    data = load_market_data(WORKBOOK, time_dim=4, min_dim=3)
+    params = BiddingParameters(time_dim=4, min_dim=3, interval=1.0, hourly_bids="hourly")
+    points = run_sweep(data, params, [1.0, 1.0], [0, 0.5, 0.5], workers=1, backend="highs")
+    assert [(pt.interval, pt.gamma) for pt in points] == [(1.0, 0), (1.0, 0.5)]
+    assert all(pt.status == "optimal" for pt in points)
+    assert points[0].warm_start is None and points[1].warm_start == (1.0, 0)
@@ -1,23 +1,10 @@
 from __future__ import print_function
 from cmath import inf
-from docplex.mp.model import Model
-from docplex.util.environment import get_environment
-import win32com.client as win32
-import pandas as pd
 import os
+import sys
 
-### 엑셀 불러오기
-excel = win32.Dispatch("Excel.Application")
-wb1 = excel.Workbooks.Open(os.getcwd()+"\\robust model_data.xlsx")  
-Price_DA = wb1.Sheets("Price_DA")              # Day-ahead price
-Price_RS = wb1.Sheets("Price_RS")              # Reserve prices
-Price_UR = wb1.Sheets("Price_UR")              # Up regulation prices
-Price_DR = wb1.Sheets("Price_DR")              # Down regulation prices
-#Expected_P_UR = wb1.Sheets("Expected_P_UR")    # Expected deployed power in up regulation services
-#Expected_P_DR = wb1.Sheets("Expected_P_DR")    # Expected deployed power in down regulation services
-Expected_P_RT_WPR = wb1.Sheets("Expected_P_RT_WPR")  # Expected wind power realization
-
-#variation interval은?
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from robust_bidding.cache import load_market_data_cached
 
 ### 파라미터 설정
 time_dim = 24     # 시간 개수 (t)
@@ -37,7 +24,16 @@ P_min_BESS = [0,0]    # Minimum power of BESS (MW)
 Ramp_rate_BESS = [5,3]  # Ramp-rate of BESS
 
 ### 최적화 파트
-def build_optimization_model(name='Robust_Optimization_Model'):
+def build_optimization_model(data, name='Robust_Optimization_Model'):
+    from docplex.mp.model import Model
+
+    ### 엑셀 데이터 (load_market_data 로 읽은 배열)
+    Price_DA = data.Price_DA                    # Day-ahead price
+    Price_RS = data.Price_RS                    # Reserve prices
+    Price_UR = data.Price_UR                    # Up regulation prices
+    Price_DR = data.Price_DR                    # Down regulation prices
+    Expected_P_RT_WPR = data.Expected_P_RT_WPR  # Expected wind power realization
+
     mdl = Model(name=name)   # Model - Cplex에 입력할 Model 이름 입력 및 Model 생성
     mdl.parameters.mip.tolerances.mipgap = 0.0001;   # 최적화 계산 오차 설정
 
@@ -92,20 +88,20 @@ def build_optimization_model(name='Robust_Optimization_Model'):
     
     ### Objective function - 식(1) / 식(65)
     
-    mdl.maximize(mdl.sum(Price_DA.Cells(t+1,2).Value * mdl.sum(del_S * (mdl.sum(P_DA_DCH[(t,j,s)] - P_DA_CH[(t,j,s)] for s in range(1,BESS_dim+1)) + mdl.sum(P_DA_WPR[(t,j,w)] for w in range(1,WPR_dim+1))) for j in range(1,min_dim+1))
-                         + Price_RS.Cells(t+1,2).Value * mdl.sum(del_S * (mdl.sum(P_RS_CH[(t,j,s)] + P_RS_DCH[(t,j,s)] for s in range(1,BESS_dim+1)) + mdl.sum(P_RS_WPR[(t,j,w)] for w in range(1,WPR_dim+1))) for j in range(1,min_dim+1))
+    mdl.maximize(mdl.sum(Price_DA[t-1,0] * mdl.sum(del_S * (mdl.sum(P_DA_DCH[(t,j,s)] - P_DA_CH[(t,j,s)] for s in range(1,BESS_dim+1)) + mdl.sum(P_DA_WPR[(t,j,w)] for w in range(1,WPR_dim+1))) for j in range(1,min_dim+1))
+                         + Price_RS[t-1,0] * mdl.sum(del_S * (mdl.sum(P_RS_CH[(t,j,s)] + P_RS_DCH[(t,j,s)] for s in range(1,BESS_dim+1)) + mdl.sum(P_RS_WPR[(t,j,w)] for w in range(1,WPR_dim+1))) for j in range(1,min_dim+1))
                          - mdl.sum(mdl.sum(Marginal_cost_DCH * del_S * P_DA_DCH[(t,j,s)] + Marginal_cost_CH * del_S * P_DA_CH[(t,j,s)] for s in range(1,BESS_dim+1)) + mdl.sum(Marginal_cost_WPR * del_S * P_DA_WPR[(t,j,w)] for w in range(1,WPR_dim+1)) for j in range(1,min_dim+1))
                          + AV_RO[t] for t in range(1,time_dim+1)))
 
     # Robust Optizimation을 위한 변수 (BESS + WPR) - 식(65)
-    mdl.add_constraints(AV_RO[t] <= mdl.sum(Price_UR.Cells(t+1,j+1).Value * del_S * (mdl.sum(P_UR_DCH[(t,j,s)] + P_UR_CH[(t,j,s)] for s in range(1,BESS_dim+1)) + mdl.sum(P_UR_WPR[(t,j,w)] for w in range(1,WPR_dim+1))) 
-                                            + Price_DR.Cells(t+1,j+1).Value * del_S * (mdl.sum(P_DR_DCH[(t,j,s)] + P_DR_CH[(t,j,s)] for s in range(1,BESS_dim+1)) + mdl.sum(P_DR_WPR[(t,j,w)] for w in range(1,WPR_dim+1)))
+    mdl.add_constraints(AV_RO[t] <= mdl.sum(Price_UR[t-1,j-1] * del_S * (mdl.sum(P_UR_DCH[(t,j,s)] + P_UR_CH[(t,j,s)] for s in range(1,BESS_dim+1)) + mdl.sum(P_UR_WPR[(t,j,w)] for w in range(1,WPR_dim+1))) 
+                                            + Price_DR[t-1,j-1] * del_S * (mdl.sum(P_DR_DCH[(t,j,s)] + P_DR_CH[(t,j,s)] for s in range(1,BESS_dim+1)) + mdl.sum(P_DR_WPR[(t,j,w)] for w in range(1,WPR_dim+1)))
                                             - mdl.sum(Marginal_cost_DCH * del_S * P_UR_DCH[(t,j,s)] + Marginal_cost_CH * del_S * P_DR_CH[(t,j,s)] for s in range(1,BESS_dim+1)) - mdl.sum(Marginal_cost_WPR * del_S * P_UR_WPR[(t,j,w)] for w in range(1,WPR_dim+1)) 
                                             for j in range(1,min_dim+1)) for t in range(1,time_dim+1))
     
     ### B_t - 식(2)
-    #mdl.add_constraints(B_t[t] == (Price_DA.Cells(t+1,2).Value * P_DA_S[t] - Price_DA.Cells(t+1,2).Value * P_DA_B[t] + Price_RS.Cells(t+1,2).Value * P_RS[t])
-    #                                      + mdl.sum(del_S*(Price_UR.Cells(t+1,j+1).Value * P_UR[(t,j)] + Price_DR.Cells(t+1,j+1).Value * P_DR[(t,j)]) for j in range(1,min_dim+1)) for t in range(1,time_dim+1))  # Income of owner
+    #mdl.add_constraints(B_t[t] == (Price_DA[t-1,0] * P_DA_S[t] - Price_DA[t-1,0] * P_DA_B[t] + Price_RS[t-1,0] * P_RS[t])
+    #                                      + mdl.sum(del_S*(Price_UR[t-1,j-1] * P_UR[(t,j)] + Price_DR[t-1,j-1] * P_DR[(t,j)]) for j in range(1,min_dim+1)) for t in range(1,time_dim+1))  # Income of owner
     
 
      ### C_t - 식(3)
@@ -402,9 +398,9 @@ def build_optimization_model(name='Robust_Optimization_Model'):
 
     #mdl.add_constraints(P_DR[(t,j)] <= 0.5 * (sum(P_max_BESS)) + 0.5 * 0.5 * (sum(P_max_BESS)) for t in range(1,time_dim+1) for j in range(1,min_dim+1))   # 식 (62) / 변동구간 +-10%
 
-    mdl.add_constraints(0.5 * Expected_P_RT_WPR.Cells(t+1,j+1).Value <= P_RT_WPR[(t,j,w)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))  # 식 (63) / 변동구간 +-10%
+    mdl.add_constraints(0.5 * Expected_P_RT_WPR[t-1,j-1] <= P_RT_WPR[(t,j,w)] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))  # 식 (63) / 변동구간 +-10%
 
-    mdl.add_constraints(P_RT_WPR[(t,j,w)] <= 1.5 * Expected_P_RT_WPR.Cells(t+1,j+1).Value for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))  # 식 (63) / 변동구간 +-10%
+    mdl.add_constraints(P_RT_WPR[(t,j,w)] <= 1.5 * Expected_P_RT_WPR[t-1,j-1] for t in range(1,time_dim+1) for j in range(1,min_dim+1) for w in range(1,WPR_dim+1))  # 식 (63) / 변동구간 +-10%
 
     return mdl
 
@@ -413,7 +409,10 @@ def result_optimization_model(model, DataFrame):
     mdl = model
     frame = DataFrame
     
-    wb_result = excel.Workbooks.Open(os.getcwd()+"\\robust model_result.xlsx")
+    import win32com.client as win32
+
+    excel = win32.Dispatch("Excel.Application")
+    wb_result = excel.Workbooks.Open(os.path.join(os.getcwd(), "robust model_result.xlsx"))
     ws1 = wb_result.Worksheets("Optimization Result")
     ws2 = wb_result.Worksheets("Day-Ahead")
     
@@ -443,9 +442,13 @@ def result_optimization_model(model, DataFrame):
     wb_result.Save()
     excel.Quit()
     
-### Main Program    
-if __name__ == '__main__':
-    mdl = build_optimization_model() # 최적화 모델 생성
+### Main Program
+def main():
+    import pandas as pd
+    from docplex.util.environment import get_environment
+
+    market = load_market_data_cached(os.path.join(os.getcwd(), "robust model_data.xlsx"), time_dim, min_dim)  # 엑셀 불러오기
+    mdl = build_optimization_model(market) # 최적화 모델 생성
     mdl.print_information() # 모델로부터 나온 정보를 출력
     s = mdl.solve(log_output=True) # 모델 풀기
     
@@ -457,7 +460,7 @@ if __name__ == '__main__':
         
         data = [v.name.split('_') + [s.get_value(v)] for v in mdl.iter_variables()] # 변수 데이터 저장
         frame = pd.DataFrame(data, columns=['var', 'index1', 'index2', 'index3', 'value']) # 변수 중 시간 성분만 있는 경우 'index2'에 값이 저장됨
-        frame.to_excel(os.getcwd()+"\\variable_result.xlsx")
+        frame.to_excel(os.path.join(os.getcwd(), "variable_result.xlsx"))
         
         result_optimization_model(mdl, frame)  # 결과 출력부        
         
@@ -467,5 +470,7 @@ if __name__ == '__main__':
         
     else: # 해가 존재하지 않는 경우
         print("* model has no solution")
-        excel.Quit() 
-    
\ No newline at end of file
+
+
+if __name__ == '__main__':
+    main()